@@ -7,6 +7,7 @@ from .logging import configure_logging
 from .seed import seed_database
 from .middleware import register_middleware
 from .blueprints import register_blueprints
+from .commands import register_commands
 
 def create_app(config_name=Config.ENV, seed_db=Config.SEED_DB):
     '''
@@ -40,6 +41,9 @@ def create_app(config_name=Config.ENV, seed_db=Config.SEED_DB):
     # Register blueprints
     register_blueprints(app)
     
+    # Register CLI commands
+    register_commands(app)
+    
     # initialize database defaults
     if seed_db:
         seed_database(app)
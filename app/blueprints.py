@@ -10,6 +10,7 @@ def register_blueprints(app: Flask) -> None:
     from .routes import create_web_blueprint
     from .routes.public import create_web_public_blueprint
     from .routes.admin import create_web_admin_blueprint
+    from .routes.api import create_api_blueprint
     
     # Create the blueprints
     web_bp = create_web_blueprint()
@@ -25,6 +26,9 @@ def register_blueprints(app: Flask) -> None:
     
     # Register the web blueprint
     app.register_blueprint(web_bp)
+    
+    # Register the JSON API blueprint
+    app.register_blueprint(create_api_blueprint())
 
 
 def register_sub_blueprints(bp: Blueprint, blueprints: List[Blueprint]):
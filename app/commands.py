@@ -0,0 +1,23 @@
+"""
+Flask CLI commands, registered on the app by `create_app`.
+"""
+import click
+from flask import Flask
+
+
+def register_commands(app: Flask) -> None:
+    """Register the application's `flask` CLI commands."""
+    
+    @app.cli.command("worker")
+    @click.option("--lease", "lease_seconds", type=float, default=None,
+                  help="Seconds a claimed job is held without renewal (default: JOB_LEASE_SECONDS).")
+    @click.option("--poll", "poll_seconds", type=float, default=None,
+                  help="Seconds to wait between polls of an empty queue (default: JOB_POLL_SECONDS).")
+    @click.option("--worker-id", default=None, help="Lease owner name; must be unique per worker process.")
+    @click.option("--burst", is_flag=True, help="Exit once the queue is empty.")
+    def worker(lease_seconds, poll_seconds, worker_id, burst):
+        """Run queued calculator jobs until stopped."""
+        from .utils.jobs import run_worker
+        
+        processed = run_worker(worker_id=worker_id, lease_seconds=lease_seconds, poll_seconds=poll_seconds, burst=burst)
+        click.echo(f"Processed {processed} job(s).")
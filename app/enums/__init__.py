@@ -1 +1,2 @@
-from .auth import RoleNames
\ No newline at end of file
+from .auth import RoleNames
+from .jobs import JobStatus
\ No newline at end of file
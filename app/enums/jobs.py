@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class JobStatus(Enum):
+    """ENUMS for the status field in Job Model: queued -> running -> succeeded, back to queued for a retry, or failed"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    
+    def __str__(self):
+        return self.value
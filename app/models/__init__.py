@@ -13,5 +13,7 @@ from sqlalchemy.orm import aliased
 from .user import AppUser, Profile, Address, TempUser
 from .role import Role, UserRole
 from .attempt import Attempt
+from .result_blob import ResultBlob
+from .job import Job
 from .feedback import Feedback
 from .media import Media
\ No newline at end of file
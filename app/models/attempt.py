@@ -2,7 +2,9 @@
 Attempt model for storing user Armstrong number calculation attempts.
 """
 from __future__ import annotations
-from typing import TYPE_CHECKING
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any
 from sqlalchemy.orm import Mapped as M
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -11,24 +13,39 @@ from ..extensions import db
 from ..utils.date_time import DateTimeUtils
 
 if TYPE_CHECKING:
+    from .result_blob import ResultBlob
     from .user import AppUser
 
 
+# Longest input stored verbatim in `input_value`.
+INPUT_VALUE_LENGTH = 50
+
+
 class Attempt(db.Model):
     """Model to store user attempts at checking Armstrong numbers."""
     __tablename__ = "attempt"
+    __table_args__ = (
+        # Keyset pagination of a user's history, newest first (see `keyset_paginate`)
+        db.Index("ix_attempt_user_created", "user_id", db.desc("created_at"), "id"),
+    )
     
     id: M[uuid.UUID] = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     user_id: M[uuid.UUID] = db.Column(UUID(as_uuid=True), db.ForeignKey('app_user.id', ondelete='CASCADE'), nullable=False, index=True)
-    input_value: M[str] = db.Column(db.String(50), nullable=False)  # Store as string to handle ranges like "100-999"
-    input_type: M[str] = db.Column(db.String(20), nullable=False)  # 'single' or 'range'
-    result: M[str] = db.Column(db.Text, nullable=True)  # JSON string or result text
+    input_value: M[str] = db.Column(db.String(INPUT_VALUE_LENGTH), nullable=False)  # Store as string to handle ranges like "100-999"
+    input_length: M[int] = db.Column(db.Integer, nullable=True)  # Full length, for inputs too long for input_value
+    input_digest: M[str] = db.Column(db.String(64), nullable=True)  # SHA-256 of inputs too long for input_value
+    input_type: M[str] = db.Column(db.String(20), nullable=False)  # 'single', 'range' or 'trajectory'
+    base: M[int] = db.Column(db.Integer, nullable=False, default=10, server_default="10")  # Base the digits are taken in
+    family: M[str] = db.Column(db.String(20), nullable=False, default="armstrong", server_default="armstrong")  # Digit-power family checked, or 'trajectory'
+    result: M[str] = db.Column(db.Text, nullable=True)  # JSON string or result text; older attempts only
+    result_hash: M[str] = db.Column(db.String(64), db.ForeignKey('result_blob.hash'), nullable=True, index=True)  # Shared result, see ResultBlob
     is_armstrong: M[bool] = db.Column(db.Boolean, nullable=True)  # For single number checks
     count: M[int] = db.Column(db.Integer, nullable=True)  # For range searches
     created_at = db.Column(db.DateTime(timezone=True), default=DateTimeUtils.aware_utcnow, nullable=False)
     
     # Relationship
     app_user = db.relationship('AppUser', backref='attempts', lazy=True)
+    result_blob = db.relationship('ResultBlob', lazy=True)
     
     def __repr__(self):
         return f'<Attempt ID: {self.id}, user: {self.user_id}, input: {self.input_value}>'
@@ -40,12 +57,43 @@ class Attempt(db.Model):
             'user_id': str(self.user_id),
             'input_value': self.input_value,
             'input_type': self.input_type,
+            'input_length': self.input_length,
+            'input_digest': self.input_digest,
+            'base': self.base,
+            'family': self.family,
             'result': self.result,
+            'result_hash': self.result_hash,
             'is_armstrong': self.is_armstrong,
             'count': self.count,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
     
+    def set_input(self, value: str, digest: str | None = None):
+        """
+        Set the input, keeping only a prefix, its length and a SHA-256 digest when it is too long to store.
+        
+        Args:
+            value: The input as submitted
+            digest: Its SHA-256 hex digest, if already computed
+        """
+        if len(value) <= INPUT_VALUE_LENGTH:
+            self.input_value = value
+            return
+        self.input_value = value[:INPUT_VALUE_LENGTH - 1] + "…"
+        self.input_length = len(value)
+        self.input_digest = digest or hashlib.sha256(value.encode()).hexdigest()
+    
+    def load_result(self) -> Any:
+        """The stored result, from its shared blob or, for older attempts, the `result` text."""
+        if self.result_blob is not None:
+            return self.result_blob.decode()
+        if self.result is None:
+            return None
+        try:
+            return json.loads(self.result)
+        except ValueError:
+            return self.result
+    
     def save(self):
         """Save the attempt."""
         db.session.add(self)
@@ -0,0 +1,82 @@
+"""
+Job model for the background job queue.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Optional
+from sqlalchemy.orm import Mapped as M
+from sqlalchemy.dialects.postgresql import UUID
+import json
+import uuid
+
+from ..extensions import db
+from ..enums.jobs import JobStatus
+from ..utils.date_time import DateTimeUtils
+
+if TYPE_CHECKING:
+    from .attempt import Attempt
+    from .user import AppUser
+
+
+class Job(db.Model):
+    """A unit of background work, claimed by `flask worker` processes through a time-limited lease."""
+    __tablename__ = "job"
+    __table_args__ = (
+        db.Index("ix_job_claim", "status", "priority", "created_at"),
+    )
+    
+    id: M[uuid.UUID] = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    user_id: M[uuid.UUID] = db.Column(UUID(as_uuid=True), db.ForeignKey('app_user.id', ondelete='CASCADE'), nullable=False, index=True)
+    kind: M[str] = db.Column(db.String(30), nullable=False)  # e.g. 'range'
+    status = db.Column(db.Enum(JobStatus), nullable=False, default=JobStatus.QUEUED)
+    priority: M[int] = db.Column(db.Integer, nullable=False, default=0)  # Higher runs first
+    payload: M[str] = db.Column(db.Text, nullable=False)  # JSON arguments, updated with progress as the job runs
+    attempts: M[int] = db.Column(db.Integer, nullable=False, default=0)  # Claims so far, including the current one
+    max_attempts: M[int] = db.Column(db.Integer, nullable=False, default=3)
+    run_after = db.Column(db.DateTime(timezone=True), default=DateTimeUtils.aware_utcnow, nullable=False)  # Retries are delayed
+    lease_owner: M[Optional[str]] = db.Column(db.String(64), nullable=True)  # Worker holding the job
+    lease_expires_at = db.Column(db.DateTime(timezone=True), nullable=True)  # Another worker may reclaim it after this
+    error: M[Optional[str]] = db.Column(db.Text, nullable=True)  # Last failure
+    attempt_id: M[Optional[uuid.UUID]] = db.Column(UUID(as_uuid=True), db.ForeignKey('attempt.id', ondelete='SET NULL'), nullable=True)
+    created_at = db.Column(db.DateTime(timezone=True), default=DateTimeUtils.aware_utcnow, nullable=False)
+    started_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    finished_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    
+    # Relationships
+    app_user = db.relationship('AppUser', backref='jobs', lazy=True)
+    attempt = db.relationship('Attempt', lazy=True)
+    
+    def __repr__(self):
+        return f'<Job ID: {self.id}, kind: {self.kind}, status: {self.status}>'
+    
+    @property
+    def data(self) -> dict:
+        """The decoded payload."""
+        return json.loads(self.payload)
+    
+    def to_dict(self):
+        """Convert job to dictionary."""
+        return {
+            'id': str(self.id),
+            'user_id': str(self.user_id),
+            'kind': self.kind,
+            'status': str(self.status),
+            'priority': self.priority,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'error': self.error,
+            'attempt_id': str(self.attempt_id) if self.attempt_id else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+    
+    def save(self):
+        """Save the job."""
+        db.session.add(self)
+        db.session.commit()
+        return self
+    
+    def delete(self):
+        """Delete the job."""
+        db.session.delete(self)
+        db.session.commit()
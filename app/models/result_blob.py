@@ -0,0 +1,65 @@
+"""
+ResultBlob model: content-addressed storage for attempt results.
+"""
+from __future__ import annotations
+from typing import Any
+from sqlalchemy.orm import Mapped as M
+import hashlib
+import json
+import zlib
+
+from ..extensions import db
+from ..utils.date_time import DateTimeUtils
+
+
+# Canonical results at least this long are stored zlib-compressed, if that makes them smaller.
+COMPRESS_MIN_BYTES = 256
+
+ENCODING_JSON = "json"
+ENCODING_ZLIB = "zlib"
+
+
+class ResultBlob(db.Model):
+    """A result stored once, keyed by the SHA-256 of its canonical JSON, however many attempts share it."""
+    __tablename__ = "result_blob"
+    
+    hash: M[str] = db.Column(db.String(64), primary_key=True)  # SHA-256 hex of the canonical JSON
+    encoding: M[str] = db.Column(db.String(10), nullable=False)  # 'json' or 'zlib'
+    data: M[bytes] = db.Column(db.LargeBinary, nullable=False)
+    size: M[int] = db.Column(db.Integer, nullable=False)  # Length of the canonical JSON, before compression
+    created_at = db.Column(db.DateTime(timezone=True), default=DateTimeUtils.aware_utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f'<ResultBlob {self.hash[:12]}, {self.encoding}, {self.size} bytes>'
+    
+    @staticmethod
+    def canonical(result: Any) -> bytes:
+        """The canonical JSON of a result: sorted keys and no whitespace, so equal results hash equally."""
+        return json.dumps(result, sort_keys=True, separators=(",", ":")).encode()
+    
+    @classmethod
+    def encode(cls, result: Any) -> dict:
+        """
+        Encode a JSON-serializable result as a row for this table.
+        
+        Returns:
+            Column values, with the hash to reference it by under 'hash'
+        """
+        canonical = cls.canonical(result)
+        encoding, data = ENCODING_JSON, canonical
+        if len(canonical) >= COMPRESS_MIN_BYTES:
+            compressed = zlib.compress(canonical)
+            if len(compressed) < len(canonical):
+                encoding, data = ENCODING_ZLIB, compressed
+        return {
+            "hash": hashlib.sha256(canonical).hexdigest(),
+            "encoding": encoding,
+            "data": data,
+            "size": len(canonical),
+            "created_at": DateTimeUtils.aware_utcnow(),
+        }
+    
+    def decode(self) -> Any:
+        """The stored result."""
+        data = zlib.decompress(self.data) if self.encoding == ENCODING_ZLIB else self.data
+        return json.loads(data)
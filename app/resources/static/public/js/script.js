@@ -64,4 +64,130 @@ document.addEventListener('DOMContentLoaded', function() {
             }
         });
     }
+    
+    // Stream range searches so hits show up as soon as they are found
+    const rangeForm = document.getElementById('range-form');
+    const rangeStream = document.getElementById('range-stream');
+    
+    if (rangeForm && rangeStream && window.EventSource) {
+        const heading = rangeStream.querySelector('[data-stream-heading]');
+        const bar = rangeStream.querySelector('[data-stream-bar]');
+        const status = rangeStream.querySelector('[data-stream-status]');
+        const hits = rangeStream.querySelector('[data-stream-hits]');
+        const partial = rangeStream.querySelector('[data-stream-partial]');
+        const partialText = rangeStream.querySelector('[data-stream-partial-text]');
+        const continueButton = document.getElementById('range-stream-continue');
+        let source = null;
+        let continuation = null;
+        
+        // Submit a search the server would not stream, so it runs in the background, is queued or is refused
+        function submitRange(resumeFrom) {
+            if (!resumeFrom) {
+                rangeForm.submit();
+                return;
+            }
+            const form = document.createElement('form');
+            form.method = 'POST';
+            form.action = rangeForm.dataset.continueUrl;
+            const input = document.createElement('input');
+            input.type = 'hidden';
+            input.name = 'continuation';
+            input.value = resumeFrom;
+            form.appendChild(input);
+            document.body.appendChild(form);
+            form.submit();
+        }
+        
+        function streamRange(query, resumeFrom) {
+            if (source) {
+                source.close();
+            }
+            const rendered = document.getElementById('range-results');
+            if (rendered) {
+                rendered.remove();
+            }
+            
+            let plan = null;
+            let found = 0;
+            hits.innerHTML = '';
+            bar.style.width = '0%';
+            heading.textContent = 'Searching...';
+            status.textContent = '';
+            partial.classList.add('hidden');
+            rangeStream.classList.remove('hidden');
+            
+            source = new EventSource(rangeForm.dataset.streamUrl + '?' + query);
+            
+            source.addEventListener('plan', function(e) {
+                plan = JSON.parse(e.data);
+                heading.textContent = `Searching ${plan.min_num}-${plan.max_num} on the ${plan.engine} engine...`;
+            });
+            
+            source.addEventListener('hit', function(e) {
+                const hit = document.createElement('span');
+                hit.className = 'px-3 py-1 bg-primary text-primary-foreground rounded-lg text-sm font-mono';
+                hit.textContent = JSON.parse(e.data).number;
+                hits.appendChild(hit);
+                found += 1;
+            });
+            
+            source.addEventListener('progress', function(e) {
+                const progress = JSON.parse(e.data);
+                bar.style.width = `${(progress.fraction * 100).toFixed(1)}%`;
+                const rate = progress.numbers_per_second ? `, ${Math.round(progress.numbers_per_second).toLocaleString()} numbers/s` : '';
+                status.textContent = `${(progress.fraction * 100).toFixed(1)}% searched${rate}, ${progress.found} found`;
+            });
+            
+            source.addEventListener('done', function(e) {
+                source.close();
+                const done = JSON.parse(e.data);
+                heading.textContent = `Found ${done.count} ${plan.label}(s) in range ${plan.min_num}-${done.searched_to}${plan.base !== 10 ? ` (base ${plan.base})` : ''}:`;
+                if (!found) {
+                    hits.innerHTML = `<p class="text-muted-foreground">No ${plan.label}s found in this range.</p>`;
+                }
+                if (!done.complete) {
+                    continuation = done.continuation;
+                    // Numbers arrive as strings, as they can exceed what a JavaScript number holds exactly
+                    partialText.textContent = `Partial result: the search stopped at its time limit after ${done.searched_to}. ` +
+                        `${done.resume_from}-${plan.max_num} has not been searched yet.`;
+                    partial.classList.remove('hidden');
+                }
+            });
+            
+            // Too costly to run within the request: submit it instead, from where it left off if continuing
+            source.addEventListener('rejected', function() {
+                source.close();
+                rangeStream.classList.add('hidden');
+                submitRange(resumeFrom);
+            });
+            
+            source.addEventListener('failed', function(e) {
+                source.close();
+                heading.textContent = 'Search failed';
+                status.textContent = JSON.parse(e.data).message;
+            });
+            
+            source.onerror = function() {
+                if (source.readyState !== EventSource.CLOSED) {
+                    source.close();
+                    status.textContent = 'The connection was lost before the search finished.';
+                }
+            };
+        }
+        
+        rangeForm.addEventListener('submit', function(e) {
+            // Invalid forms are already stopped, and "Queue as a Job" posts as usual
+            if (e.defaultPrevented || (e.submitter && e.submitter.hasAttribute('formaction'))) {
+                return;
+            }
+            e.preventDefault();
+            streamRange(new URLSearchParams(new FormData(rangeForm)).toString());
+        });
+        
+        continueButton.addEventListener('click', function() {
+            if (continuation) {
+                streamRange(new URLSearchParams({ continuation: continuation }).toString(), continuation);
+            }
+        });
+    }
 });
@@ -0,0 +1,22 @@
+"""
+JSON API Blueprint registry.
+
+Versioned endpoints for internal services, authenticated with JWT access tokens.
+"""
+
+from __future__ import annotations
+
+from flask import Blueprint
+
+
+from .auth import bp as auth_bp
+from .calculator import bp as calculator_bp
+
+def create_api_blueprint():
+    """Create and return the v1 API blueprint."""
+    api_bp = Blueprint("api", __name__, url_prefix="/api/v1")
+    
+    api_bp.register_blueprint(auth_bp)
+    api_bp.register_blueprint(calculator_bp)
+    
+    return api_bp
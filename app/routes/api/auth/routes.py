@@ -0,0 +1,31 @@
+"""
+API authentication routes.
+"""
+from flask import request
+from flask_jwt_extended import create_access_token
+
+from app.models.user import AppUser
+from app.utils.helpers.api_response import error_response, success_response
+
+from . import bp
+
+
+@bp.route("/token", methods=["POST"])
+def token():
+    """Exchange a username (or email) and password for a JWT access token."""
+    data = request.get_json(silent=True) or {}
+    username = str(data.get("username", "")).strip()
+    password = str(data.get("password", ""))
+    
+    if not username or not password:
+        return error_response("Please provide both username and password.", 400)
+    
+    # Find user by username or email
+    user = AppUser.query.filter(
+        (AppUser.username == username) | (AppUser.email == username)
+    ).first()
+    
+    if not user or not user.password_hash or not user.check_password(password):
+        return error_response("Invalid username or password.", 401)
+    
+    return success_response("Token issued", 200, {"access_token": create_access_token(identity=str(user.id))})
@@ -0,0 +1,271 @@
+"""
+Armstrong number calculator API routes.
+
+Payloads are kept compact: checks return the verdict without calculation
+strings unless `details` is requested, and ranges return plain integer arrays.
+"""
+import time
+from flask import current_app, request
+from flask_jwt_extended import jwt_required
+from sqlalchemy.orm import joinedload
+
+from app.enums.jobs import JobStatus
+from app.logging import log_error
+from app.models.attempt import Attempt
+from app.models.job import Job
+from app.utils.admission import ADMIT_JOB, ADMIT_REJECT, admit
+from app.utils.armstrong import (
+    DigitPowerFamily, check_digit_string, parse_digit_string,
+    parse_range_continuation, plan_range_query, run_batch_check, run_range_query,
+)
+from app.utils.attempts import load_attempt_result, save_batch_attempts, save_check_attempt, save_range_attempt
+from app.utils.calculator_limits import MAX_BATCH_NUMBER_LENGTH, MAX_BATCH_SIZE, parse_base_and_family
+from app.utils.helpers.api_response import error_response, success_response
+from app.utils.helpers.pagination import keyset_paginate
+from app.utils.helpers.user import get_current_user
+from app.utils.jobs import JOB_KIND_RANGE, enqueue_job, job_progress
+
+from . import bp
+
+# Most attempts returned per page.
+MAX_ATTEMPTS_PER_PAGE = 100
+
+
+def _read_options(data: dict) -> tuple[int, DigitPowerFamily]:
+    """
+    Read the base and digit-power family from a request body.
+    
+    Raises:
+        ValueError: With a message for the caller if either is invalid
+    """
+    def read_int(key: str, default: int | None = None) -> int | None:
+        value = data.get(key, default)
+        return value if isinstance(value, int) and not isinstance(value, bool) else None
+    
+    return parse_base_and_family(read_int("base", 10), data.get("family"), read_int("exponent"))
+
+
+def _read_integer(data: dict, key: str) -> int:
+    """Read a non-negative integer, given as a JSON number or a digit string."""
+    value = data.get(key)
+    if isinstance(value, str) and value.strip().isascii() and value.strip().isdigit():
+        return int(value.strip())
+    if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+        return value
+    raise ValueError(f"{key} must be a non-negative integer.")
+
+
+@bp.route("/check", methods=["POST"])
+@jwt_required()
+def check_number():
+    """
+    Check a single number.
+    
+    Body: `number` (integer or digit string), optional `base`, `family`,
+    `exponent`, and `details` to include the calculation.
+    """
+    user = get_current_user()
+    if user is None:
+        return error_response("Unauthorized", 401)
+    
+    try:
+        data = request.get_json(silent=True) or {}
+        number = data.get("number")
+        if isinstance(number, int) and not isinstance(number, bool) and number >= 0:
+            number = str(number)
+        
+        try:
+            if not isinstance(number, str):
+                raise ValueError("number must be a non-negative integer or digit string.")
+            # Kept as a digit string: long inputs are decided on length without ever becoming an int
+            digits = parse_digit_string(number)
+            base, family = _read_options(data)
+        except ValueError as e:
+            return error_response(str(e), 400)
+        
+        is_armstrong, details = check_digit_string(digits, base, family)
+        save_check_attempt(user.id, digits, details, family)
+        
+        resp_data = {"is_armstrong": is_armstrong, "num_digits": details.num_digits, "decided_by": details.decided_by}
+        if data.get("details"):
+            resp_data.update(details.to_dict())
+            resp_data["calculation"] = details.render_calculation()
+        return success_response("Number checked", 200, resp_data)
+    
+    except Exception as e:
+        log_error("API check failed", e)
+        return error_response(f"Error checking number: {str(e)}", 500)
+
+
+@bp.route("/batch", methods=["POST"])
+@jwt_required()
+def check_batch():
+    """
+    Check many numbers at once.
+    
+    Body: `numbers` (array of integers or digit strings), optional `base`,
+    `family` and `exponent`. Returns the members only, in input order.
+    """
+    user = get_current_user()
+    if user is None:
+        return error_response("Unauthorized", 401)
+    
+    try:
+        data = request.get_json(silent=True) or {}
+        values = data.get("numbers")
+        
+        try:
+            if not isinstance(values, list) or not values:
+                raise ValueError("numbers must be a non-empty array.")
+            if len(values) > MAX_BATCH_SIZE:
+                raise ValueError(f"Too many numbers. Please check {MAX_BATCH_SIZE:,} or fewer at a time.")
+            
+            numbers = []
+            for value in values:
+                token = str(value) if isinstance(value, int) and not isinstance(value, bool) else value
+                if not isinstance(token, str) or not (token.isascii() and token.isdigit()) or len(token) > MAX_BATCH_NUMBER_LENGTH:
+                    raise ValueError(f"numbers must be non-negative integers of up to {MAX_BATCH_NUMBER_LENGTH} digits.")
+                numbers.append(int(token))
+            
+            base, family = _read_options(data)
+        except ValueError as e:
+            return error_response(str(e), 400)
+        
+        results, _ = run_batch_check(numbers, base, family)
+        save_batch_attempts(user.id, numbers, results, base, family)
+        
+        members = [number for number, is_armstrong in zip(numbers, results) if is_armstrong]
+        return success_response("Numbers checked", 200, {"count": len(numbers), "members": members})
+    
+    except Exception as e:
+        log_error("API batch check failed", e)
+        return error_response(f"Error checking numbers: {str(e)}", 500)
+
+
+@bp.route("/range", methods=["POST"])
+@jwt_required()
+def find_range():
+    """
+    Find the members of a family in a range.
+    
+    Body: `min` and `max`, optional `base`, `family`, `exponent` and `verify`;
+    or a `continuation` from an earlier partial result. Searches too long to
+    run in the request are queued as jobs (202), or refused (422).
+    """
+    user = get_current_user()
+    if user is None:
+        return error_response("Unauthorized", 401)
+    
+    try:
+        data = request.get_json(silent=True) or {}
+        
+        try:
+            if data.get("continuation"):
+                min_num, max_num, base, family, verify = parse_range_continuation(str(data["continuation"]))
+            else:
+                min_num, max_num = _read_integer(data, "min"), _read_integer(data, "max")
+                if max_num < min_num:
+                    raise ValueError("max must be greater than or equal to min.")
+                base, family = _read_options(data)
+                verify = bool(data.get("verify"))
+        except ValueError as e:
+            return error_response(str(e), 400)
+        
+        decision = admit(plan_range_query(min_num, max_num, base, family, verify))
+        
+        if decision.action == ADMIT_REJECT:
+            return error_response(decision.reason, 422)
+        
+        if decision.action == ADMIT_JOB:
+            job = enqueue_job(user.id, JOB_KIND_RANGE, {
+                "min_num": min_num,
+                "max_num": max_num,
+                "base": base,
+                "family": family.name,
+                "exponent": family.exponent,
+                "verify": verify,
+            }, priority=-int(decision.plan.estimate))
+            return success_response(decision.reason, 202, {"job_id": str(job.id), "status": str(job.status)})
+        
+        # Searches that the web pages queue as short background jobs run here up to the deadline instead
+        deadline = time.monotonic() + current_app.config.get("QUERY_DEADLINE_SECONDS", 10)
+        result = run_range_query(min_num, max_num, base, family, verify, plan=decision.plan, deadline=deadline)
+        save_range_attempt(user.id, result)
+        
+        return success_response("Range searched", 200, {
+            "numbers": result.numbers,
+            "min": result.min_num,
+            "searched_to": result.searched_to,
+            "complete": result.complete,
+            "continuation": result.continuation(),
+            "engine": result.plan.engine,
+        })
+    
+    except Exception as e:
+        log_error("API range search failed", e)
+        return error_response(f"Error finding range: {str(e)}", 500)
+
+
+@bp.route("/jobs/<uuid:job_id>", methods=["GET"])
+@jwt_required()
+def job_status(job_id):
+    """Report a queued range search, with its numbers once it has finished."""
+    user = get_current_user()
+    if user is None:
+        return error_response("Unauthorized", 401)
+    
+    job = Job.query.filter_by(id=job_id, user_id=user.id).first()
+    if job is None:
+        return error_response("Job not found", 404)
+    
+    resp_data = {"status": str(job.status), "progress": job_progress(job)}
+    if job.status == JobStatus.SUCCEEDED:
+        resp_data["numbers"] = job.data["numbers"]
+    elif job.error:
+        resp_data["error"] = job.error
+    return success_response("Job status fetched", 200, resp_data)
+
+
+@bp.route("/attempts", methods=["GET"])
+@jwt_required()
+def attempts():
+    """
+    List the user's attempts, newest first.
+    
+    Query: `cursor` (a `next` or `prev` token from an earlier page), `per_page`
+    (up to 100), and `results=1` to include each attempt's stored result.
+    """
+    user = get_current_user()
+    if user is None:
+        return error_response("Unauthorized", 401)
+    
+    cursor = request.args.get("cursor")
+    per_page = min(max(request.args.get("per_page", 20, type=int), 1), MAX_ATTEMPTS_PER_PAGE)
+    with_results = request.args.get("results") == "1"
+    
+    attempts_query = Attempt.query.filter_by(user_id=user.id)
+    if with_results:
+        attempts_query = attempts_query.options(joinedload(Attempt.result_blob))
+    attempts_page = keyset_paginate(attempts_query, Attempt.created_at, Attempt.id, cursor, per_page)
+    
+    attempts_list = []
+    for attempt in attempts_page.items:
+        item = {
+            "id": str(attempt.id),
+            "created_at": attempt.created_at.isoformat() if attempt.created_at else None,
+            "type": attempt.input_type,
+            "input": attempt.input_value,
+            "base": attempt.base,
+            "family": attempt.family,
+            "is_armstrong": attempt.is_armstrong,
+            "count": attempt.count,
+        }
+        if with_results:
+            item["result"] = load_attempt_result(attempt)
+        attempts_list.append(item)
+    
+    return success_response("Attempts fetched", 200, {
+        "attempts": attempts_list,
+        "next": attempts_page.next_cursor,
+        "prev": attempts_page.prev_cursor,
+    })
@@ -2,15 +2,172 @@
 Armstrong number calculator routes.
 """
 import json
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+import re
+import time
+from contextlib import closing
+from flask import Blueprint, Response, current_app, render_template, request, redirect, stream_with_context, url_for, flash, jsonify
 from flask_login import login_required, current_user
 
+from app.enums.jobs import JobStatus
 from app.extensions import db
+from app.logging import log_error
 from app.models.attempt import Attempt
-from app.utils.armstrong import is_armstrong_number, find_armstrong_numbers_in_range, check_armstrong_with_details
+from app.models.job import Job
+from app.utils.admission import ADMIT_BACKGROUND, ADMIT_INLINE, ADMIT_JOB, ADMIT_REJECT, admit
+from app.utils.attempts import get_attempt_recorder, save_batch_attempts, save_check_attempt, save_range_attempt, save_trajectory_attempt
+from app.utils.armstrong import (
+    DigitPowerFamily, QueryPlan, RangeQueryResult, check_digit_string, parse_digit_string,
+    get_trajectory_graph, iter_range_query, parse_range_continuation, plan_range_query, run_batch_check, run_range_query,
+)
+from app.utils.calculator_limits import (
+    MAX_BATCH_NUMBER_LENGTH, MAX_BATCH_SIZE, MAX_TRAJECTORY_EXPONENT, MAX_TRAJECTORY_RANGE, parse_base_and_family,
+)
+from app.utils.helpers.api_response import error_response, success_response
+from app.utils.helpers.pagination import keyset_paginate
+from app.utils.jobs import JOB_KIND_RANGE, enqueue_job, job_progress
 
 from . import bp
 
+# Streamed range searches send progress at most this often, in seconds.
+STREAM_PROGRESS_INTERVAL = 0.25
+
+
+def _read_base_and_family() -> tuple[int, DigitPowerFamily]:
+    """
+    Read and validate the base and digit-power family (and PDI exponent), submitted or in the query string.
+    
+    Returns:
+        (base, family), with the base defaulting to 10 and the family to Armstrong numbers
+    
+    Raises:
+        ValueError: With a message for the user if either is invalid
+    """
+    def read_int(key: str, default: str = "") -> int | None:
+        try:
+            return int(request.values.get(key, "").strip() or default)
+        except ValueError:
+            return None
+    
+    return parse_base_and_family(read_int("base", "10"), request.values.get("family", "").strip(), read_int("exponent"))
+
+
+def _with_article(label: str) -> str:
+    return f"{'an' if label[0] in 'AEIOUaeiou' else 'a'} {label}"
+
+
+def _read_range_form() -> tuple[int, int, int, DigitPowerFamily, bool]:
+    """
+    Read and validate the range search form, submitted or in the query string.
+    
+    Returns:
+        (min_num, max_num, base, family, verify)
+    
+    Raises:
+        ValueError: With a message for the user if the form is invalid
+    """
+    min_str = request.values.get("min_number", "").strip()
+    max_str = request.values.get("max_number", "").strip()
+    
+    if not min_str or not max_str:
+        raise ValueError("Please enter both minimum and maximum numbers.")
+    
+    try:
+        min_num = int(min_str)
+        max_num = int(max_str)
+    except ValueError:
+        raise ValueError("Please enter valid integers.")
+    
+    if min_num < 0:
+        raise ValueError("Minimum number must be non-negative.")
+    
+    if max_num < min_num:
+        raise ValueError("Maximum number must be greater than or equal to minimum number.")
+    
+    base, family = _read_base_and_family()
+    return min_num, max_num, base, family, bool(request.values.get("verify"))
+
+
+def _enqueue_range_job(min_num: int, max_num: int, base: int, family: DigitPowerFamily, verify: bool, plan: QueryPlan) -> Job:
+    """Queue a range query for `flask worker`. Cheaper jobs get a higher priority, so short ones are not stuck behind long ones."""
+    return enqueue_job(current_user.id, JOB_KIND_RANGE, {
+        "min_num": min_num,
+        "max_num": max_num,
+        "base": base,
+        "family": family.name,
+        "exponent": family.exponent,
+        "verify": verify,
+    }, priority=-int(plan.estimate))
+
+
+def _get_own_job(job_id) -> Job | None:
+    """The current user's job with this id, or None."""
+    return Job.query.filter_by(id=job_id, user_id=current_user.id).first()
+
+
+def _find_range_and_save(
+    user_id,
+    min_num: int,
+    max_num: int,
+    base: int,
+    family: DigitPowerFamily,
+    verify: bool,
+    plan: QueryPlan,
+    deadline: float | None = None,
+) -> RangeQueryResult:
+    """
+    Run a planned range query and save it as an attempt.
+    
+    A query stopped by its deadline is recorded only for the part it searched,
+    with the continuation for the rest.
+    """
+    result = run_range_query(min_num, max_num, base, family, verify, plan=plan, deadline=deadline)
+    save_range_attempt(user_id, result)
+    return result
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _admit_and_find_range(min_num: int, max_num: int, base: int, family: DigitPowerFamily, verify: bool):
+    """Admit a validated range query, then run it inline or queue it as a job, or reject it."""
+    decision = admit(plan_range_query(min_num, max_num, base, family, verify))
+    
+    if decision.action == ADMIT_REJECT:
+        flash(decision.reason, "error")
+        return redirect(url_for("web.web_public.calculator.index"))
+    
+    # Background queries are queued too, so they survive a restart and run under the worker's
+    # leases and deadlines; their low estimate puts them ahead of the longer jobs.
+    if decision.action in (ADMIT_BACKGROUND, ADMIT_JOB):
+        _enqueue_range_job(min_num, max_num, base, family, verify, decision.plan)
+        flash(decision.reason, "info")
+        return redirect(url_for("web.web_public.calculator.attempts"))
+    
+    # Inline queries stop at the deadline, so a worker is never held much longer
+    deadline = time.monotonic() + current_app.config.get("QUERY_DEADLINE_SECONDS", 10)
+    result = _find_range_and_save(current_user.id, min_num, max_num, base, family, verify, decision.plan, deadline)
+    
+    # Flash result
+    searched = f"{result.min_num}-{result.searched_to}"
+    if not result.complete:
+        flash(f"Partial result: searched {searched} of {result.max_num} before the time limit.", "info")
+    elif result.numbers:
+        flash(f"Found {len(result.numbers)} {family.label}(s) in range {searched}.", "success")
+    else:
+        flash(f"No {family.label}s found in range {searched}.", "info")
+    
+    return render_template("public/pages/calculator/index.html",
+                         range_result=result.numbers,
+                         range_searched_to=result.searched_to,
+                         range_continuation=result.continuation(),
+                         min_num=result.min_num,
+                         max_num=max_num,
+                         verify=verify,
+                         base=base,
+                         family=family)
+
 
 @bp.route("/", methods=["GET"])
 @login_required
@@ -30,100 +187,353 @@ def check_number():
             flash("Please enter a number.", "error")
             return redirect(url_for("web.web_public.calculator.index"))
         
+        # Kept as a digit string: long inputs are decided on length without ever becoming an int
+        if number_str.startswith("-") and number_str[1:].isdigit():
+            flash("Please enter a non-negative number.", "error")
+            return redirect(url_for("web.web_public.calculator.index"))
+        
         try:
-            number = int(number_str)
+            digits = parse_digit_string(number_str)
         except ValueError:
             flash("Please enter a valid integer.", "error")
             return redirect(url_for("web.web_public.calculator.index"))
         
-        if number < 0:
-            flash("Please enter a non-negative number.", "error")
+        try:
+            base, family = _read_base_and_family()
+        except ValueError as e:
+            flash(str(e), "error")
             return redirect(url_for("web.web_public.calculator.index"))
         
-        # Check if Armstrong number
-        is_armstrong, details = check_armstrong_with_details(number)
+        # Check if Armstrong number (or a member of the chosen family)
+        is_armstrong, details = check_digit_string(digits, base, family)
         
         # Save attempt
-        attempt = Attempt()
-        attempt.user_id = current_user.id
-        attempt.input_value = str(number)
-        attempt.input_type = "single"
-        attempt.is_armstrong = is_armstrong
-        attempt.result = json.dumps(details)
-        attempt.save()
+        save_check_attempt(current_user.id, digits, details, family)
         
         # Flash result
         if is_armstrong:
-            flash(f"{number} is an Armstrong number! {details['calculation']}", "success")
+            flash(f"{details.label} is {_with_article(family.label)}! {details.calculation}", "success")
         else:
-            flash(f"{number} is NOT an Armstrong number. {details['calculation']}", "info")
+            flash(f"{details.label} is NOT {_with_article(family.label)}. {details.calculation}", "info")
         
         return render_template("public/pages/calculator/index.html", 
                              check_result=details, 
-                             checked_number=number)
+                             checked_number=details.label if details.number is not None else "",
+                             base=base,
+                             family=family)
     
     except Exception as e:
         flash(f"Error checking number: {str(e)}", "error")
         return redirect(url_for("web.web_public.calculator.index"))
 
 
+@bp.route("/check/batch", methods=["POST"])
+@login_required
+def check_batch():
+    """Check many numbers in one request."""
+    try:
+        tokens = [token for token in re.split(r"[\s,]+", request.form.get("numbers", "")) if token]
+        
+        if not tokens:
+            flash("Please enter at least one number.", "error")
+            return redirect(url_for("web.web_public.calculator.index"))
+        
+        if len(tokens) > MAX_BATCH_SIZE:
+            flash(f"Too many numbers. Please check {MAX_BATCH_SIZE:,} or fewer at a time.", "error")
+            return redirect(url_for("web.web_public.calculator.index"))
+        
+        # isdigit() alone also accepts digits such as "²" and "٣", which int() rejects or reads differently
+        if any(not (token.isascii() and token.isdigit()) or len(token) > MAX_BATCH_NUMBER_LENGTH for token in tokens):
+            flash(f"Please enter only non-negative integers of up to {MAX_BATCH_NUMBER_LENGTH} digits.", "error")
+            return redirect(url_for("web.web_public.calculator.index"))
+        
+        try:
+            base, family = _read_base_and_family()
+        except ValueError as e:
+            flash(str(e), "error")
+            return redirect(url_for("web.web_public.calculator.index"))
+        
+        numbers = [int(token) for token in tokens]
+        results, _ = run_batch_check(numbers, base, family)
+        
+        # Save all attempts with a single bulk insert
+        save_batch_attempts(current_user.id, numbers, results, base, family)
+        
+        armstrong_numbers = [number for number, is_armstrong in zip(numbers, results) if is_armstrong]
+        
+        # Flash result
+        if armstrong_numbers:
+            flash(f"{len(armstrong_numbers)} of {len(numbers)} number(s) are {family.label}s.", "success")
+        else:
+            flash(f"None of the {len(numbers)} number(s) are {family.label}s.", "info")
+        
+        return render_template("public/pages/calculator/index.html",
+                             batch_result=armstrong_numbers,
+                             batch_count=len(numbers),
+                             base=base,
+                             family=family)
+    
+    except Exception as e:
+        db.session.rollback()
+        flash(f"Error checking numbers: {str(e)}", "error")
+        return redirect(url_for("web.web_public.calculator.index"))
+
+
 @bp.route("/range", methods=["POST"])
 @login_required
 def find_range():
     """Find all Armstrong numbers in a range."""
     try:
-        min_str = request.form.get("min_number", "").strip()
-        max_str = request.form.get("max_number", "").strip()
-        
-        if not min_str or not max_str:
-            flash("Please enter both minimum and maximum numbers.", "error")
+        try:
+            min_num, max_num, base, family, verify = _read_range_form()
+        except ValueError as e:
+            flash(str(e), "error")
             return redirect(url_for("web.web_public.calculator.index"))
         
+        # Find Armstrong numbers (or members of the chosen family) on the cheapest engine
+        return _admit_and_find_range(min_num, max_num, base, family, verify)
+    
+    except Exception as e:
+        flash(f"Error finding range: {str(e)}", "error")
+        return redirect(url_for("web.web_public.calculator.index"))
+
+
+@bp.route("/range/stream", methods=["GET"])
+@login_required
+def stream_range():
+    """
+    Stream a range search as Server-Sent Events.
+    
+    Takes the range form fields, or a `continuation`, in the query string. Sends a
+    `plan` event, a `hit` event for each member as its segment finishes, `progress`
+    events with the scanned fraction and throughput, and a closing `done` event.
+    Members and bounds are sent as decimal strings, since JavaScript numbers lose
+    precision above 2^53 and the catalogue reaches 39 digits.
+    Only searches admitted inline are streamed, and they stop at the same
+    QUERY_DEADLINE_SECONDS as other inline searches. Anything costlier gets a
+    `rejected` event, so the page submits it normally to be run in the background,
+    queued as a job or refused. Invalid input gets a `failed` event.
+    """
+    try:
+        if request.args.get("continuation"):
+            min_num, max_num, base, family, verify = parse_range_continuation(request.args["continuation"])
+        else:
+            min_num, max_num, base, family, verify = _read_range_form()
+    except ValueError as e:
+        return Response(_sse("failed", {"message": str(e)}), mimetype="text/event-stream")
+    
+    decision = admit(plan_range_query(min_num, max_num, base, family, verify))
+    if decision.action != ADMIT_INLINE:
+        return Response(_sse("rejected", {"message": decision.reason, "action": decision.action}), mimetype="text/event-stream")
+    
+    user_id = current_user.id
+    deadline_seconds = current_app.config.get("QUERY_DEADLINE_SECONDS", 10)
+    
+    @stream_with_context
+    def events():
+        plan = decision.plan
+        low = max(min_num, 0)
+        span = max_num - low + 1
+        deadline = time.monotonic() + deadline_seconds
+        started = time.perf_counter()
+        last_progress = 0.0
+        numbers = []
+        next_num = low
+        
+        def past_deadline() -> bool:
+            return next_num > low and time.monotonic() >= deadline
+        
+        yield _sse("plan", {"min_num": str(low), "max_num": str(max_num), "base": base, "family": family.name, "label": family.label, **plan.to_dict()})
         try:
-            min_num = int(min_str)
-            max_num = int(max_str)
+            # A client that disconnects closes this generator at its next yield, and
+            # closing the search stops a parallel scan's pool along with it
+            with closing(iter_range_query(low, max_num, base, family, plan, past_deadline)) as chunks:
+                for found, next_num in chunks:
+                    for number in found:
+                        yield _sse("hit", {"number": str(number)})
+                    numbers.extend(found)
+                    
+                    elapsed = time.perf_counter() - started
+                    if elapsed - last_progress >= STREAM_PROGRESS_INTERVAL or next_num > max_num:
+                        last_progress = elapsed
+                        yield _sse("progress", {
+                            "searched_to": str(next_num - 1),
+                            "fraction": min((next_num - low) / span, 1.0),
+                            "numbers_per_second": (next_num - low) / elapsed if elapsed else None,
+                            "found": len(numbers),
+                        })
+                    
+                    if next_num <= max_num and past_deadline():
+                        break
+            
+            plan.elapsed = time.perf_counter() - started
+            plan.log()
+            result = RangeQueryResult(numbers, plan, low, max_num, next_num, base, family, verify)
+            save_range_attempt(user_id, result)
+        except Exception as e:
+            log_error("Streamed range search failed", e)
+            yield _sse("failed", {"message": f"Error finding range: {str(e)}"})
+            return
+        
+        yield _sse("done", {
+            "count": len(numbers),
+            "searched_to": str(result.searched_to),
+            "resume_from": None if result.complete else str(result.next_num),
+            "complete": result.complete,
+            "continuation": result.continuation(),
+            "seconds": plan.elapsed,
+        })
+    
+    # Tell proxies not to buffer the stream
+    return Response(events(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@bp.route("/range/continue", methods=["POST"])
+@login_required
+def continue_range():
+    """Continue a range search that stopped at its deadline."""
+    try:
+        try:
+            min_num, max_num, base, family, verify = parse_range_continuation(request.form.get("continuation", ""))
         except ValueError:
-            flash("Please enter valid integers.", "error")
+            flash("This search can no longer be continued. Please start it again.", "error")
+            return redirect(url_for("web.web_public.calculator.index"))
+        
+        return _admit_and_find_range(min_num, max_num, base, family, verify)
+    
+    except Exception as e:
+        flash(f"Error finding range: {str(e)}", "error")
+        return redirect(url_for("web.web_public.calculator.index"))
+
+
+@bp.route("/jobs", methods=["POST"])
+@login_required
+def submit_job():
+    """Queue a range search as a job, however cheap, instead of running it now."""
+    try:
+        try:
+            min_num, max_num, base, family, verify = _read_range_form()
+        except ValueError as e:
+            flash(str(e), "error")
+            return redirect(url_for("web.web_public.calculator.index"))
+        
+        decision = admit(plan_range_query(min_num, max_num, base, family, verify))
+        if decision.action == ADMIT_REJECT:
+            flash(decision.reason, "error")
+            return redirect(url_for("web.web_public.calculator.index"))
+        
+        _enqueue_range_job(min_num, max_num, base, family, verify, decision.plan)
+        flash("Your search has been queued as a job. Its result will appear in My Attempts when it finishes.", "info")
+        return redirect(url_for("web.web_public.calculator.attempts"))
+    
+    except Exception as e:
+        flash(f"Error queueing job: {str(e)}", "error")
+        return redirect(url_for("web.web_public.calculator.index"))
+
+
+@bp.route("/jobs/<uuid:job_id>", methods=["GET"])
+@login_required
+def job_status(job_id):
+    """Report a job's status and progress as JSON."""
+    job = _get_own_job(job_id)
+    if job is None:
+        return error_response("Job not found", 404)
+    
+    return success_response("Job status fetched", 200, {**job.to_dict(), "progress": job_progress(job)})
+
+
+@bp.route("/jobs/<uuid:job_id>/result", methods=["GET"])
+@login_required
+def job_result(job_id):
+    """Return a finished job's result as JSON."""
+    job = _get_own_job(job_id)
+    if job is None:
+        return error_response("Job not found", 404)
+    
+    if job.status != JobStatus.SUCCEEDED:
+        return error_response(f"Job is {job.status}", 409, {"status": str(job.status), "error": job.error})
+    
+    data = job.data
+    return success_response("Job result fetched", 200, {
+        "numbers": data["numbers"],
+        "count": len(data["numbers"]),
+        "min_num": data["min_num"],
+        "max_num": data["max_num"],
+        "base": data["base"],
+        "family": data["family"],
+        "attempt_id": str(job.attempt_id) if job.attempt_id else None,
+    })
+
+
+@bp.route("/trajectory", methods=["POST"])
+@login_required
+def trajectory():
+    """Follow the digit-power-sum map from a number, or summarize the basins of a range."""
+    try:
+        number_str = request.form.get("number", "").strip()
+        max_str = request.form.get("max_number", "").strip()
+        exponent_str = request.form.get("exponent", "").strip()
+        
+        if not number_str:
+            flash("Please enter a number.", "error")
             return redirect(url_for("web.web_public.calculator.index"))
         
-        if min_num < 0:
-            flash("Minimum number must be non-negative.", "error")
+        if not (number_str.isascii() and number_str.isdigit()) or (max_str and not (max_str.isascii() and max_str.isdigit())):
+            flash("Please enter non-negative integers.", "error")
             return redirect(url_for("web.web_public.calculator.index"))
         
-        if max_num < min_num:
-            flash("Maximum number must be greater than or equal to minimum number.", "error")
+        if len(number_str) > MAX_BATCH_NUMBER_LENGTH:
+            flash(f"Please enter a number of up to {MAX_BATCH_NUMBER_LENGTH} digits.", "error")
             return redirect(url_for("web.web_public.calculator.index"))
         
-        # Limit range to prevent performance issues
-        if max_num - min_num > 1000000:
-            flash("Range too large. Please use a range of 1,000,000 or less.", "error")
+        exponent = None
+        if exponent_str:
+            try:
+                exponent = int(exponent_str)
+            except ValueError:
+                exponent = 0
+            if not 1 <= exponent <= MAX_TRAJECTORY_EXPONENT:
+                flash(f"Exponent must be between 1 and {MAX_TRAJECTORY_EXPONENT}, or blank to use the digit count.", "error")
+                return redirect(url_for("web.web_public.calculator.index"))
+        
+        number = int(number_str)
+        max_num = int(max_str) if max_str else None
+        
+        if max_num is not None and max_num < number:
+            flash("Maximum number must be greater than or equal to the starting number.", "error")
             return redirect(url_for("web.web_public.calculator.index"))
         
-        # Find Armstrong numbers
-        armstrong_numbers = find_armstrong_numbers_in_range(min_num, max_num)
+        # Limit range summaries to prevent performance issues
+        if max_num is not None and max_num - number > MAX_TRAJECTORY_RANGE:
+            flash(f"Range too large. Please summarize {MAX_TRAJECTORY_RANGE:,} numbers or fewer at a time.", "error")
+            return redirect(url_for("web.web_public.calculator.index"))
         
-        # Save attempt
-        attempt = Attempt()
-        attempt.user_id = current_user.id
-        attempt.input_value = f"{min_num}-{max_num}"
-        attempt.input_type = "range"
-        attempt.count = len(armstrong_numbers)
-        attempt.result = json.dumps({"numbers": armstrong_numbers})
-        attempt.save()
+        graph = get_trajectory_graph(exponent)
         
-        # Flash result
-        if armstrong_numbers:
-            flash(f"Found {len(armstrong_numbers)} Armstrong number(s) in range {min_num}-{max_num}.", "success")
+        if max_num is None:
+            trajectory_result = graph.trajectory(number)
+            basins = None
+            save_trajectory_attempt(current_user.id, str(number), trajectory_result["cycle_length"], trajectory_result)
+            flash(
+                f"{number} reaches a cycle of length {trajectory_result['cycle_length']} "
+                f"after {trajectory_result['steps']} step(s).",
+                "success",
+            )
         else:
-            flash(f"No Armstrong numbers found in range {min_num}-{max_num}.", "info")
+            trajectory_result = None
+            basins = sorted(graph.summarize_range(number, max_num).values(), key=lambda basin: -basin["count"])
+            save_trajectory_attempt(current_user.id, f"{number}-{max_num}", len(basins), {"exponent": exponent, "basins": basins})
+            flash(f"Numbers {number}-{max_num} drain into {len(basins)} cycle(s).", "success")
         
         return render_template("public/pages/calculator/index.html",
-                             range_result=armstrong_numbers,
-                             min_num=min_num,
-                             max_num=max_num)
+                             trajectory_result=trajectory_result,
+                             trajectory_basins=basins,
+                             trajectory_exponent=exponent,
+                             trajectory_start=number,
+                             trajectory_end=max_num)
     
     except Exception as e:
-        flash(f"Error finding range: {str(e)}", "error")
+        flash(f"Error following trajectory: {str(e)}", "error")
         return redirect(url_for("web.web_public.calculator.index"))
 
 
@@ -131,22 +541,26 @@ def find_range():
 @login_required
 def attempts():
     """View user's attempt history."""
-    page = request.args.get("page", 1, type=int)
+    cursor = request.args.get("cursor")
     per_page = 20
     
-    attempts_query = Attempt.query.filter_by(user_id=current_user.id).order_by(Attempt.created_at.desc())
-    attempts_paginated = attempts_query.paginate(page=page, per_page=per_page, error_out=False)
+    # The page lists attempts without their results, so the result blobs are never loaded
+    attempts_query = Attempt.query.filter_by(user_id=current_user.id)
+    attempts_page = keyset_paginate(attempts_query, Attempt.created_at, Attempt.id, cursor, per_page)
+    attempts_list = [attempt.to_dict() for attempt in attempts_page.items]
     
-    # Parse results for display
-    attempts_list = []
-    for attempt in attempts_paginated.items:
-        attempt_dict = attempt.to_dict()
-        try:
-            attempt_dict["result_data"] = json.loads(attempt.result) if attempt.result else None
-        except:
-            attempt_dict["result_data"] = attempt.result
-        attempts_list.append(attempt_dict)
+    # Jobs still waiting for a worker, or failed, are listed above the attempts
+    jobs = (
+        Job.query
+        .filter(Job.user_id == current_user.id, Job.status != JobStatus.SUCCEEDED)
+        .order_by(Job.created_at.desc())
+        .limit(per_page)
+        .all()
+    )
+    jobs_list = [{**job.to_dict(), "data": job.data, "progress": job_progress(job)} for job in jobs]
     
     return render_template("public/pages/calculator/attempts.html",
                          attempts=attempts_list,
-                         pagination=attempts_paginated)
+                         jobs=jobs_list,
+                         write_behind=get_attempt_recorder() is not None,
+                         pagination=attempts_page)
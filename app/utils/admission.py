@@ -0,0 +1,97 @@
+"""
+Admission control for expensive calculator queries.
+
+Every query is planned before it runs (see `app.utils.armstrong.plan_range_query`).
+The plan's cost estimate decides whether it runs inline in the request, is
+queued as a job for `flask worker`, or is rejected for exceeding even the
+job budget. Queries under the background budget are queued too, but their
+cost puts them ahead of longer jobs (see `enqueue_job`'s priority). Nothing
+long-running is left on threads inside the web worker, where it would have
+no deadline and would be lost on a restart.
+"""
+from flask import current_app
+
+from app.logging import log_event
+from app.utils.armstrong import ENGINE_CATALOGUE, QueryPlan
+
+ADMIT_INLINE = "inline"
+ADMIT_BACKGROUND = "background"
+ADMIT_JOB = "job"
+ADMIT_REJECT = "reject"
+
+# Used when the app config does not set them
+DEFAULT_INLINE_SECONDS = 2.0
+DEFAULT_BUDGET_SECONDS = 120.0
+DEFAULT_JOB_BUDGET_SECONDS = 6 * 3600.0
+
+
+class AdmissionDecision:
+    """What to do with a planned query, and why."""
+
+    __slots__ = ("action", "plan", "reason")
+
+    def __init__(self, action: str, plan: QueryPlan, reason: str):
+        self.action = action
+        self.plan = plan
+        self.reason = reason
+
+    def __repr__(self):
+        return f"<AdmissionDecision {self.action}: {self.reason}>"
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds < 1:
+        return "under a second"
+    if seconds < 120:
+        return f"about {seconds:.0f} seconds"
+    if seconds < 7200:
+        return f"about {seconds / 60:.0f} minutes"
+    return f"about {seconds / 3600:,.0f} hours"
+
+
+def admit(plan: QueryPlan) -> AdmissionDecision:
+    """
+    Decide how to run a planned query from its estimated cost.
+
+    Queries estimated under QUERY_INLINE_SECONDS run inline, those under
+    QUERY_BUDGET_SECONDS run in the background (queued as short jobs by the web
+    pages, run up to the request deadline by the API), those under
+    QUERY_JOB_BUDGET_SECONDS are queued as jobs, and anything costlier is rejected.
+
+    Args:
+        plan: The query plan, whose estimate is for its cheapest engine
+
+    Returns:
+        An `AdmissionDecision` whose reason can be shown to the user
+    """
+    inline_seconds = current_app.config.get("QUERY_INLINE_SECONDS", DEFAULT_INLINE_SECONDS)
+    budget_seconds = current_app.config.get("QUERY_BUDGET_SECONDS", DEFAULT_BUDGET_SECONDS)
+    job_budget_seconds = current_app.config.get("QUERY_JOB_BUDGET_SECONDS", DEFAULT_JOB_BUDGET_SECONDS)
+    estimate = _format_seconds(plan.estimate)
+
+    if plan.estimate <= inline_seconds:
+        decision = AdmissionDecision(ADMIT_INLINE, plan, f"Estimated at {estimate} on the {plan.engine} engine.")
+    elif plan.estimate <= budget_seconds:
+        decision = AdmissionDecision(
+            ADMIT_BACKGROUND, plan,
+            f"This query would take {estimate} even on the fastest engine ({plan.engine}), "
+            f"so it is running in the background. Its result will appear in My Attempts shortly.",
+        )
+    elif plan.estimate <= job_budget_seconds:
+        decision = AdmissionDecision(
+            ADMIT_JOB, plan,
+            f"This query would take {estimate} even on the fastest engine ({plan.engine}), "
+            f"so it has been queued as a job. Its result will appear in My Attempts when it finishes.",
+        )
+    else:
+        # Verified queries leave the catalogue out of the plan
+        verified = not any(engine == ENGINE_CATALOGUE for engine, _ in plan.candidates)
+        decision = AdmissionDecision(
+            ADMIT_REJECT, plan,
+            f"This query would take {estimate} even on the fastest engine ({plan.engine}), "
+            f"more than the {_format_seconds(job_budget_seconds).removeprefix('about ')} allowed per query. "
+            f"Please narrow the range{', or leave verification off so the catalogue can answer it' if verified else ''}.",
+        )
+
+    log_event("Query admission", data={"action": decision.action, **plan.to_dict()}, event_type="query_admission")
+    return decision
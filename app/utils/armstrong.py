@@ -1,10 +1,404 @@
 """
 Armstrong number calculation utilities.
 """
-from typing import List, Tuple
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from contextlib import closing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import cached_property, lru_cache
+from math import comb, log
+from multiprocessing.context import BaseContext
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure-Python scan is used without it
+    np = None
 
-def is_armstrong_number(number: int) -> bool:
+logger = logging.getLogger(__name__)
+
+# n * 9^n < 10^(n - 1) for every n above this, so no longer Armstrong numbers exist.
+MAX_ARMSTRONG_DIGITS = 60
+
+MIN_BASE = 2
+MAX_BASE = 36
+DIGIT_CHARACTERS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+# Stages of `classify_armstrong_number`, from cheapest to most expensive.
+STAGE_SIGN = "sign"
+STAGE_LENGTH = "length"
+STAGE_MODULAR = "modular"
+STAGE_EXACT = "exact"
+
+# Inputs with at least this many digits go through the residue checks before the exact sum.
+MODULAR_FILTER_MIN_DIGITS = 20
+RESIDUE_MODULI = (7, 9, 11, 13)
+
+# Inputs with at least this many digits are summed from their digit histogram, one
+# power per distinct digit instead of one per digit. Read at call time, so it can be tuned.
+HISTOGRAM_MIN_DIGITS = 20
+HISTOGRAM_CACHE_SIZE = 4096
+
+# Digit strings too long to be a member are kept as this many leading digits plus a hash.
+DIGIT_PREVIEW_LENGTH = 20
+
+# Digit-power families served by `get_family`.
+FAMILY_ARMSTRONG = "armstrong"
+FAMILY_PDI = "pdi"
+FAMILY_MUNCHHAUSEN = "munchhausen"
+FAMILY_DISARIUM = "disarium"
+
+# Trajectory graphs: nodes remembered per exponent, and the longest walk before giving up.
+TRAJECTORY_CACHE_SIZE = 200000
+MAX_TRAJECTORY_STEPS = 100000
+
+# Rough character budget for calculation strings shown in the UI.
+DISPLAY_CALCULATION_LENGTH = 200
+
+# Numbers are split into blocks of this many digits for table lookups.
+BLOCK_DIGITS = 3
+BLOCK_SIZE = 10 ** BLOCK_DIGITS
+
+# int64 holds every number (and every digit-power sum) up to this many digits.
+NUMPY_MAX_DIGITS = 18
+DEFAULT_CHUNK_SIZE = 1 << 18
+
+# Parallel scans: ranges narrower than this run serially, since a pool costs more to start.
+MIN_PARALLEL_RANGE = 2000000
+SHARDS_PER_WORKER = 4
+MIN_SHARD_SIZE = 250000
+MAX_SHARD_SIZE = 50000000
+CANCEL_POLL_INTERVAL = 0.1
+# Pools are started from multi-threaded processes (web workers, and `flask worker` with its lease
+# heartbeat), where a forked child can inherit a lock another thread was holding. The fork server
+# is single-threaded and preloads this module, so only the first pool in a process pays for imports.
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# Engines behind `iter_range_query`.
+ENGINE_CATALOGUE = "catalogue"
+ENGINE_SCAN = "scan"
+
+# Extra engines for `find_armstrong_numbers_of_length`.
+ENGINE_MULTISET = "multiset"
+LENGTH_ENGINES = (ENGINE_CATALOGUE, ENGINE_SCAN, ENGINE_MULTISET)
+
+# Extra engine for `run_batch_check`: the exact check of each number.
+ENGINE_CHECK = "check"
+
+# Digit-by-digit search of a `PositionalFamily`, the counterpart of the multiset engine.
+ENGINE_POSITIONAL = "positional"
+
+# Planner cost model, in estimated seconds per unit of work. Measured on CPython 3.12;
+# tune against the estimate/elapsed pairs the planner logs.
+PLAN_SECONDS_PER_LOOKUP = 2e-5
+PLAN_SECONDS_PER_MEMBERSHIP = 1e-7
+PLAN_SECONDS_PER_MULTISET = 1.5e-6
+PLAN_SECONDS_PER_SCANNED_NUMBER = 1e-7
+PLAN_SECONDS_PER_NUMPY_NUMBER = 3e-8
+PLAN_SECONDS_PER_CHECK = 1e-6
+PLAN_SECONDS_PER_FAMILY_CHECK = 3e-6
+PLAN_SECONDS_PER_FAMILY_CHECK_DIGIT = 3e-7
+PLAN_SECONDS_PER_POOL_START = 0.1
+PLAN_SECONDS_PER_POOL_SERVER_START = 4.0  # The first pool in a process, while the fork server imports the app
+
+# Range queries run in segments of this size (numbers, or slices per digit length for
+# multiset searches) and check their deadline in between.
+SCAN_SEGMENT_SIZE = 1 << 18
+FAMILY_SCAN_SEGMENT_SIZE = 1 << 14
+MULTISET_SEGMENTS_PER_LENGTH = 10
+
+BACKEND_AUTO = "auto"
+BACKEND_PYTHON = "python"
+BACKEND_NUMPY = "numpy"
+BACKEND_PARALLEL = "parallel"  # Scan shards on a process pool, see `iter_armstrong_numbers_parallel`
+
+_POWERS_OF_TEN = [10 ** exponent for exponent in range(1, MAX_ARMSTRONG_DIGITS + 1)]
+
+# Every base-10 Armstrong number, in ascending order: the 88 positive ones plus 0.
+# Each entry is checked by `is_armstrong_number`, and the list has been checked
+# for completeness against `find_armstrong_numbers_by_multiset`.
+ARMSTRONG_NUMBERS: Tuple[int, ...] = (
+    0,
+    1, 2, 3, 4, 5, 6, 7, 8, 9,
+    153, 370, 371, 407,
+    1634, 8208, 9474,
+    54748, 92727, 93084,
+    548834,
+    1741725, 4210818, 9800817, 9926315,
+    24678050, 24678051, 88593477,
+    146511208, 472335975, 534494836, 912985153,
+    4679307774,
+    32164049650,
+    32164049651,
+    40028394225,
+    42678290603,
+    44708635679,
+    49388550606,
+    82693916578,
+    94204591914,
+    28116440335967,
+    4338281769391370,
+    4338281769391371,
+    21897142587612075,
+    35641594208964132,
+    35875699062250035,
+    1517841543307505039,
+    3289582984443187032,
+    4498128791164624869,
+    4929273885928088826,
+    63105425988599693916,
+    128468643043731391252,
+    449177399146038697307,
+    21887696841122916288858,
+    27879694893054074471405,
+    27907865009977052567814,
+    28361281321319229463398,
+    35452590104031691935943,
+    174088005938065293023722,
+    188451485447897896036875,
+    239313664430041569350093,
+    1550475334214501539088894,
+    1553242162893771850669378,
+    3706907995955475988644380,
+    3706907995955475988644381,
+    4422095118095899619457938,
+    121204998563613372405438066,
+    121270696006801314328439376,
+    128851796696487777842012787,
+    174650464499531377631639254,
+    177265453171792792366489765,
+    14607640612971980372614873089,
+    19008174136254279995012734740,
+    19008174136254279995012734741,
+    23866716435523975980390369295,
+    1145037275765491025924292050346,
+    1927890457142960697580636236639,
+    2309092682616190307509695338915,
+    17333509997782249308725103962772,
+    186709961001538790100634132976990,
+    186709961001538790100634132976991,
+    1122763285329372541592822900204593,
+    12639369517103790328947807201478392,
+    12679937780272278566303885594196922,
+    1219167219625434121569735803609966019,
+    12815792078366059955099770545296129367,
+    115132219018763992565095597973971522400,
+    115132219018763992565095597973971522401,
+)
+
+
+# Every Münchhausen number (sum of d^d, taking 0^0 = 0), in ascending order.
+MUNCHHAUSEN_NUMBERS: Tuple[int, ...] = (0, 1, 3435, 438579088)
+
+# Every Disarium number (sum of each digit raised to its 1-based position), in ascending order.
+DISARIUM_NUMBERS: Tuple[int, ...] = (
+    0, 1, 2, 3, 4, 5, 6, 7, 8, 9,
+    89, 135, 175, 518, 598,
+    1306, 1676, 2427,
+    2646798,
+    12157692622039623539,
+)
+
+
+@lru_cache(maxsize=None)
+def digit_powers(length: int, base: int = 10) -> Tuple[int, ...]:
+    """Return the table of d^length for every digit d of the given base."""
+    return tuple(digit ** length for digit in range(base))
+
+
+@lru_cache(maxsize=128)
+def block_power_sums(length: int) -> Tuple[int, ...]:
+    """
+    Return the precomputed digit-power sums of every BLOCK_DIGITS-digit block.
+    
+    Entry b holds the sum of d^length over the digits of b, with leading zeros
+    contributing nothing, so a number's power sum is the sum of its blocks.
+    """
+    powers = digit_powers(length)
+    sums = list(powers)
+    while len(sums) < BLOCK_SIZE:
+        # Extend the table one decimal digit at a time: sums[10q + r] = sums[q] + d^r.
+        sums = [head + powers[tail] for head in sums for tail in range(10)]
+    return tuple(sums)
+
+
+@lru_cache(maxsize=None)
+def _block_digits(block: int) -> Tuple[int, ...]:
+    """Return the BLOCK_DIGITS digits of a block, zero-padded, most significant first."""
+    digits = []
+    for _ in range(BLOCK_DIGITS):
+        block, digit = divmod(block, 10)
+        digits.append(digit)
+    return tuple(reversed(digits))
+
+
+def count_digits(number: int, base: int = 10) -> int:
+    """
+    Return the number of digits of a non-negative integer in `base`.
+    
+    Large numbers are measured from their bit length rather than by converting
+    them to a string, which is quadratic and refused beyond Python's
+    int-to-string limit.
+    """
+    if base == 10 and number < _POWERS_OF_TEN[-1]:
+        return bisect_right(_POWERS_OF_TEN, number) + 1
+    if number < base:
+        return 1
+    
+    estimate = int((number.bit_length() - 1) * log(2) / log(base)) + 1
+    # The float estimate can only be off by one near a power of the base.
+    if number < base ** (estimate - 1):
+        estimate -= 1
+    elif number >= base ** estimate:
+        estimate += 1
+    return estimate
+
+
+def power_sum(number: int, length: int) -> int:
+    """Return the sum of each decimal digit of `number` raised to `length`."""
+    table = block_power_sums(length)
+    total = 0
+    while number:
+        number, block = divmod(number, BLOCK_SIZE)
+        total += table[block]
+    return total
+
+
+def split_digits(number: int) -> List[int]:
+    """Return the decimal digits of a non-negative integer, most significant first."""
+    blocks = []
+    while number >= BLOCK_SIZE:
+        number, block = divmod(number, BLOCK_SIZE)
+        blocks.append(block)
+    
+    digits = [int(digit) for digit in str(number)]
+    for block in reversed(blocks):
+        digits.extend(_block_digits(block))
+    return digits
+
+
+def to_base_digits(number: int, base: int) -> List[int]:
+    """Return the digits of a non-negative integer in `base`, most significant first."""
+    if base == 10:
+        return split_digits(number)
+    
+    digits = []
+    while True:
+        number, digit = divmod(number, base)
+        digits.append(digit)
+        if not number:
+            break
+    digits.reverse()
+    return digits
+
+
+def format_in_base(number: int, base: int) -> str:
+    """Return the textual representation of a non-negative integer in `base`."""
+    return "".join(DIGIT_CHARACTERS[digit] for digit in to_base_digits(number, base))
+
+
+def _validate_base(base: int) -> None:
+    if not MIN_BASE <= base <= MAX_BASE:
+        raise ValueError(f"Base must be between {MIN_BASE} and {MAX_BASE}")
+
+
+@lru_cache(maxsize=None)
+def _armstrong_upper_bound(base: int) -> int:
+    """Return the smallest number too long to be an Armstrong number in `base`."""
+    return base ** max_armstrong_length(base)
+
+
+def digit_histogram(number: int, base: int = 10) -> List[int]:
+    """Return how many times each digit of `base` occurs in a non-negative integer."""
+    histogram = [0] * base
+    for digit in to_base_digits(number, base):
+        histogram[digit] += 1
+    return histogram
+
+
+@lru_cache(maxsize=HISTOGRAM_CACHE_SIZE)
+def histogram_power_sum(histogram: Tuple[int, ...], length: int) -> int:
+    """
+    Return the sum of count[d] * d^length over a digit histogram.
+    
+    Only as many powers as the base has digits are needed, however long the
+    number is, and every permutation of a number shares its histogram, so
+    re-checking one is a cache hit.
+    """
+    powers = digit_powers(length, len(histogram))
+    return sum(count * powers[digit] for digit, count in enumerate(histogram) if count)
+
+
+def _histogram_residue(histogram: Tuple[int, ...], length: int, modulus: int) -> int:
+    """Return the power sum of a digit histogram modulo `modulus`, without computing the sum itself."""
+    return sum(count * pow(digit, length, modulus) for digit, count in enumerate(histogram) if count) % modulus
+
+
+def _classify_armstrong_number(
+    number: int,
+    base: int,
+) -> Tuple[bool, str, Optional[int], Optional[Tuple[int, ...]], Optional[int]]:
+    """
+    Run the stages of `classify_armstrong_number`, keeping what they computed.
+    
+    Returns:
+        Tuple of (is_armstrong, stage, digit count, digit histogram, power sum);
+        each of the last three is None when the deciding stage never needed it
+    """
+    _validate_base(base)
+    if number < 0:
+        return False, STAGE_SIGN, None, None, None
+    if number >= _armstrong_upper_bound(base):
+        return False, STAGE_LENGTH, None, None, None
+    
+    length = count_digits(number, base)
+    if length < MODULAR_FILTER_MIN_DIGITS and length < HISTOGRAM_MIN_DIGITS:
+        if base == 10:
+            total = power_sum(number, length)
+        else:
+            powers = digit_powers(length, base)
+            total = sum(powers[digit] for digit in to_base_digits(number, base))
+        return total == number, STAGE_EXACT, length, None, total
+    
+    histogram = tuple(digit_histogram(number, base))
+    if length >= MODULAR_FILTER_MIN_DIGITS:
+        for modulus in RESIDUE_MODULI:
+            if _histogram_residue(histogram, length, modulus) != number % modulus:
+                return False, STAGE_MODULAR, length, histogram, None
+    
+    total = histogram_power_sum(histogram, length)
+    return total == number, STAGE_EXACT, length, histogram, total
+
+
+def classify_armstrong_number(number: int, base: int = 10) -> Tuple[bool, str]:
+    """
+    Check if a number is an Armstrong number through layered pre-filters.
+    
+    Stages run from cheapest to most expensive and stop at the first decisive one:
+    the sign, the length bound (no Armstrong number can exceed
+    `max_armstrong_length(base)` digits), then for long inputs the power-sum
+    residues modulo a few small numbers, and finally the exact power sum, taken
+    from the digit histogram from HISTOGRAM_MIN_DIGITS digits on.
+    
+    Args:
+        number: The number to check
+        base: The base the digits are taken in (2-36)
+        
+    Returns:
+        Tuple of (is_armstrong, stage) where stage names the deciding filter
+    """
+    is_armstrong, stage, _, _, _ = _classify_armstrong_number(number, base)
+    return is_armstrong, stage
+
+
+def is_armstrong_number(number: int, base: int = 10) -> bool:
     """
     Check if a number is an Armstrong number.
     
@@ -13,85 +407,1850 @@ def is_armstrong_number(number: int) -> bool:
     
     Args:
         number: The number to check
+        base: The base the digits are taken in (2-36)
         
     Returns:
         True if the number is an Armstrong number, False otherwise
     """
-    if number < 0:
-        return False
+    return classify_armstrong_number(number, base)[0]
+
+
+def check_many(numbers: Iterable[int], base: int = 10) -> List[bool]:
+    """
+    Check many numbers at once.
     
-    # Convert number to string to get digits
-    digits = str(number)
-    num_digits = len(digits)
+    Numbers are grouped by digit length so each group looks its power table up
+    once, and lengths that cannot hold an Armstrong number are rejected outright.
     
-    # Calculate sum of digits raised to the power of number of digits
-    sum_of_powers = sum(int(digit) ** num_digits for digit in digits)
+    Args:
+        numbers: The numbers to check
+        base: The base the digits are taken in (2-36)
+        
+    Returns:
+        One flag per input, in input order
+    """
+    _validate_base(base)
+    numbers = list(numbers)
+    results = [False] * len(numbers)
     
-    return sum_of_powers == number
+    groups: Dict[int, List[int]] = {}
+    for index, number in enumerate(numbers):
+        if number < 0:
+            continue
+        length = count_digits(number, base)
+        groups.setdefault(length, []).append(index)
+    
+    max_length = max_armstrong_length(base)
+    for length, indices in groups.items():
+        if length > max_length:
+            continue
+        if base == 10:
+            table = block_power_sums(length)
+            for index in indices:
+                number = remaining = numbers[index]
+                total = 0
+                while remaining:
+                    remaining, block = divmod(remaining, BLOCK_SIZE)
+                    total += table[block]
+                results[index] = total == number
+        else:
+            powers = digit_powers(length, base)
+            for index in indices:
+                number = numbers[index]
+                results[index] = sum(powers[digit] for digit in to_base_digits(number, base)) == number
+    
+    return results
 
 
-def find_armstrong_numbers_in_range(min_num: int, max_num: int) -> List[int]:
+def find_armstrong_numbers_in_range(
+    min_num: int,
+    max_num: int,
+    backend: str = BACKEND_AUTO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[int]:
     """
     Find all Armstrong numbers within a given range.
     
+    This is an exhaustive scan that checks every number in the range. With the
+    NumPy backend the range is processed in int64 blocks of `chunk_size`
+    numbers, so memory stays bounded however wide the range is.
+    
     Args:
         min_num: Minimum number in the range (inclusive)
         max_num: Maximum number in the range (inclusive)
+        backend: "python", "numpy", or "auto" to use NumPy when it is installed
+        chunk_size: Numbers per vectorized block when using NumPy
         
     Returns:
         List of Armstrong numbers found in the range
     """
+    if backend not in (BACKEND_AUTO, BACKEND_PYTHON, BACKEND_NUMPY):
+        raise ValueError(f"Unknown backend: {backend}")
+    if backend == BACKEND_NUMPY and np is None:
+        raise RuntimeError("The numpy backend requires NumPy to be installed")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    
     if min_num < 0:
         min_num = 0
     if max_num < min_num:
         return []
     
+    use_numpy = np is not None and backend != BACKEND_PYTHON
+    
     armstrong_numbers = []
-    for num in range(min_num, max_num + 1):
-        if is_armstrong_number(num):
-            armstrong_numbers.append(num)
+    min_length = count_digits(min_num)
+    max_length = count_digits(max_num)
+    
+    for length in range(min_length, max_length + 1):
+        low = max(min_num, 10 ** (length - 1) if length > 1 else 0)
+        high = min(max_num, 10 ** length - 1)
+        if use_numpy and length <= NUMPY_MAX_DIGITS:
+            armstrong_numbers.extend(_scan_length_numpy(length, low, high, chunk_size))
+        else:
+            armstrong_numbers.extend(_scan_length(length, low, high))
     
     return armstrong_numbers
 
 
-def check_armstrong_with_details(number: int) -> Tuple[bool, dict]:
+class ScanCancelled(Exception):
+    """Raised when a parallel range scan is cancelled before it finishes."""
+
+
+_pool_context: Optional[BaseContext] = None
+_pool_context_lock = threading.Lock()
+
+
+def _get_pool_context() -> BaseContext:
+    """The multiprocessing context scan pools start from, set up on first use."""
+    global _pool_context
+    with _pool_context_lock:
+        if _pool_context is None:
+            context = multiprocessing.get_context(POOL_START_METHOD)
+            if POOL_START_METHOD == "forkserver":
+                context.set_forkserver_preload([__name__])
+            _pool_context = context
+        return _pool_context
+
+
+def _pool_start_seconds() -> float:
+    """Estimated seconds to start a scan pool: spawned children, like a new fork server, import the app first."""
+    if POOL_START_METHOD == "forkserver" and _pool_context is not None:
+        return PLAN_SECONDS_PER_POOL_START
+    return PLAN_SECONDS_PER_POOL_SERVER_START
+
+
+def available_workers() -> int:
+    """Return how many CPU cores this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def auto_shard_size(min_num: int, max_num: int, workers: int) -> int:
     """
-    Check if a number is an Armstrong number and return calculation details.
+    Pick a shard size for a parallel scan.
+    
+    Aims for SHARDS_PER_WORKER shards per worker so a slow shard doesn't leave
+    the other cores idle at the end. The size is clamped so each shard is worth
+    the cost of sending it to a process, and small enough to poll for cancellation.
+    """
+    width = max_num - min_num + 1
+    size = width // (workers * SHARDS_PER_WORKER)
+    return max(MIN_SHARD_SIZE, min(size, MAX_SHARD_SIZE))
+
+
+def _scan_shard(low: int, high: int, backend: str) -> List[int]:
+    """Process-pool entry point; must stay at module level so it can be pickled."""
+    return find_armstrong_numbers_in_range(low, high, backend=backend)
+
+
+def iter_armstrong_numbers_parallel(
+    min_num: int,
+    max_num: int,
+    workers: Optional[int] = None,
+    shard_size: Optional[int] = None,
+    backend: str = BACKEND_AUTO,
+    should_cancel: Optional[Callable[[], bool]] = None,
+) -> Iterator[Tuple[List[int], int]]:
+    """
+    Scan a range for Armstrong numbers on a process pool, yielding shards in range order.
+    
+    The range is split into shards that are scanned with
+    `find_armstrong_numbers_in_range`. Shards can finish in any order, but each
+    is yielded only once every shard below it has been, so everything below the
+    yielded next number has been searched. Closing the generator early stops the
+    pool and drops the shards still queued.
     
     Args:
-        number: The number to check
+        min_num: Minimum number in the range (inclusive)
+        max_num: Maximum number in the range (inclusive)
+        workers: Number of worker processes (defaults to the available cores)
+        shard_size: Numbers per shard (defaults to `auto_shard_size`)
+        backend: Backend passed to each shard's scan
+        should_cancel: Polled while waiting for a shard; returning True stops the scan
+        
+    Yields:
+        (members found in the shard, the next number left to search)
+        
+    Raises:
+        ScanCancelled: If `should_cancel` returned True before the scan finished
+    """
+    min_num = max(min_num, 0)
+    if max_num < min_num:
+        return
+    
+    workers = workers or available_workers()
+    shard_size = shard_size or auto_shard_size(min_num, max_num, workers)
+    shards = list(_sized_segments(min_num, max_num, shard_size))
+    
+    executor = ProcessPoolExecutor(max_workers=min(workers, len(shards)), mp_context=_get_pool_context())
+    try:
+        pending = {
+            executor.submit(_scan_shard, low, high, backend): index
+            for index, (low, high) in enumerate(shards)
+        }
+        finished: Dict[int, List[int]] = {}
+        next_index = 0
+        while next_index < len(shards):
+            if next_index in finished:
+                yield finished.pop(next_index), shards[next_index][1] + 1
+                next_index += 1
+                continue
+            if should_cancel is not None and should_cancel():
+                raise ScanCancelled(f"Scan of {min_num}-{max_num} cancelled")
+            done, _ = wait(pending, timeout=CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                finished[pending.pop(future)] = future.result()
+    finally:
+        # On cancellation, error or an early close, drop queued shards instead of waiting for them.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def find_armstrong_numbers_in_range_parallel(
+    min_num: int,
+    max_num: int,
+    workers: Optional[int] = None,
+    shard_size: Optional[int] = None,
+    backend: str = BACKEND_AUTO,
+    should_cancel: Optional[Callable[[], bool]] = None,
+) -> List[int]:
+    """
+    Find all Armstrong numbers within a given range using every available core.
+    
+    Collects `iter_armstrong_numbers_parallel`, so the output matches the serial
+    function exactly. Ranges too narrow to be worth a pool are scanned serially.
+    
+    Args:
+        min_num: Minimum number in the range (inclusive)
+        max_num: Maximum number in the range (inclusive)
+        workers: Number of worker processes (defaults to the available cores)
+        shard_size: Numbers per shard (defaults to `auto_shard_size`)
+        backend: Backend passed to each shard's scan
+        should_cancel: Polled while waiting; returning True stops the scan
         
     Returns:
-        Tuple of (is_armstrong, details_dict)
-        details_dict contains:
-            - is_armstrong: bool
-            - number: int
-            - digits: list of digits
-            - num_digits: int
-            - calculation: str showing the calculation
-            - sum_of_powers: int
+        List of Armstrong numbers found in the range
+        
+    Raises:
+        ScanCancelled: If `should_cancel` returned True before the scan finished
     """
-    if number < 0:
-        return False, {
-            "is_armstrong": False,
-            "number": number,
-            "error": "Negative numbers cannot be Armstrong numbers"
+    workers = workers or available_workers()
+    if workers == 1 or max_num - max(min_num, 0) + 1 < MIN_PARALLEL_RANGE:
+        return find_armstrong_numbers_in_range(min_num, max_num, backend=backend)
+    
+    shards = iter_armstrong_numbers_parallel(min_num, max_num, workers, shard_size, backend, should_cancel)
+    return [number for found, _ in shards for number in found]
+
+
+class PowerSumOdometer:
+    """
+    Running digit-power sum of a number that only ever counts upwards.
+    
+    The digits are kept least significant first, and `advance()` rewrites only
+    the digits that roll over, so stepping from n to n + 1 costs O(1) amortized
+    instead of O(digits). With no fixed `exponent` the exponent follows the
+    number's own digit count, and the sum is rebuilt only when that count grows.
+    """
+    
+    def __init__(self, start: int, exponent: Optional[int] = None):
+        self.value = start
+        self._fixed_exponent = exponent
+        self._digits = list(reversed(split_digits(start)))
+        self._reset_powers()
+    
+    def _reset_powers(self) -> None:
+        self.exponent = self._fixed_exponent or len(self._digits)
+        self._powers = digit_powers(self.exponent)
+        self.power_sum = sum(self._powers[digit] for digit in self._digits)
+    
+    def advance(self) -> None:
+        """Step to the next integer."""
+        self.value += 1
+        digits, powers = self._digits, self._powers
+        for position, digit in enumerate(digits):
+            if digit < 9:
+                digits[position] = digit + 1
+                self.power_sum += powers[digit + 1] - powers[digit]
+                return
+            digits[position] = 0
+            self.power_sum -= powers[9] - powers[0]
+        
+        # Every digit rolled over: the number gained a digit.
+        digits.append(1)
+        if self._fixed_exponent:
+            self.power_sum += powers[1]
+        else:
+            self._reset_powers()
+
+
+def _scan_length(length: int, low: int, high: int) -> List[int]:
+    """Exhaustively check every number in [low, high], all of which have `length` digits."""
+    table = block_power_sums(length)
+    found = []
+    
+    # Walk the range one block at a time: the power sum of everything above the
+    # lowest block is shared by up to BLOCK_SIZE numbers, and the odometer
+    # carries it from one block to the next.
+    head_sums = PowerSumOdometer(low // BLOCK_SIZE, exponent=length)
+    for head in range(low // BLOCK_SIZE, high // BLOCK_SIZE + 1):
+        base = head * BLOCK_SIZE
+        head_sum = head_sums.power_sum
+        head_sums.advance()
+        first = max(low - base, 0)
+        last = min(high - base, BLOCK_SIZE - 1)
+        for tail in range(first, last + 1):
+            if head_sum + table[tail] == base + tail:
+                found.append(base + tail)
+    
+    return found
+
+
+def _scan_length_numpy(length: int, low: int, high: int, chunk_size: int) -> List[int]:
+    """Vectorized version of `_scan_length` over int64 blocks of `chunk_size` numbers."""
+    table = np.array(block_power_sums(length), dtype=np.int64)
+    found: List[int] = []
+    
+    for start in range(low, high + 1, chunk_size):
+        stop = min(start + chunk_size, high + 1)
+        numbers = np.arange(start, stop, dtype=np.int64)
+        remaining = numbers.copy()
+        sums = np.zeros_like(numbers)
+        for _ in range(-(-length // BLOCK_DIGITS)):
+            remaining, blocks = np.divmod(remaining, BLOCK_SIZE)
+            sums += table[blocks]
+        found.extend(int(number) for number in numbers[sums == numbers])
+    
+    return found
+
+
+def find_armstrong_numbers_by_multiset(min_num: int, max_num: int, base: int = 10) -> List[int]:
+    """
+    Find all Armstrong numbers within a given range by digit-multiset enumeration.
+    
+    Instead of walking every integer, this enumerates the non-decreasing digit
+    multisets of each digit length, computes the power sum once per multiset and
+    keeps it if its digits are a permutation of that multiset. Branches whose
+    partial sums can no longer land inside the range are pruned, so the work
+    grows with C(n + 9, 9) per length rather than with the width of the range.
+    
+    Args:
+        min_num: Minimum number in the range (inclusive)
+        max_num: Maximum number in the range (inclusive)
+        base: The base the digits are taken in (2-36)
+        
+    Returns:
+        Sorted list of Armstrong numbers found in the range
+    """
+    _validate_base(base)
+    if min_num < 0:
+        min_num = 0
+    if max_num < min_num:
+        return []
+    
+    armstrong_numbers = []
+    min_length = count_digits(min_num, base)
+    max_length = min(count_digits(max_num, base), max_armstrong_length(base))
+    
+    for length in range(min_length, max_length + 1):
+        low = max(min_num, base ** (length - 1) if length > 1 else 0)
+        high = min(max_num, base ** length - 1)
+        armstrong_numbers.extend(_search_multisets_of_length(length, low, high, base))
+    
+    return sorted(armstrong_numbers)
+
+
+def _search_multisets_of_length(
+    length: int,
+    low: int,
+    high: int,
+    base: int = 10,
+    powers: Optional[Tuple[int, ...]] = None,
+) -> List[int]:
+    """
+    Return the numbers with `length` digits in `base` that lie in [low, high] and
+    equal the sum of `powers[d]` over their digits d.
+    
+    `powers` must be non-decreasing in d and defaults to d^length, i.e. Armstrong numbers.
+    """
+    powers = powers or digit_powers(length, base)
+    counts = [0] * base
+    found: List[int] = []
+    
+    def descend(digit: int, remaining: int, partial: int) -> None:
+        if partial > high:
+            return
+        if digit == 0:
+            # Whatever slots are left can only hold zeros, which add nothing.
+            counts[0] = remaining
+            if partial >= low and _has_digit_counts(partial, counts, base):
+                found.append(partial)
+            counts[0] = 0
+            return
+        if partial + remaining * powers[digit] < low:
+            return
+        for count in range(remaining, -1, -1):
+            counts[digit] = count
+            descend(digit - 1, remaining - count, partial + count * powers[digit])
+        counts[digit] = 0
+    
+    descend(base - 1, length, 0)
+    return found
+
+
+def _has_digit_counts(number: int, counts: List[int], base: int = 10) -> bool:
+    """Check whether the digits of `number` in `base` occur exactly `counts[d]` times each."""
+    actual = [0] * base
+    if base == 10:
+        for digit in str(number):
+            actual[ord(digit) - 48] += 1
+    else:
+        for digit in to_base_digits(number, base):
+            actual[digit] += 1
+    return actual == counts
+
+
+# (length, base) pairs that `armstrong_numbers_of_length` has already searched.
+_SEARCHED_LENGTHS: set = set()
+
+
+@lru_cache(maxsize=None)
+def max_armstrong_length(base: int = 10) -> int:
+    """
+    Return the largest digit length an Armstrong number in `base` can have.
+    
+    Beyond it, n * (base - 1)^n < base^(n - 1): even all-maximal digits
+    cannot reach the smallest n-digit number.
+    """
+    _validate_base(base)
+    length = 1
+    while (length + 1) * (base - 1) ** (length + 1) >= base ** length:
+        length += 1
+    return length
+
+
+def multiset_count(length: int, base: int = 10) -> int:
+    """Return how many digit multisets of `length` digits exist in `base`, i.e. C(n + b - 1, b - 1)."""
+    return comb(length + base - 1, base - 1)
+
+
+def estimate_multiset_search_cost(min_num: int, max_num: int, base: int = 10, cached: bool = True) -> int:
+    """
+    Estimate the work of a multiset search over [min_num, max_num] in `base`.
+    
+    The estimate is the number of digit multisets across every digit length the
+    range touches. Unless `cached` is False, lengths already cached by
+    `armstrong_numbers_of_length` cost nothing.
+    """
+    _validate_base(base)
+    if max_num < max(min_num, 0):
+        return 0
+    
+    min_length = count_digits(max(min_num, 0), base)
+    max_length = min(count_digits(max_num, base), max_armstrong_length(base))
+    
+    return sum(
+        multiset_count(length, base)
+        for length in range(min_length, max_length + 1)
+        if not (cached and (length, base) in _SEARCHED_LENGTHS)
+    )
+
+
+
+@lru_cache(maxsize=None)
+def armstrong_numbers_of_length(length: int, base: int = 10) -> Tuple[int, ...]:
+    """Return every Armstrong number with exactly `length` digits in `base`, sorted."""
+    _validate_base(base)
+    if length < 1 or length > max_armstrong_length(base):
+        return ()
+    
+    low = base ** (length - 1) if length > 1 else 0
+    high = base ** length - 1
+    found = tuple(sorted(_search_multisets_of_length(length, low, high, base)))
+    _SEARCHED_LENGTHS.add((length, base))
+    return found
+
+
+@lru_cache(maxsize=None)
+def armstrong_catalogue(base: int = 10) -> Tuple[int, ...]:
+    """
+    Return every Armstrong number in `base`, sorted.
+    
+    Base 10 uses the shipped ARMSTRONG_NUMBERS. Other bases are searched on first
+    use and cached for the life of the process; large bases can be very slow to
+    build, so check `estimate_multiset_search_cost` first.
+    """
+    _validate_base(base)
+    if base == 10:
+        return ARMSTRONG_NUMBERS
+    
+    catalogue: List[int] = []
+    for length in range(1, max_armstrong_length(base) + 1):
+        catalogue.extend(armstrong_numbers_of_length(length, base))
+    return tuple(catalogue)
+
+
+def find_armstrong_numbers_of_length(length: int, engine: str = ENGINE_MULTISET) -> List[int]:
+    """
+    Find every base-10 Armstrong number with exactly `length` digits using one engine.
+    
+    Unlike `armstrong_numbers_of_length`, nothing is cached, so each call does the
+    full search; this is the entry point for proving a length and for comparing engines.
+    
+    Args:
+        length: Digit length to enumerate
+        engine: ENGINE_CATALOGUE, ENGINE_SCAN or ENGINE_MULTISET
+        
+    Returns:
+        Sorted list of the Armstrong numbers of that length
+        
+    Raises:
+        ValueError: If the engine is unknown
+    """
+    if engine not in LENGTH_ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+    if length < 1 or length > MAX_ARMSTRONG_DIGITS:
+        return []
+    
+    low = 10 ** (length - 1) if length > 1 else 0
+    high = 10 ** length - 1
+    if engine == ENGINE_CATALOGUE:
+        return find_armstrong_numbers_from_catalogue(low, high)
+    if engine == ENGINE_SCAN:
+        return find_armstrong_numbers_in_range(low, high)
+    return sorted(_search_multisets_of_length(length, low, high))
+
+
+def benchmark_length_engines(
+    length: int,
+    engines: Iterable[str] = (ENGINE_SCAN, ENGINE_MULTISET),
+) -> Dict[str, float]:
+    """
+    Time each engine enumerating the Armstrong numbers of one length.
+    
+    Every engine must agree with the shipped catalogue.
+    
+    Returns:
+        dict mapping each engine to its wall time in seconds
+        
+    Raises:
+        AssertionError: If an engine returns a different set of numbers
+    """
+    expected = find_armstrong_numbers_of_length(length, ENGINE_CATALOGUE)
+    timings: Dict[str, float] = {}
+    for engine in engines:
+        started = time.perf_counter()
+        found = find_armstrong_numbers_of_length(length, engine)
+        timings[engine] = time.perf_counter() - started
+        assert found == expected, f"{engine} disagrees with the catalogue at {length} digits"
+    return timings
+
+
+class ArmstrongCheck:
+    """
+    Compact result of a single Armstrong check.
+    
+    Only the digit histogram and the power sum are stored; the digit list, the
+    base representation and the calculation string are rendered on demand, so a
+    long input costs O(base) memory rather than several copies of its digits.
+    """
+    
+    __slots__ = (
+        "number", "base", "num_digits", "histogram", "sum_of_powers", "is_armstrong", "decided_by", "error", "family",
+        "preview", "digest",
+    )
+    
+    def __init__(
+        self,
+        number: Optional[int],
+        base: int,
+        is_armstrong: bool,
+        decided_by: str,
+        num_digits: Optional[int] = None,
+        histogram: Optional[Tuple[int, ...]] = None,
+        sum_of_powers: Optional[int] = None,
+        error: Optional[str] = None,
+        family: Optional["DigitPowerFamily"] = None,
+        preview: Optional[str] = None,
+        digest: Optional[str] = None,
+    ):
+        # None for digit strings rejected on length alone, which keep only a preview and a digest
+        self.number = number
+        self.base = base
+        self.is_armstrong = is_armstrong
+        self.decided_by = decided_by
+        self.num_digits = num_digits
+        self.histogram = histogram
+        self.sum_of_powers = sum_of_powers
+        self.error = error
+        # None means the Armstrong family
+        self.family = family
+        self.preview = preview
+        self.digest = digest
+    
+    def __repr__(self):
+        return f"<ArmstrongCheck {self.label} base {self.base}: {self.is_armstrong} ({self.decided_by})>"
+    
+    @property
+    def label(self) -> str:
+        """The number for display; inputs kept as a preview show their leading digits only."""
+        if self.number is None:
+            return f"{self.preview}…"
+        return str(self.number)
+    
+    @property
+    def digits(self) -> Optional[List[int]]:
+        """The digits of the number, most significant first, or None if they were never examined."""
+        if self.histogram is None:
+            return None
+        return to_base_digits(self.number, self.base)
+    
+    @property
+    def representation(self) -> Optional[str]:
+        """The number written in its base, or None if its digits were never examined."""
+        if self.histogram is None:
+            return None
+        return format_in_base(self.number, self.base)
+    
+    @property
+    def calculation(self) -> str:
+        """The calculation, collapsed and truncated for display."""
+        return self.render_calculation(max_length=DISPLAY_CALCULATION_LENGTH)
+    
+    def render_calculation(self, collapse: bool = True, max_length: Optional[int] = None) -> str:
+        """
+        Render the calculation string.
+        
+        Args:
+            collapse: Write repeated digits once with a multiplier, e.g. "3×7^9"
+            max_length: Truncate the terms to about this many characters, keeping the total
+            
+        Returns:
+            The calculation, e.g. "1^3 + 5^3 + 3^3 = 153"
+        """
+        if self.error:
+            return self.error
+        if self.histogram is None:
+            # A long digit string in another base only has a lower bound on its digit count.
+            num_digits = f"At least {self.num_digits:,}" if self.number is None and self.base != 10 else f"{self.num_digits:,}"
+            if self.family is not None:
+                return f"{num_digits} digits is more than the {self.family.max_length} a {self.family.label} can have"
+            return (
+                f"{num_digits} digits is more than the {max_armstrong_length(self.base)} "
+                f"an Armstrong number in base {self.base} can have"
+            )
+        
+        def exponent(digit: int, position: int) -> int:
+            if self.family is None:
+                return self.num_digits
+            return self.family.term_exponent(digit, position, self.num_digits)
+        
+        if self.sum_of_powers is None:
+            # Rejected on a residue, so the exact sum was never computed
+            modulus = next(
+                modulus for modulus in RESIDUE_MODULI
+                if _histogram_residue(self.histogram, self.num_digits, modulus) != self.number % modulus
+            )
+            total = f" ≢ {self.number} (mod {modulus})"
+        else:
+            total = f" = {self.sum_of_powers}"
+        
+        if collapse and not (self.family is not None and self.family.positional):
+            terms = (
+                f"{count}×{digit}^{exponent(digit, 0)}" if count > 1 else f"{digit}^{exponent(digit, 0)}"
+                for digit, count in enumerate(self.histogram)
+                if count
+            )
+        else:
+            terms = (
+                f"{digit}^{exponent(digit, position)}"
+                for position, digit in enumerate(to_base_digits(self.number, self.base))
+            )
+        
+        if max_length is None:
+            return " + ".join(terms) + total
+        
+        rendered, used = [], 0
+        for term in terms:
+            if used + len(term) > max_length:
+                rendered.append("…")
+                break
+            rendered.append(term)
+            used += len(term) + 3
+        return " + ".join(rendered) + total
+    
+    def to_dict(self, full: bool = False) -> dict:
+        """
+        Return a JSON-serializable summary.
+        
+        Args:
+            full: Include the digit list and the untruncated, uncollapsed calculation
+        """
+        data = {
+            "is_armstrong": self.is_armstrong,
+            "number": self.number,
+            "base": self.base,
+            "family": self.family.name if self.family is not None else FAMILY_ARMSTRONG,
+            "num_digits": self.num_digits,
+            "sum_of_powers": self.sum_of_powers,
+            "decided_by": self.decided_by,
         }
+        if self.family is not None and self.family.exponent is not None:
+            data["exponent"] = self.family.exponent
+        if self.error:
+            data["error"] = self.error
+        if self.number is None:
+            data["preview"] = self.preview
+            data["digest"] = self.digest
+        if self.histogram is not None:
+            data["histogram"] = {digit: count for digit, count in enumerate(self.histogram) if count}
+        if full:
+            data["digits"] = self.digits
+            data["calculation"] = self.render_calculation(collapse=False)
+        else:
+            data["calculation"] = self.calculation
+        return data
+
+
+def check_armstrong_with_details(number: int, base: int = 10) -> Tuple[bool, ArmstrongCheck]:
+    """
+    Check if a number is an Armstrong number and return calculation details.
+    
+    Args:
+        number: The number to check
+        base: The base the digits are taken in (2-36)
+        
+    Returns:
+        Tuple of (is_armstrong, details) where details is an `ArmstrongCheck`.
+        Inputs rejected by the sign or length bound carry no histogram or sum,
+        and inputs rejected on a residue carry no sum.
+    """
+    is_armstrong, stage, num_digits, histogram, sum_of_powers = _classify_armstrong_number(number, base)
+    if stage == STAGE_SIGN:
+        return False, ArmstrongCheck(
+            number, base, False, stage,
+            error="Negative numbers cannot be Armstrong numbers",
+        )
+    
+    if stage == STAGE_LENGTH:
+        return False, ArmstrongCheck(number, base, False, stage, num_digits=count_digits(number, base))
+    
+    # Short inputs are summed digit by digit; the histogram is only for display
+    if histogram is None:
+        histogram = tuple(digit_histogram(number, base))
+    
+    return is_armstrong, ArmstrongCheck(
+        number, base, is_armstrong, stage,
+        num_digits=num_digits,
+        histogram=histogram,
+        sum_of_powers=sum_of_powers,
+    )
+
+
+def find_armstrong_numbers_from_catalogue(min_num: int, max_num: int, base: int = 10) -> List[int]:
+    """
+    Find all Armstrong numbers within a given range using the precomputed catalogue.
+    
+    For bases other than 10 only the digit lengths the range touches are
+    searched, and each searched length is cached for later queries.
+    
+    Args:
+        min_num: Minimum number in the range (inclusive)
+        max_num: Maximum number in the range (inclusive)
+        base: The base the digits are taken in (2-36)
+        
+    Returns:
+        Sorted list of Armstrong numbers found in the range
+    """
+    _validate_base(base)
+    if max_num < min_num or max_num < 0:
+        return []
+    
+    if base == 10:
+        catalogue = ARMSTRONG_NUMBERS
+    else:
+        min_length = count_digits(max(min_num, 0), base)
+        max_length = min(count_digits(max_num, base), max_armstrong_length(base))
+        catalogue = tuple(
+            number
+            for length in range(min_length, max_length + 1)
+            for number in armstrong_numbers_of_length(length, base)
+        )
+    
+    start = bisect_left(catalogue, min_num)
+    end = bisect_right(catalogue, max_num)
+    return list(catalogue[start:end])
+
+
+def count_armstrong_numbers_in_range(min_num: int, max_num: int, base: int = 10) -> int:
+    """Return how many Armstrong numbers in `base` lie within [min_num, max_num]."""
+    if base != 10:
+        return len(find_armstrong_numbers_from_catalogue(min_num, max_num, base))
+    if max_num < min_num:
+        return 0
+    return bisect_right(ARMSTRONG_NUMBERS, max_num) - bisect_left(ARMSTRONG_NUMBERS, min_num)
+
+
+def nearest_armstrong_number(number: int, base: int = 10) -> int:
+    """
+    Return the Armstrong number in `base` closest to `number`.
+    
+    Ties are resolved in favour of the smaller Armstrong number.
+    """
+    catalogue = armstrong_catalogue(base)
+    index = bisect_left(catalogue, number)
+    if index == 0:
+        return catalogue[0]
+    if index == len(catalogue):
+        return catalogue[-1]
+    below, above = catalogue[index - 1], catalogue[index]
+    return below if number - below <= above - number else above
+
+
+def nth_armstrong_number(n: int, base: int = 10) -> int:
+    """
+    Return the n-th Armstrong number in `base`, counting from 1 (so the first one is 0).
+    
+    Raises:
+        ValueError: If n is outside 1..len(armstrong_catalogue(base))
+    """
+    catalogue = armstrong_catalogue(base)
+    if not 1 <= n <= len(catalogue):
+        raise ValueError(f"n must be between 1 and {len(catalogue)}")
+    return catalogue[n - 1]
+
+
+class DigitPowerFamily(ABC):
+    """
+    A family of numbers equal to a sum of powers of their own digits.
+    
+    Families subclass `MultisetFamily` when a digit's power does not depend on
+    its position, so they are searched with the digit-multiset engine, or
+    `PositionalFamily` when it does, so they are searched digit by digit.
+    """
+    
+    name = ""
+    label = ""
+    positional = False
+    # The engine `search_length` runs, as named in query plans
+    search_engine = ""
+    
+    def __init__(self, exponent: Optional[int] = None):
+        self.exponent = exponent
+    
+    def __repr__(self):
+        return f"<DigitPowerFamily {self.name}{'' if self.exponent is None else f' k={self.exponent}'}>"
+    
+    @abstractmethod
+    def term_exponent(self, digit: int, position: int, length: int) -> int:
+        """Return the exponent applied to `digit` at 0-based `position` of a `length`-digit number."""
+    
+    @abstractmethod
+    def _max_power_sum(self, length: int) -> int:
+        """Return the largest digit-power sum of a `length`-digit number."""
+    
+    @abstractmethod
+    def power_sum(self, number: int) -> int:
+        """Return the family's digit-power sum of a non-negative integer."""
+    
+    @abstractmethod
+    def search_length(self, length: int, low: Optional[int] = None, high: Optional[int] = None) -> List[int]:
+        """Search the `length`-digit members of this family, within [low, high] if given, without a brute-force loop."""
+    
+    @abstractmethod
+    def length_search_cost(self, length: int) -> int:
+        """Estimate the work of `search_length(length)`, in digit multisets visited or the equivalent."""
+    
+    def search_cost(self) -> int:
+        """Estimate the work of building the catalogue by search."""
+        return sum(self.length_search_cost(length) for length in range(1, self.max_length + 1))
+    
+    @cached_property
+    def max_length(self) -> int:
+        """The largest digit length a member of this family can have."""
+        length = 1
+        while self._max_power_sum(length + 1) >= 10 ** length:
+            length += 1
+        return length
+    
+    def contains(self, number: int) -> bool:
+        """Check if a number belongs to this family."""
+        if number < 0 or number >= 10 ** self.max_length:
+            return False
+        return self.power_sum(number) == number
+    
+    def catalogue(self) -> Tuple[int, ...]:
+        """Return every member of this family, sorted."""
+        return _family_catalogue(self.name, self.exponent)
+
+
+class MultisetFamily(DigitPowerFamily):
+    """A digit-power family whose power of a digit does not depend on its position."""
+    
+    search_engine = ENGINE_MULTISET
+    
+    @abstractmethod
+    def powers(self, length: int) -> Tuple[int, ...]:
+        """Return the power of each decimal digit within a `length`-digit number."""
+    
+    def _max_power_sum(self, length):
+        return length * max(self.powers(length))
+    
+    def power_sum(self, number):
+        digits = split_digits(number)
+        powers = self.powers(len(digits))
+        return sum(powers[digit] for digit in digits)
+    
+    def search_length(self, length, low=None, high=None):
+        low, high = _length_bounds(length, low, high)
+        return sorted(_search_multisets_of_length(length, low, high, powers=self.powers(length)))
+    
+    def length_search_cost(self, length):
+        return multiset_count(length)
+
+
+class PositionalFamily(DigitPowerFamily):
+    """A digit-power family whose power of a digit depends on its position."""
+    
+    positional = True
+    search_engine = ENGINE_POSITIONAL
+    
+    @abstractmethod
+    def position_powers(self, length: int) -> Tuple[Tuple[int, ...], ...]:
+        """Return, for each position from the left, the power of each decimal digit."""
+    
+    def _max_power_sum(self, length):
+        return sum(max(powers) for powers in self.position_powers(length))
+    
+    def power_sum(self, number):
+        digits = split_digits(number)
+        tables = self.position_powers(len(digits))
+        return sum(tables[position][digit] for position, digit in enumerate(digits))
+    
+    def search_length(self, length, low=None, high=None):
+        return sorted(_search_positions_of_length(length, self.position_powers(length), *_length_bounds(length, low, high)))
+    
+    def length_search_cost(self, length):
+        return _positional_search_cost(self.position_powers(length))
+
+
+class ArmstrongFamily(MultisetFamily):
+    """Armstrong (narcissistic) numbers: each digit raised to the number of digits."""
+    
+    name = FAMILY_ARMSTRONG
+    label = "Armstrong number"
+    
+    def powers(self, length):
+        return digit_powers(length)
+    
+    def term_exponent(self, digit, position, length):
+        return length
+
+
+class PerfectDigitalInvariantFamily(MultisetFamily):
+    """Perfect digital invariants: each digit raised to a fixed exponent."""
+    
+    name = FAMILY_PDI
+    label = "perfect digital invariant"
+    
+    def __init__(self, exponent: Optional[int] = None):
+        if exponent is None or exponent < 1:
+            raise ValueError("Perfect digital invariants need an exponent of at least 1")
+        super().__init__(exponent)
+    
+    def powers(self, length):
+        return digit_powers(self.exponent)
+    
+    def term_exponent(self, digit, position, length):
+        return self.exponent
+
+
+class MunchhausenFamily(MultisetFamily):
+    """Münchhausen numbers: each digit raised to itself, taking 0^0 = 0."""
+    
+    name = FAMILY_MUNCHHAUSEN
+    label = "Münchhausen number"
+    
+    def powers(self, length):
+        return _MUNCHHAUSEN_POWERS
+    
+    def term_exponent(self, digit, position, length):
+        return digit
+
+
+class DisariumFamily(PositionalFamily):
+    """Disarium numbers: each digit raised to its 1-based position from the left."""
+    
+    name = FAMILY_DISARIUM
+    label = "Disarium number"
+    
+    def position_powers(self, length):
+        return _disarium_position_powers(length)
+    
+    def term_exponent(self, digit, position, length):
+        return position + 1
+
+
+_MUNCHHAUSEN_POWERS = (0,) + tuple(digit ** digit for digit in range(1, 10))
+
+
+@lru_cache(maxsize=None)
+def _disarium_position_powers(length: int) -> Tuple[Tuple[int, ...], ...]:
+    return tuple(digit_powers(position) for position in range(1, length + 1))
+
+FAMILIES = {
+    family.name: family
+    for family in (ArmstrongFamily, PerfectDigitalInvariantFamily, MunchhausenFamily, DisariumFamily)
+}
+
+# Families whose members are known in full and shipped with the module.
+_SHIPPED_CATALOGUES = {
+    FAMILY_ARMSTRONG: ARMSTRONG_NUMBERS,
+    FAMILY_MUNCHHAUSEN: MUNCHHAUSEN_NUMBERS,
+    FAMILY_DISARIUM: DISARIUM_NUMBERS,
+}
+
+
+@lru_cache(maxsize=None)
+def get_family(name: str = FAMILY_ARMSTRONG, exponent: Optional[int] = None) -> DigitPowerFamily:
+    """
+    Return the digit-power family called `name`.
+    
+    Raises:
+        ValueError: If the family is unknown, or a perfect digital invariant has no valid exponent
+    """
+    if name not in FAMILIES:
+        raise ValueError(f"Unknown family: {name}")
+    if name != FAMILY_PDI:
+        exponent = None
+    return FAMILIES[name](exponent)
+
+
+@lru_cache(maxsize=None)
+def _family_catalogue(name: str, exponent: Optional[int]) -> Tuple[int, ...]:
+    if name in _SHIPPED_CATALOGUES:
+        return _SHIPPED_CATALOGUES[name]
+    
+    family = get_family(name, exponent)
+    catalogue: List[int] = []
+    for length in range(1, family.max_length + 1):
+        catalogue.extend(family.search_length(length))
+    _SEARCHED_FAMILIES.add((name, exponent))
+    return tuple(catalogue)
+
+
+# (name, exponent) pairs whose catalogues `_family_catalogue` has already searched.
+_SEARCHED_FAMILIES: set = set()
+
+
+def _catalogue_is_ready(family: DigitPowerFamily) -> bool:
+    return family.name in _SHIPPED_CATALOGUES or (family.name, family.exponent) in _SEARCHED_FAMILIES
+
+
+def _length_bounds(length: int, low: Optional[int] = None, high: Optional[int] = None) -> Tuple[int, int]:
+    """Clamp [low, high] to the decimal numbers of `length` digits; None leaves that end at the length's own bound."""
+    first = 10 ** (length - 1) if length > 1 else 0
+    last = 10 ** length - 1
+    return (first if low is None else max(low, first)), (last if high is None else min(high, last))
+
+
+def _positional_remaining_max(position_powers: Tuple[Tuple[int, ...], ...]) -> List[int]:
+    """remaining_max[k]: the most the leftmost k positions can add."""
+    remaining_max = [0]
+    for powers in position_powers:
+        remaining_max.append(remaining_max[-1] + max(powers))
+    return remaining_max
+
+
+@lru_cache(maxsize=None)
+def _positional_search_cost(position_powers: Tuple[Tuple[int, ...], ...]) -> int:
+    """
+    Estimate the work of `_search_positions_of_length`, in digit multisets visited or the equivalent.
+    
+    The search fixes suffixes until the open positions can add less than four
+    multiples of the suffix's modulus, then checks the candidates ending in
+    each suffix. Timed against the search, a suffix costs about a third of a
+    multiset visit and a candidate check about one.
+    """
+    remaining_max = _positional_remaining_max(position_powers)
+    open_positions, suffixes = len(position_powers), 1
+    while open_positions > 0 and remaining_max[open_positions] >= 4 * suffixes:
+        open_positions -= 1
+        suffixes *= 10
+    candidates = remaining_max[open_positions]
+    return suffixes // 3 + candidates
+
+
+def _search_positions_of_length(
+    length: int,
+    position_powers: Tuple[Tuple[int, ...], ...],
+    low: int,
+    high: int,
+) -> List[int]:
+    """
+    Return the `length`-digit numbers in [low, high] equal to the sum of position_powers[i][digit i].
+    
+    Digits are fixed from the right, where the powers are largest. Once the
+    positions still open can add less than a few multiples of the fixed suffix's
+    modulus, the few candidates that end in that suffix are checked directly.
+    """
+    remaining_max = _positional_remaining_max(position_powers)
+    
+    found: List[int] = []
+    
+    def candidates_check(open_positions: int, suffix: int, modulus: int, partial: int) -> None:
+        start = max(partial, low)
+        stop = min(partial + remaining_max[open_positions], high)
+        candidate = start + (suffix - start) % modulus
+        while candidate <= stop:
+            digits = split_digits(candidate)
+            if sum(position_powers[i][digit] for i, digit in enumerate(digits)) == candidate:
+                found.append(candidate)
+            candidate += modulus
+    
+    def descend(open_positions: int, suffix: int, modulus: int, partial: int) -> None:
+        if partial > high or partial + remaining_max[open_positions] < low:
+            return
+        if open_positions == 0 or remaining_max[open_positions] < 4 * modulus:
+            candidates_check(open_positions, suffix, modulus, partial)
+            return
+        powers = position_powers[open_positions - 1]
+        for digit in range(10):
+            descend(open_positions - 1, suffix + digit * modulus, modulus * 10, partial + powers[digit])
+    
+    descend(length, 0, 1, 0)
+    return found
+
+
+def find_family_numbers_in_range(min_num: int, max_num: int, family: DigitPowerFamily) -> List[int]:
+    """
+    Find all members of a digit-power family within a given range, from its catalogue.
+    
+    Args:
+        min_num: Minimum number in the range (inclusive)
+        max_num: Maximum number in the range (inclusive)
+        family: The family, from `get_family`
+        
+    Returns:
+        Sorted list of family members found in the range
+    """
+    if max_num < min_num:
+        return []
+    catalogue = family.catalogue()
+    return list(catalogue[bisect_left(catalogue, min_num):bisect_right(catalogue, max_num)])
+
+
+def find_family_numbers_by_search(min_num: int, max_num: int, family: DigitPowerFamily) -> List[int]:
+    """
+    Find all members of a digit-power family within a given range by searching each digit length it touches.
+    
+    Unlike `find_family_numbers_in_range`, this neither needs nor builds the
+    catalogue: only the lengths in the range are searched, on the family's
+    multiset or positional engine.
+    
+    Args:
+        min_num: Minimum number in the range (inclusive)
+        max_num: Maximum number in the range (inclusive)
+        family: The family, from `get_family`
+        
+    Returns:
+        Sorted list of family members found in the range
+    """
+    low = max(min_num, 0)
+    if max_num < low:
+        return []
+    found: List[int] = []
+    for length in range(count_digits(low), min(count_digits(max_num), family.max_length) + 1):
+        found.extend(family.search_length(length, low, max_num))
+    return found
+
+
+def _family_scan_seconds(low: int, high: int) -> float:
+    """Estimate checking every number in [low, high] with `DigitPowerFamily.contains`, which slows with the digit count."""
+    seconds = 0.0
+    if high < low:
+        return seconds
+    for length in range(count_digits(low), count_digits(high) + 1):
+        first, last = _length_bounds(length, low, high)
+        seconds += (last - first + 1) * (PLAN_SECONDS_PER_FAMILY_CHECK + length * PLAN_SECONDS_PER_FAMILY_CHECK_DIGIT)
+    return seconds
+
+
+def shipped_catalogue_range(
+    min_num: int,
+    max_num: int,
+    base: int = 10,
+    family: Optional[DigitPowerFamily] = None,
+) -> Optional[List[int]]:
+    """
+    Find the members of a family in a range, if a catalogue shipped with this module covers it.
+    
+    Results this returns can be recomputed cheaply in any process, so callers
+    may store just the range. Searched catalogues (other bases, perfect digital
+    invariants) can be slow to rebuild and return None.
+    """
+    name = family.name if family is not None else FAMILY_ARMSTRONG
+    if base != 10 or name not in _SHIPPED_CATALOGUES:
+        return None
+    if _is_armstrong_family(family):
+        return find_armstrong_numbers_from_catalogue(min_num, max_num)
+    return find_family_numbers_in_range(min_num, max_num, family)
+
+
+def check_family_with_details(number: int, family: DigitPowerFamily) -> Tuple[bool, ArmstrongCheck]:
+    """
+    Check if a number belongs to a digit-power family and return calculation details.
+    
+    Armstrong checks go through `check_armstrong_with_details` and its pre-filters.
+    
+    Args:
+        number: The number to check
+        family: The family, from `get_family`
+        
+    Returns:
+        Tuple of (is_member, details) where details is an `ArmstrongCheck`
+    """
+    if family.name == FAMILY_ARMSTRONG:
+        return check_armstrong_with_details(number)
+    if number < 0:
+        return False, ArmstrongCheck(
+            number, 10, False, STAGE_SIGN,
+            error=f"Negative numbers cannot be a {family.label}",
+            family=family,
+        )
+    
+    num_digits = count_digits(number)
+    if num_digits > family.max_length:
+        return False, ArmstrongCheck(number, 10, False, STAGE_LENGTH, num_digits=num_digits, family=family)
+    
+    sum_of_powers = family.power_sum(number)
+    is_member = sum_of_powers == number
+    return is_member, ArmstrongCheck(
+        number, 10, is_member, STAGE_EXACT,
+        num_digits=num_digits,
+        histogram=tuple(digit_histogram(number)),
+        sum_of_powers=sum_of_powers,
+        family=family,
+    )
+
+
+def parse_digit_string(text: str) -> str:
+    """
+    Validate a non-negative decimal integer given as text and strip its leading zeros.
+    
+    Raises:
+        ValueError: If the text is not made of ASCII digits only
+    """
+    digits = text.strip()
+    if not digits.isascii() or not digits.isdigit():
+        raise ValueError("Not a non-negative decimal integer")
+    return digits.lstrip("0") or "0"
+
+
+@lru_cache(maxsize=None)
+def _decimal_length_limit(base: int) -> int:
+    """Return the most decimal digits an Armstrong number in `base` can have."""
+    return len(str(_armstrong_upper_bound(base) - 1))
+
+
+def check_digit_string(
+    digits: str,
+    base: int = 10,
+    family: Optional["DigitPowerFamily"] = None,
+) -> Tuple[bool, ArmstrongCheck]:
+    """
+    Check a decimal digit string, as returned by `parse_digit_string`, and return calculation details.
+    
+    The length bound is applied to the string itself, so inputs past Python's
+    int-string conversion limit (or merely slow to convert) are rejected without
+    ever becoming an int; such results keep a short preview and a SHA-256 digest
+    of the digits instead of the number. Anything short enough to be a member
+    is converted and checked as usual.
+    
+    Args:
+        digits: Decimal digits without leading zeros
+        base: The base the digits are taken in (2-36); other families are base 10 only
+        family: The family, from `get_family`; None means Armstrong numbers
+        
+    Returns:
+        Tuple of (is_member, details) where details is an `ArmstrongCheck`
+    """
+    _validate_base(base)
+    armstrong = family is None or family.name == FAMILY_ARMSTRONG
+    limit = _decimal_length_limit(base) if armstrong else family.max_length
+    
+    if len(digits) <= limit:
+        number = int(digits)
+        if armstrong:
+            return check_armstrong_with_details(number, base)
+        return check_family_with_details(number, family)
+    
+    # At least 10^(len - 1), so at least this many digits in `base`.
+    num_digits = len(digits) if base == 10 else int((len(digits) - 1) * log(10) / log(base)) + 1
+    return False, ArmstrongCheck(
+        None, base, False, STAGE_LENGTH,
+        num_digits=num_digits,
+        family=None if armstrong else family,
+        preview=digits[:DIGIT_PREVIEW_LENGTH],
+        digest=hashlib.sha256(digits.encode("ascii")).hexdigest(),
+    )
+
+
+class TrajectoryGraph:
+    """
+    Memoized graph of the digit-power-sum map n -> sum of d^k over the digits of n.
+    
+    Repeating the map always ends in a fixed point or a cycle. Every node a walk
+    visits is remembered in a bounded LRU with its distance to the cycle and the
+    cycle it falls into (its basin), so later walks stop at the first known node.
+    With no exponent, k is the digit count of each number (the Armstrong map).
+    """
+    
+    def __init__(self, exponent: Optional[int] = None, max_nodes: int = TRAJECTORY_CACHE_SIZE):
+        self.exponent = exponent
+        self.max_nodes = max_nodes
+        # node -> (steps to reach its cycle, smallest member of that cycle)
+        self._nodes: "OrderedDict[int, Tuple[int, int]]" = OrderedDict()
+        # smallest member -> the cycle, starting from that member
+        self._cycles: Dict[int, Tuple[int, ...]] = {}
+        self._lock = threading.Lock()
+    
+    def step(self, number: int) -> int:
+        """Apply the map once."""
+        return power_sum(number, self.exponent or count_digits(number))
+    
+    def locate(self, number: int) -> Tuple[int, Tuple[int, ...]]:
+        """
+        Return how many steps `number` takes to reach its cycle, and that cycle.
+        
+        Raises:
+            ValueError: If no cycle closes within MAX_TRAJECTORY_STEPS steps
+        """
+        with self._lock:
+            path: List[int] = []
+            seen: Dict[int, int] = {}
+            node = number
+            while node not in self._nodes and node not in seen:
+                if len(path) >= MAX_TRAJECTORY_STEPS:
+                    raise ValueError(f"No cycle found within {MAX_TRAJECTORY_STEPS} steps")
+                seen[node] = len(path)
+                path.append(node)
+                node = self.step(node)
+            
+            if node in self._nodes:
+                # Reached a remembered node: everything on the path drains into its basin.
+                # Cycle members evicted from the LRU are recognised again by membership.
+                self._nodes.move_to_end(node)
+                steps, key = self._nodes[node]
+                members = self._cycles[key]
+                for visited in reversed(path):
+                    steps = 0 if visited in members else steps + 1
+                    self._remember(visited, steps, key)
+                # The loop ends on `number` itself, the first node of the path
+            else:
+                # Closed a new cycle at `node`.
+                start = seen[node]
+                cycle = path[start:]
+                key = min(cycle)
+                pivot = cycle.index(key)
+                self._cycles[key] = tuple(cycle[pivot:] + cycle[:pivot])
+                for member in cycle:
+                    self._remember(member, 0, key)
+                for offset, visited in enumerate(reversed(path[:start]), start=1):
+                    self._remember(visited, offset, key)
+                # `number` is path[0], `start` steps before the cycle
+                steps = start
+            
+            # Not read back from the memo: a walk longer than `max_nodes` has already evicted `number`
+            return steps, self._cycles[key]
+    
+    def _remember(self, node: int, steps: int, key: int) -> None:
+        self._nodes[node] = (steps, key)
+        self._nodes.move_to_end(node)
+        if len(self._nodes) > self.max_nodes:
+            self._nodes.popitem(last=False)
+    
+    def trajectory(self, number: int) -> dict:
+        """
+        Return the full trajectory of `number` with its cycle and basin.
+        
+        Returns:
+            dict with the path up to (and including) the first cycle member,
+            steps to the cycle, the cycle, its length and the basin (smallest cycle member)
+        """
+        steps, cycle = self.locate(number)
+        path = [number]
+        for _ in range(steps):
+            path.append(self.step(path[-1]))
+        return {
+            "number": number,
+            "exponent": self.exponent,
+            "path": path,
+            "steps": steps,
+            "cycle": list(cycle),
+            "cycle_length": len(cycle),
+            "basin": cycle[0],
+        }
+    
+    def summarize_range(self, min_num: int, max_num: int) -> dict:
+        """
+        Summarize the trajectories of every number in a range, sharing one memo.
+        
+        Returns:
+            dict mapping each basin (smallest cycle member) to its cycle, the
+            count of numbers draining into it and the longest walk seen
+        """
+        basins: Dict[int, dict] = {}
+        for number in range(max(min_num, 0), max_num + 1):
+            steps, cycle = self.locate(number)
+            basin = basins.setdefault(cycle[0], {"cycle": list(cycle), "count": 0, "max_steps": 0})
+            basin["count"] += 1
+            basin["max_steps"] = max(basin["max_steps"], steps)
+        return basins
+
+
+@lru_cache(maxsize=32)
+def get_trajectory_graph(exponent: Optional[int] = None) -> TrajectoryGraph:
+    """Return the process-wide trajectory graph for `exponent` (None for the Armstrong map)."""
+    return TrajectoryGraph(exponent)
+
+
+class QueryPlan:
+    """
+    The engine chosen for a query, with every candidate's estimated cost.
+    
+    Estimates and the measured `elapsed` time are in seconds, so logged plans
+    show directly how far the cost model is off.
+    """
+    
+    __slots__ = ("kind", "engine", "backend", "estimate", "candidates", "elapsed")
+    
+    def __init__(self, kind: str, candidates: Dict[Tuple[str, Optional[str]], float]):
+        self.kind = kind
+        self.candidates = candidates
+        (self.engine, self.backend), self.estimate = min(candidates.items(), key=lambda item: item[1])
+        self.elapsed: Optional[float] = None
+    
+    def __repr__(self):
+        return f"<QueryPlan {self.kind}: {self.engine} ~{self.estimate:.4g}s>"
+    
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable summary."""
+        return {
+            "kind": self.kind,
+            "engine": self.engine,
+            "backend": self.backend,
+            "estimate": self.estimate,
+            "elapsed": self.elapsed,
+            "candidates": {
+                f"{engine}/{backend}" if backend else engine: cost
+                for (engine, backend), cost in self.candidates.items()
+            },
+        }
+    
+    def log(self) -> None:
+        """Log the decision, its estimate and, once run, the actual runtime."""
+        logger.info(
+            "%s query ran on %s%s: estimated %.4gs, took %.4gs",
+            self.kind, self.engine, f"/{self.backend}" if self.backend else "",
+            self.estimate, self.elapsed if self.elapsed is not None else float("nan"),
+            extra={"event_type": "armstrong_query_plan", "data": self.to_dict()},
+        )
+
+
+def _is_armstrong_family(family: Optional[DigitPowerFamily]) -> bool:
+    return family is None or family.name == FAMILY_ARMSTRONG
+
+
+def plan_range_query(
+    min_num: int,
+    max_num: int,
+    base: int = 10,
+    family: Optional[DigitPowerFamily] = None,
+    verify: bool = False,
+) -> QueryPlan:
+    """
+    Pick the cheapest engine for finding the members of a family in a range.
+    
+    Candidates are the catalogue (free once shipped or cached, otherwise the cost
+    of building it), a search of the lengths the range touches (multiset, or
+    positional for Disarium numbers), and a scan of the range itself. Armstrong
+    scans are vectorized when NumPy is available and split across a process pool
+    when the range is wide enough and more than one core is free. With `verify`,
+    the catalogue is left out so the answer is computed afresh.
+    
+    Args:
+        min_num: Minimum number in the range (inclusive)
+        max_num: Maximum number in the range (inclusive)
+        base: The base the digits are taken in (2-36); other families are base 10 only
+        family: The family, from `get_family`; None means Armstrong numbers
+        verify: Compute the answer instead of reading it from a catalogue
+        
+    Returns:
+        A `QueryPlan`; run it with `run_range_query`
+    """
+    _validate_base(base)
+    low = max(min_num, 0)
+    candidates: Dict[Tuple[str, Optional[str]], float] = {}
+    
+    if _is_armstrong_family(family):
+        # Nothing at or above the upper bound needs scanning.
+        width = max(min(max_num, _armstrong_upper_bound(base) - 1) - low + 1, 0)
+        if not verify:
+            build = 0 if base == 10 else estimate_multiset_search_cost(low, max_num, base)
+            candidates[(ENGINE_CATALOGUE, None)] = PLAN_SECONDS_PER_LOOKUP + build * PLAN_SECONDS_PER_MULTISET
+        candidates[(ENGINE_MULTISET, None)] = (
+            estimate_multiset_search_cost(low, max_num, base, cached=False) * PLAN_SECONDS_PER_MULTISET
+        )
+        if base == 10:
+            per_number = PLAN_SECONDS_PER_SCANNED_NUMBER
+            if np is not None and count_digits(low + width) <= NUMPY_MAX_DIGITS:
+                per_number = PLAN_SECONDS_PER_NUMPY_NUMBER
+                candidates[(ENGINE_SCAN, BACKEND_NUMPY)] = width * PLAN_SECONDS_PER_NUMPY_NUMBER
+            candidates[(ENGINE_SCAN, BACKEND_PYTHON)] = width * PLAN_SECONDS_PER_SCANNED_NUMBER
+            workers = available_workers()
+            if workers > 1 and width >= MIN_PARALLEL_RANGE:
+                candidates[(ENGINE_SCAN, BACKEND_PARALLEL)] = _pool_start_seconds() + width * per_number / workers
+    else:
+        high = min(max_num, 10 ** family.max_length - 1)
+        if not verify:
+            build = 0 if _catalogue_is_ready(family) else family.search_cost()
+            candidates[(ENGINE_CATALOGUE, None)] = PLAN_SECONDS_PER_LOOKUP + build * PLAN_SECONDS_PER_MULTISET
+        search = 0 if high < low else sum(
+            family.length_search_cost(length) for length in range(count_digits(low), count_digits(high) + 1)
+        )
+        candidates[(family.search_engine, None)] = search * PLAN_SECONDS_PER_MULTISET
+        candidates[(ENGINE_SCAN, BACKEND_PYTHON)] = _family_scan_seconds(low, high)
+    
+    return QueryPlan("range", candidates)
+
+
+class RangeQueryResult:
+    """
+    Members found by a range query, which may have stopped at its deadline.
+    
+    Everything below `next_num` has been searched. A partial result carries a
+    `continuation()` token that `parse_range_continuation` turns back into the
+    arguments for the unsearched remainder.
+    """
+    
+    __slots__ = ("numbers", "plan", "min_num", "max_num", "next_num", "base", "family", "verify")
+    
+    def __init__(
+        self,
+        numbers: List[int],
+        plan: QueryPlan,
+        min_num: int,
+        max_num: int,
+        next_num: int,
+        base: int,
+        family: Optional[DigitPowerFamily],
+        verify: bool,
+    ):
+        self.numbers = numbers
+        self.plan = plan
+        self.min_num = min_num
+        self.max_num = max_num
+        self.next_num = next_num
+        self.base = base
+        self.family = family
+        self.verify = verify
+    
+    def __repr__(self):
+        return f"<RangeQueryResult {self.min_num}-{self.searched_to}/{self.max_num}: {len(self.numbers)} found>"
+    
+    @property
+    def complete(self) -> bool:
+        """True once the whole range has been searched."""
+        return self.next_num > self.max_num
+    
+    @property
+    def searched_to(self) -> int:
+        """The last number searched."""
+        return min(self.next_num, self.max_num + 1) - 1
+    
+    def continuation(self) -> Optional[str]:
+        """Return a compact token for the unsearched remainder, or None if complete."""
+        if self.complete:
+            return None
+        return _continuation_token(self.next_num, self.max_num, self.base, self.family, self.verify)
+
+
+def _continuation_token(next_num: int, max_num: int, base: int, family: Optional[DigitPowerFamily], verify: bool) -> str:
+    name = FAMILY_ARMSTRONG if _is_armstrong_family(family) else family.name
+    exponent = "" if family is None or family.exponent is None else family.exponent
+    return f"{name}.{exponent}.{base}.{int(verify)}.{next_num:x}.{max_num:x}"
+
+
+def parse_range_continuation(token: str) -> Tuple[int, int, int, DigitPowerFamily, bool]:
+    """
+    Turn a `RangeQueryResult.continuation()` token back into query arguments.
+    
+    Returns:
+        Tuple of (min_num, max_num, base, family, verify) for `run_range_query`
+        
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        name, exponent, base, verify, next_num, max_num = token.split(".")
+        family = get_family(name, int(exponent) if exponent else None)
+        base = int(base)
+        _validate_base(base)
+        if not _is_armstrong_family(family) and base != 10:
+            raise ValueError(f"{family.label} searches are base 10 only")
+        return int(next_num, 16), int(max_num, 16), base, family, verify == "1"
+    except (ValueError, AttributeError) as e:
+        raise ValueError(f"Invalid range continuation: {token!r}") from e
+
+
+def _sized_segments(low: int, high: int, size: int) -> Iterator[Tuple[int, int]]:
+    while low <= high:
+        yield low, min(low + size - 1, high)
+        low += size
+
+
+def _length_segments(low: int, high: int, base: int) -> Iterator[Tuple[int, int]]:
+    """Split [low, high] into slices that each stay within one digit length."""
+    for length in range(count_digits(low, base), min(count_digits(high, base), max_armstrong_length(base)) + 1):
+        start = max(low, base ** (length - 1) if length > 1 else 0)
+        stop = min(high, base ** length - 1)
+        size = -(-(stop - start + 1) // MULTISET_SEGMENTS_PER_LENGTH)
+        yield from _sized_segments(start, stop, size)
+
+
+def iter_range_query(
+    min_num: int,
+    max_num: int,
+    base: int = 10,
+    family: Optional[DigitPowerFamily] = None,
+    plan: Optional[QueryPlan] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+) -> Iterator[Tuple[List[int], int]]:
+    """
+    Search a range segment by segment on the planned engine, yielding as it goes.
+    
+    This is the one resumable range iterator: the web pages, the API and the
+    job runner all go through it. Nothing is searched until the next item is
+    requested, so callers can stop between segments and later resume from the
+    yielded next number, which is what `RangeQueryResult.continuation()`
+    records. The parallel scan keeps its pool busy ahead of the caller and is
+    stopped by closing the iterator. The last item has `max_num + 1` as its
+    next number, unless `should_cancel` stopped the search first.
+    
+    Args:
+        min_num: Minimum number in the range (inclusive)
+        max_num: Maximum number in the range (inclusive)
+        base: The base the digits are taken in (2-36); other families are base 10 only
+        family: The family, from `get_family`; None means Armstrong numbers
+        plan: A plan from `plan_range_query` for the same range, made here if not given
+        should_cancel: Polled by the parallel scan while it waits on its pool; returning True ends the search early
+        
+    Yields:
+        (members found in the segment, the next number left to search)
+    """
+    plan = plan or plan_range_query(min_num, max_num, base, family)
+    low = max(min_num, 0)
+    
+    if _is_armstrong_family(family) and plan.backend == BACKEND_PARALLEL:
+        high = min(max_num, _armstrong_upper_bound(base) - 1)
+        chunks = iter_armstrong_numbers_parallel(low, high, should_cancel=should_cancel)
+    else:
+        if _is_armstrong_family(family):
+            if plan.engine == ENGINE_CATALOGUE:
+                segments, search = [(low, max_num)], lambda start, stop: find_armstrong_numbers_from_catalogue(start, stop, base)
+            elif plan.engine == ENGINE_MULTISET:
+                segments = _length_segments(low, max_num, base)
+                search = lambda start, stop: find_armstrong_numbers_by_multiset(start, stop, base)
+            else:
+                segments = _sized_segments(low, min(max_num, _armstrong_upper_bound(base) - 1), SCAN_SEGMENT_SIZE)
+                search = lambda start, stop: find_armstrong_numbers_in_range(start, stop, backend=plan.backend)
+        elif plan.engine == ENGINE_CATALOGUE:
+            segments, search = [(low, max_num)], lambda start, stop: find_family_numbers_in_range(start, stop, family)
+        elif plan.engine == family.search_engine:
+            # One segment per length: a positional search costs about as much for a slice of a length as for all of it
+            segments = (
+                _length_bounds(length, low, max_num)
+                for length in range(count_digits(low), min(count_digits(max_num), family.max_length) + 1)
+            )
+            search = lambda start, stop: find_family_numbers_by_search(start, stop, family)
+        else:
+            segments = _sized_segments(low, min(max_num, 10 ** family.max_length - 1), FAMILY_SCAN_SEGMENT_SIZE)
+            search = lambda start, stop: [number for number in range(start, stop + 1) if family.contains(number)]
+        chunks = ((search(start, stop), stop + 1) for start, stop in segments)
+    
+    next_num = low
+    with closing(chunks):
+        try:
+            for found, next_num in chunks:
+                yield found, next_num
+        except ScanCancelled:
+            # Everything below `next_num` has been searched; the caller continues from there
+            return
+    
+    # Past the last segment nothing is left: lengths beyond the bound hold no members.
+    if next_num <= max_num:
+        yield [], max_num + 1
+
+
+def run_range_query(
+    min_num: int,
+    max_num: int,
+    base: int = 10,
+    family: Optional[DigitPowerFamily] = None,
+    verify: bool = False,
+    plan: Optional[QueryPlan] = None,
+    deadline: Optional[float] = None,
+) -> RangeQueryResult:
+    """
+    Find the members of a family in a range on the engine the planner picks.
+    
+    The engine works through the range in ascending segments and checks the
+    deadline between them (the parallel scan also while it waits on its pool),
+    so a slow query stops soon after it and returns what it has found, with a
+    continuation for the rest. At least one segment always runs, so every
+    continuation makes progress.
+    
+    Args:
+        min_num: Minimum number in the range (inclusive)
+        max_num: Maximum number in the range (inclusive)
+        base: The base the digits are taken in (2-36); other families are base 10 only
+        family: The family, from `get_family`; None means Armstrong numbers
+        verify: Compute the answer instead of reading it from a catalogue
+        plan: A plan from `plan_range_query` for the same arguments, if already made
+        deadline: A `time.monotonic()` value to stop at, or None to run to the end
+        
+    Returns:
+        A `RangeQueryResult`, whose plan has its elapsed time filled in
+    """
+    plan = plan or plan_range_query(min_num, max_num, base, family, verify)
+    low = max(min_num, 0)
+    started = time.perf_counter()
+    
+    numbers: List[int] = []
+    next_num = low
+    
+    def past_deadline() -> bool:
+        return deadline is not None and next_num > low and time.monotonic() >= deadline
+    
+    with closing(iter_range_query(low, max_num, base, family, plan, past_deadline)) as chunks:
+        for found, next_num in chunks:
+            numbers.extend(found)
+            if next_num <= max_num and past_deadline():
+                break
+    
+    plan.elapsed = time.perf_counter() - started
+    plan.log()
+    return RangeQueryResult(numbers, plan, low, max_num, next_num, base, family, verify)
+
+
+def iter_armstrong_numbers(
+    min_num: int,
+    max_num: int,
+    base: int = 10,
+    family: Optional[DigitPowerFamily] = None,
+    verify: bool = False,
+) -> Iterator[Tuple[int, Optional[str]]]:
+    """
+    Lazily yield the members of a family in a range, in ascending order, each with a checkpoint.
+    
+    A thin wrapper over `iter_range_query` on the planned engine. The checkpoint
+    is a continuation token for the numbers after the member, so a caller can
+    stop after any member and resume later with
+    `iter_armstrong_numbers(*parse_range_continuation(checkpoint))`. Only one
+    segment's members are held at a time, however wide the range.
+    
+    Args:
+        min_num: Minimum number in the range (inclusive)
+        max_num: Maximum number in the range (inclusive)
+        base: The base the digits are taken in (2-36); other families are base 10 only
+        family: The family, from `get_family`; None means Armstrong numbers
+        verify: Compute the members instead of reading them from a catalogue
+        
+    Yields:
+        (member, checkpoint), the checkpoint being None after a member equal to `max_num`
+    """
+    plan = plan_range_query(min_num, max_num, base, family, verify)
+    with closing(iter_range_query(min_num, max_num, base, family, plan)) as chunks:
+        for found, _ in chunks:
+            for number in found:
+                checkpoint = _continuation_token(number + 1, max_num, base, family, verify) if number < max_num else None
+                yield number, checkpoint
+
+
+@lru_cache(maxsize=None)
+def _membership_set(name: str, exponent: Optional[int], base: int) -> frozenset:
+    if name == FAMILY_ARMSTRONG:
+        return frozenset(armstrong_catalogue(base))
+    return frozenset(get_family(name, exponent).catalogue())
+
+
+def plan_batch_check(count: int, base: int = 10, family: Optional[DigitPowerFamily] = None) -> QueryPlan:
+    """
+    Pick the cheaper way to check `count` numbers: catalogue membership or the exact check.
+    
+    Membership needs the whole catalogue, so it only wins when the catalogue is
+    shipped or cached, or the batch is large enough to pay for building it.
+    """
+    _validate_base(base)
+    if _is_armstrong_family(family):
+        name, exponent, per_check = FAMILY_ARMSTRONG, None, PLAN_SECONDS_PER_CHECK
+        build = 0 if base == 10 else estimate_multiset_search_cost(0, _armstrong_upper_bound(base) - 1, base)
+    else:
+        name, exponent, per_check = family.name, family.exponent, PLAN_SECONDS_PER_FAMILY_CHECK
+        build = 0 if _catalogue_is_ready(family) else family.search_cost()
+    
+    return QueryPlan("batch", {
+        (ENGINE_CATALOGUE, None): (
+            PLAN_SECONDS_PER_LOOKUP + build * PLAN_SECONDS_PER_MULTISET + count * PLAN_SECONDS_PER_MEMBERSHIP
+        ),
+        (ENGINE_CHECK, None): count * per_check,
+    })
+
+
+def run_batch_check(
+    numbers: List[int],
+    base: int = 10,
+    family: Optional[DigitPowerFamily] = None,
+) -> Tuple[List[bool], QueryPlan]:
+    """
+    Check many numbers on the engine the planner picks.
+    
+    Returns:
+        Tuple of (membership of each number in order, the plan with its elapsed time filled in)
+    """
+    plan = plan_batch_check(len(numbers), base, family)
+    started = time.perf_counter()
+    
+    if plan.engine == ENGINE_CATALOGUE:
+        name = FAMILY_ARMSTRONG if _is_armstrong_family(family) else family.name
+        members = _membership_set(name, None if family is None else family.exponent, base)
+        results = [number in members for number in numbers]
+    elif _is_armstrong_family(family):
+        results = check_many(numbers, base)
+    else:
+        results = [family.contains(number) for number in numbers]
     
-    digits = [int(d) for d in str(number)]
-    num_digits = len(digits)
-    sum_of_powers = sum(d ** num_digits for d in digits)
-    is_armstrong = sum_of_powers == number
-    
-    # Create calculation string
-    calculation_parts = [f"{d}^{num_digits}" for d in digits]
-    calculation = " + ".join(calculation_parts) + f" = {sum_of_powers}"
-    
-    return is_armstrong, {
-        "is_armstrong": is_armstrong,
-        "number": number,
-        "digits": digits,
-        "num_digits": num_digits,
-        "calculation": calculation,
-        "sum_of_powers": sum_of_powers
-    }
+    plan.elapsed = time.perf_counter() - started
+    plan.log()
+    return results, plan
@@ -0,0 +1,343 @@
+"""
+Recording calculator attempts, shared by the web pages and the JSON API.
+
+By default each attempt is inserted and committed on the request path. With
+ATTEMPT_WRITE_BEHIND set, rows are queued in memory instead and a background
+thread bulk-inserts them every ATTEMPT_FLUSH_ROWS rows or ATTEMPT_FLUSH_MS
+milliseconds, whichever comes first, so a request never waits on a commit.
+The queue holds at most ATTEMPT_QUEUE_SIZE rows. When it is full,
+ATTEMPT_OVERFLOW decides what happens to the rows that do not fit: "sync"
+writes them on the request path as if write-behind were off, "drop" discards
+them with a warning. Queued rows are flushed when the process exits.
+
+Results are stored once per distinct value in `result_blob` (see `ResultBlob`)
+and referenced by hash. Range results that a shipped catalogue reproduces are
+stored as their bounds alone; `load_attempt_result` fills the numbers back in.
+"""
+import atexit
+import os
+import queue
+import threading
+import time
+import uuid
+from typing import Any, List, Optional
+
+from flask import Flask, current_app
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.logging import log_error, log_event
+from app.models.attempt import Attempt
+from app.models.result_blob import ResultBlob
+from app.utils.armstrong import ArmstrongCheck, DigitPowerFamily, RangeQueryResult, get_family, shipped_catalogue_range
+from app.utils.date_time import DateTimeUtils
+
+OVERFLOW_SYNC = "sync"
+OVERFLOW_DROP = "drop"
+
+# Used when the app config does not set them
+DEFAULT_FLUSH_ROWS = 200
+DEFAULT_FLUSH_MS = 250
+DEFAULT_QUEUE_SIZE = 10000
+
+# Longest wait for the last flush when the process exits
+CLOSE_TIMEOUT_SECONDS = 10
+
+_STOP = object()
+
+# Row key carrying the encoded result blob to insert along with an attempt
+_RESULT_BLOB = "_result_blob"
+
+# `Attempt.family` of trajectories, which walk the digit-power-sum map rather than test membership of a family
+FAMILY_TRAJECTORY = "trajectory"
+
+
+def _insert_blobs(blobs: dict) -> None:
+    """Insert the result blobs not already stored."""
+    stored = set(db.session.execute(select(ResultBlob.hash).where(ResultBlob.hash.in_(list(blobs)))).scalars())
+    new_blobs = [blob for blob_hash, blob in blobs.items() if blob_hash not in stored]
+    if new_blobs:
+        db.session.execute(insert(ResultBlob), new_blobs)
+
+
+def _insert_rows(rows: List[dict]) -> None:
+    blobs = {row[_RESULT_BLOB]["hash"]: row[_RESULT_BLOB] for row in rows if row.get(_RESULT_BLOB)}
+    
+    # A bulk insert needs the same columns in every row; batch rows leave the optional ones out
+    columns = set().union(*rows) - {_RESULT_BLOB}
+    attempt_rows = [{column: row.get(column) for column in columns} for row in rows]
+    
+    if blobs:
+        try:
+            _insert_blobs(blobs)
+        except IntegrityError:
+            # Another process stored one of the same blobs first
+            db.session.rollback()
+            _insert_blobs(blobs)
+    db.session.execute(insert(Attempt), attempt_rows)
+    db.session.commit()
+
+
+class AttemptRecorder:
+    """Queues attempt rows and bulk-inserts them from a background thread."""
+
+    def __init__(self, app: Flask, flush_rows: int, flush_ms: float, queue_size: int, overflow: str):
+        if overflow not in (OVERFLOW_SYNC, OVERFLOW_DROP):
+            raise ValueError(f"ATTEMPT_OVERFLOW must be {OVERFLOW_SYNC!r} or {OVERFLOW_DROP!r}, not {overflow!r}")
+        self.app = app
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_ms / 1000
+        self.overflow = overflow
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        # Started on first use, so each forked server worker gets its own thread
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._thread = threading.Thread(target=self._run, name="attempt-recorder", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+            atexit.register(self.close)
+
+    def record(self, rows: List[dict]) -> None:
+        """Queue rows for the next flush, applying the overflow policy to any that do not fit."""
+        self._ensure_started()
+        overflow = []
+        for row in rows:
+            try:
+                self.queue.put_nowait(row)
+            except queue.Full:
+                overflow.append(row)
+
+        if not overflow:
+            return
+        if self.overflow == OVERFLOW_SYNC:
+            _insert_rows(overflow)
+        else:
+            log_event("Attempt queue full, rows dropped", data={"count": len(overflow)}, event_type="attempt_overflow")
+
+    def _flush(self, batch: List[dict]) -> None:
+        with self.app.app_context():
+            try:
+                _insert_rows(batch)
+            except Exception as e:
+                db.session.rollback()
+                log_error(f"Failed to flush {len(batch)} attempt(s)", e)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            row = self.queue.get()
+            if row is _STOP:
+                break
+
+            batch = [row]
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.flush_rows:
+                try:
+                    row = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if row is _STOP:
+                    stopping = True
+                    break
+                batch.append(row)
+            self._flush(batch)
+
+        # Rows queued behind the stop marker by other threads
+        remaining = []
+        while True:
+            try:
+                row = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if row is not _STOP:
+                remaining.append(row)
+        if remaining:
+            self._flush(remaining)
+
+    def close(self) -> None:
+        """Flush queued rows and stop the thread."""
+        if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+            return
+        try:
+            self.queue.put(_STOP, timeout=CLOSE_TIMEOUT_SECONDS)
+        except queue.Full:
+            pass
+        self._thread.join(CLOSE_TIMEOUT_SECONDS)
+
+
+def get_attempt_recorder() -> Optional[AttemptRecorder]:
+    """The app's write-behind recorder, or None when ATTEMPT_WRITE_BEHIND is off."""
+    config = current_app.config
+    if not config.get("ATTEMPT_WRITE_BEHIND"):
+        return None
+
+    recorder = current_app.extensions.get("attempt_recorder")
+    if recorder is None:
+        recorder = AttemptRecorder(
+            current_app._get_current_object(),
+            flush_rows=config.get("ATTEMPT_FLUSH_ROWS", DEFAULT_FLUSH_ROWS),
+            flush_ms=config.get("ATTEMPT_FLUSH_MS", DEFAULT_FLUSH_MS),
+            queue_size=config.get("ATTEMPT_QUEUE_SIZE", DEFAULT_QUEUE_SIZE),
+            overflow=config.get("ATTEMPT_OVERFLOW", OVERFLOW_SYNC),
+        )
+        current_app.extensions["attempt_recorder"] = recorder
+    return recorder
+
+
+def _as_row(attempt: Attempt, result: Any = None) -> dict:
+    """Column values of an unsaved attempt and its result, with the id and timestamp fixed now rather than at flush time."""
+    attempt.id = attempt.id or uuid.uuid4()
+    attempt.created_at = attempt.created_at or DateTimeUtils.aware_utcnow()
+    
+    row = {}
+    for column in Attempt.__table__.columns:
+        value = getattr(attempt, column.key)
+        # Column defaults are only applied on flush, which a bulk insert bypasses
+        if value is None and column.default is not None and column.default.is_scalar:
+            value = column.default.arg
+        row[column.key] = value
+    
+    if result is not None:
+        blob = ResultBlob.encode(result)
+        row["result_hash"] = blob["hash"]
+        row[_RESULT_BLOB] = blob
+    return row
+
+
+def record_attempts(rows: List[dict]) -> None:
+    """Insert attempt rows now, or queue them when write-behind is on."""
+    recorder = get_attempt_recorder()
+    if recorder is None:
+        _insert_rows(rows)
+    else:
+        recorder.record(rows)
+
+
+def save_attempt(attempt: Attempt, result: Any = None, sync: bool = False) -> uuid.UUID:
+    """
+    Save an unsaved attempt through `record_attempts`.
+    
+    Args:
+        attempt: The attempt, without an id
+        result: Its JSON-serializable result, stored as a shared `ResultBlob`
+        sync: Insert it now even when write-behind is on, e.g. when a row will reference it
+        
+    Returns:
+        The attempt's id, which is set even before a queued row is written
+    """
+    row = _as_row(attempt, result)
+    if sync:
+        _insert_rows([row])
+    else:
+        record_attempts([row])
+    return row["id"]
+
+
+def load_attempt_result(attempt: Attempt) -> Any:
+    """An attempt's result, with the numbers of a range stored as bounds filled back in from the catalogue."""
+    result = attempt.load_result()
+    if isinstance(result, dict) and "bounds" in result:
+        family = get_family(attempt.family, result.get("exponent"))
+        result = {**result, "numbers": shipped_catalogue_range(*result["bounds"], attempt.base, family)}
+    return result
+
+
+def save_check_attempt(user_id, digits: str, details: ArmstrongCheck, family: DigitPowerFamily) -> uuid.UUID:
+    """Save a single-number check, keeping only a digest of inputs too long to store."""
+    attempt = Attempt()
+    attempt.user_id = user_id
+    attempt.set_input(digits, details.digest)
+    attempt.input_type = "single"
+    attempt.base = details.base
+    attempt.family = family.name
+    attempt.is_armstrong = details.is_armstrong
+    return save_attempt(attempt, details.to_dict())
+
+
+def save_batch_attempts(user_id, numbers: List[int], results: List[bool], base: int, family: DigitPowerFamily) -> None:
+    """Save a batch check as one single-number attempt per number, with a single bulk insert."""
+    created_at = DateTimeUtils.aware_utcnow()
+    record_attempts([
+        {
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "input_value": str(number),
+            "input_type": "single",
+            "base": base,
+            "family": family.name,
+            "is_armstrong": is_armstrong,
+            "created_at": created_at,
+        }
+        for number, is_armstrong in zip(numbers, results)
+    ])
+
+
+def save_range_numbers(
+    user_id,
+    min_num: int,
+    max_num: int,
+    base: int,
+    family: DigitPowerFamily,
+    numbers: List[int],
+    details: dict,
+    sync: bool = False,
+) -> uuid.UUID:
+    """
+    Save the members found in a range as an attempt.
+    
+    When a shipped catalogue gives the same numbers for the range, only the
+    bounds are stored, and `load_attempt_result` reads the numbers back from it.
+    
+    Args:
+        details: Extra result fields, such as the engine
+        sync: As for `save_attempt`
+    """
+    attempt = Attempt()
+    attempt.user_id = user_id
+    attempt.set_input(f"{min_num}-{max_num}")
+    attempt.input_type = "range"
+    attempt.base = base
+    attempt.family = family.name
+    attempt.count = len(numbers)
+    
+    result = {"exponent": family.exponent, **details}
+    if shipped_catalogue_range(min_num, max_num, base, family) == numbers:
+        result["bounds"] = [min_num, max_num]
+    else:
+        result["numbers"] = numbers
+    return save_attempt(attempt, result, sync)
+
+
+def save_trajectory_attempt(user_id, input_value: str, count: int, result: dict) -> uuid.UUID:
+    """
+    Save a trajectory, or a summary of a range's basins, as an attempt.
+    
+    Args:
+        input_value: The starting number, or the range as "min-max"
+        count: The cycle length of a trajectory, or the number of basins of a range
+        result: The trajectory or basins, including the fixed exponent if any
+    """
+    attempt = Attempt()
+    attempt.user_id = user_id
+    attempt.input_value = input_value
+    attempt.input_type = "trajectory"
+    attempt.family = FAMILY_TRAJECTORY
+    attempt.count = count
+    return save_attempt(attempt, result)
+
+
+def save_range_attempt(user_id, result: RangeQueryResult) -> uuid.UUID:
+    """Save a range query result, complete or stopped at its deadline, as an attempt."""
+    return save_range_numbers(
+        user_id, result.min_num, result.searched_to, result.base, result.family, result.numbers,
+        {"engine": result.plan.engine, "continuation": result.continuation()},
+    )
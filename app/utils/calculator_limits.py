@@ -0,0 +1,53 @@
+"""
+Input limits and option parsing shared by the calculator's web pages and JSON API.
+
+Each caller converts its own input (form strings or JSON values) to integers,
+then `parse_base_and_family` validates them the same way for both.
+"""
+from typing import Optional
+
+from app.utils.armstrong import MIN_BASE, MAX_BASE, FAMILY_ARMSTRONG, FAMILY_PDI, FAMILIES, DigitPowerFamily, get_family
+
+# Batch checks: most numbers accepted per request, and the longest number `Attempt.input_value` holds.
+MAX_BATCH_SIZE = 50000
+MAX_BATCH_NUMBER_LENGTH = 50
+
+# Largest exponent accepted for perfect digital invariants.
+MAX_PDI_EXPONENT = 60
+
+# Trajectories: widest range summarized per request, and the largest fixed exponent.
+MAX_TRAJECTORY_RANGE = 100000
+MAX_TRAJECTORY_EXPONENT = 20
+
+
+def parse_base_and_family(base: Optional[int], name: Optional[str], exponent: Optional[int]) -> tuple[int, DigitPowerFamily]:
+    """
+    Validate a base, digit-power family name and PDI exponent.
+    
+    Args:
+        base: The base, or None if it was not an integer
+        name: The family name, or None for Armstrong numbers
+        exponent: The fixed exponent, or None if missing or not an integer; only read for perfect digital invariants
+    
+    Returns:
+        (base, family)
+    
+    Raises:
+        ValueError: With a message for the user if any of them is invalid
+    """
+    if base is None or not MIN_BASE <= base <= MAX_BASE:
+        raise ValueError(f"Base must be an integer between {MIN_BASE} and {MAX_BASE}.")
+    
+    name = name or FAMILY_ARMSTRONG
+    if not isinstance(name, str) or name not in FAMILIES:
+        raise ValueError(f"Family must be one of: {', '.join(FAMILIES)}.")
+    
+    if name != FAMILY_PDI:
+        exponent = None
+    elif exponent is None or not 1 <= exponent <= MAX_PDI_EXPONENT:
+        raise ValueError(f"Perfect digital invariants need an exponent from 1 to {MAX_PDI_EXPONENT}.")
+    
+    family = get_family(name, exponent)
+    if family.name != FAMILY_ARMSTRONG and base != 10:
+        raise ValueError(f"{family.label.capitalize()}s are only available in base 10.")
+    return base, family
@@ -0,0 +1,116 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Pages are fetched by seeking past the last row seen on (created_at, id) instead
+of with OFFSET, and without counting the rows, so every page costs the same as
+the first. Cursors are opaque URL-safe tokens.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional
+
+from sqlalchemy import and_, or_
+
+# Cursor directions: rows older than the cursor, or newer than it.
+CURSOR_NEXT = "n"
+CURSOR_PREV = "p"
+
+
+class KeysetPage:
+    """One page of rows, newest first, with cursors for the neighbouring pages."""
+    
+    def __init__(self, items: List[Any], next_cursor: Optional[str], prev_cursor: Optional[str]):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+    
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+    
+    @property
+    def has_prev(self) -> bool:
+        return self.prev_cursor is not None
+
+
+def encode_cursor(direction: str, created_at: datetime, row_id: uuid.UUID) -> str:
+    """Encode a position in the (created_at, id) order as an opaque token."""
+    raw = json.dumps([direction, created_at.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[str, datetime, uuid.UUID]:
+    """
+    Decode a token from `encode_cursor`.
+    
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        direction, created_at, row_id = json.loads(raw)
+        if direction not in (CURSOR_NEXT, CURSOR_PREV):
+            raise ValueError(f"unknown direction {direction!r}")
+        return direction, datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid page cursor: {token!r}") from e
+
+
+def keyset_paginate(query, created_column, id_column, cursor: Optional[str], per_page: int) -> KeysetPage:
+    """
+    Fetch one page of `query` in (created_at DESC, id ASC) order.
+    
+    The order matches an index on (..., created_at DESC, id), which is read
+    forwards for older pages and backwards for newer ones. One extra row is
+    fetched to tell whether a further page exists.
+    
+    Args:
+        query: The filtered query, without ordering or limits
+        created_column: The timestamp column, e.g. `Attempt.created_at`
+        id_column: The unique tie-breaker column, e.g. `Attempt.id`
+        cursor: A token from a previous page, or None (or an invalid token) for the first page
+        per_page: Rows per page
+        
+    Returns:
+        A `KeysetPage`
+    """
+    position = None
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+        except ValueError:
+            position = None
+    
+    if position is None:
+        rows = query.order_by(created_column.desc(), id_column.asc()).limit(per_page + 1).all()
+        items, has_more = rows[:per_page], len(rows) > per_page
+        has_next, has_prev = has_more, False
+    else:
+        direction, created_at, row_id = position
+        if direction == CURSOR_NEXT:
+            # Rows after the cursor: older, or as old with a larger id
+            seek = and_(created_column <= created_at, or_(created_column < created_at, id_column > row_id))
+            rows = query.filter(seek).order_by(created_column.desc(), id_column.asc()).limit(per_page + 1).all()
+            items, has_more = rows[:per_page], len(rows) > per_page
+            has_next, has_prev = has_more, True
+        else:
+            # Rows before the cursor, read in reverse and put back in page order
+            seek = and_(created_column >= created_at, or_(created_column > created_at, id_column < row_id))
+            rows = query.filter(seek).order_by(created_column.asc(), id_column.desc()).limit(per_page + 1).all()
+            items, has_more = rows[:per_page][::-1], len(rows) > per_page
+            has_next, has_prev = True, has_more
+    
+    if not items:
+        return KeysetPage(items, None, None)
+    
+    first, last = items[0], items[-1]
+    return KeysetPage(
+        items,
+        encode_cursor(CURSOR_NEXT, getattr(last, created_column.key), getattr(last, id_column.key)) if has_next else None,
+        encode_cursor(CURSOR_PREV, getattr(first, created_column.key), getattr(first, id_column.key)) if has_prev else None,
+    )
@@ -0,0 +1,366 @@
+"""
+Database-backed job queue for calculator queries too long to run inline.
+
+Jobs are rows in the `job` table, run by `flask worker` processes. A worker
+claims a job with a compare-and-swap UPDATE that only matches while the job is
+still claimable, so no row locks are needed and the queue works the same on
+SQLite and PostgreSQL. The claim is a lease: while the handler runs, a
+heartbeat thread renews it every third of its length, and the handler saves
+its progress along with a renewal after each slice of work. If the worker dies
+the lease expires and another worker picks the job up from its last saved
+progress.
+"""
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Callable, Dict, Iterator, Optional
+
+from flask import current_app
+from sqlalchemy import and_, func, or_, select, update
+
+from app.enums.jobs import JobStatus
+from app.extensions import db
+from app.logging import log_error, log_event
+from app.models.job import Job
+from app.utils.armstrong import get_family, run_range_query
+from app.utils.attempts import save_range_numbers
+from app.utils.date_time import DateTimeUtils
+
+JOB_KIND_RANGE = "range"
+
+# Used when the app config does not set them
+DEFAULT_LEASE_SECONDS = 60.0
+DEFAULT_POLL_SECONDS = 2.0
+DEFAULT_MAX_ATTEMPTS = 3
+RETRY_DELAY_SECONDS = 30  # Doubled after each failed attempt
+
+# Candidates fetched per claim; others may win the race for some of them
+CLAIM_BATCH_SIZE = 5
+
+# The heartbeat renews a lease this many times per lease length, so a couple of failed renewals are survivable
+HEARTBEATS_PER_LEASE = 3
+
+
+class LeaseLost(Exception):
+    """Raised inside a job handler when another worker has taken over the job."""
+
+
+def enqueue_job(user_id, kind: str, payload: dict, priority: int = 0) -> Job:
+    """
+    Add a job to the queue.
+
+    Args:
+        user_id: The user the job runs for
+        kind: The job kind, a key of `JOB_HANDLERS`
+        payload: JSON-serializable arguments for the handler
+        priority: Higher-priority jobs are claimed first
+
+    Returns:
+        The queued `Job`
+    """
+    job = Job()
+    job.user_id = user_id
+    job.kind = kind
+    job.priority = priority
+    job.payload = json.dumps(payload)
+    job.max_attempts = current_app.config.get("JOB_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS)
+    job.save()
+
+    log_event("Job queued", data={"job_id": str(job.id), "kind": kind, "priority": priority}, event_type="job_queued")
+    return job
+
+
+def _is_claimable(now):
+    """Queued jobs that are due, and running jobs whose worker stopped renewing the lease."""
+    return or_(
+        and_(Job.status == JobStatus.QUEUED, Job.run_after <= now),
+        and_(Job.status == JobStatus.RUNNING, Job.lease_expires_at < now, Job.attempts < Job.max_attempts),
+    )
+
+
+def _fail_abandoned_jobs(now) -> None:
+    """Fail running jobs whose lease expired on their last allowed attempt."""
+    result = db.session.execute(
+        update(Job)
+        .where(Job.status == JobStatus.RUNNING, Job.lease_expires_at < now, Job.attempts >= Job.max_attempts)
+        .values(status=JobStatus.FAILED, lease_owner=None, lease_expires_at=None, finished_at=now,
+                error="The worker stopped responding on the last attempt.")
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    if result.rowcount:
+        log_event("Abandoned jobs failed", data={"count": result.rowcount}, event_type="job_failed")
+
+
+def claim_job(worker_id: str, lease_seconds: float) -> Optional[Job]:
+    """
+    Claim the highest-priority, oldest claimable job.
+
+    Each candidate is claimed by an UPDATE guarded by the same conditions that
+    selected it, so when two workers race for a job exactly one UPDATE matches.
+
+    Returns:
+        The claimed `Job`, or None if the queue has nothing to run
+    """
+    now = DateTimeUtils.aware_utcnow()
+    _fail_abandoned_jobs(now)
+
+    candidates = db.session.execute(
+        select(Job.id)
+        .where(_is_claimable(now))
+        .order_by(Job.priority.desc(), Job.created_at)
+        .limit(CLAIM_BATCH_SIZE)
+    ).scalars().all()
+
+    for job_id in candidates:
+        claimed = db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, _is_claimable(now))
+            .values(
+                status=JobStatus.RUNNING,
+                lease_owner=worker_id,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+                attempts=Job.attempts + 1,
+                started_at=func.coalesce(Job.started_at, now),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+
+        if claimed.rowcount == 1:
+            return db.session.execute(
+                select(Job).where(Job.id == job_id).execution_options(populate_existing=True)
+            ).scalar_one()
+    return None
+
+
+def _update_owned(job_id, worker_id: str, **values) -> bool:
+    """Update a job only while `worker_id` still holds its lease. Returns False if the lease was lost."""
+    result = db.session.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == JobStatus.RUNNING, Job.lease_owner == worker_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount == 1
+
+
+def renew_lease(job_id, worker_id: str, lease_seconds: float, payload: dict | None = None) -> bool:
+    """
+    Extend a job's lease, saving its progress with it.
+
+    Returns:
+        False if another worker has reclaimed the job, in which case the caller must stop
+    """
+    values = {"lease_expires_at": DateTimeUtils.aware_utcnow() + timedelta(seconds=lease_seconds)}
+    if payload is not None:
+        values["payload"] = json.dumps(payload)
+    return _update_owned(job_id, worker_id, **values)
+
+
+def complete_job(job_id, worker_id: str, attempt_id=None) -> bool:
+    """Mark a job succeeded and link the attempt recording its result."""
+    return _update_owned(
+        job_id, worker_id,
+        status=JobStatus.SUCCEEDED,
+        attempt_id=attempt_id,
+        lease_owner=None,
+        lease_expires_at=None,
+        finished_at=DateTimeUtils.aware_utcnow(),
+    )
+
+
+def fail_job(job: Job, worker_id: str, error: str) -> bool:
+    """Requeue a failed job with exponential backoff, or fail it for good on its last attempt."""
+    now = DateTimeUtils.aware_utcnow()
+    if job.attempts < job.max_attempts:
+        delay = RETRY_DELAY_SECONDS * 2 ** (job.attempts - 1)
+        return _update_owned(
+            job.id, worker_id,
+            status=JobStatus.QUEUED,
+            run_after=now + timedelta(seconds=delay),
+            lease_owner=None,
+            lease_expires_at=None,
+            error=error,
+        )
+    return _update_owned(
+        job.id, worker_id,
+        status=JobStatus.FAILED,
+        lease_owner=None,
+        lease_expires_at=None,
+        finished_at=now,
+        error=error,
+    )
+
+
+def job_progress(job: Job) -> float:
+    """Fraction of a job's work done, from the progress saved in its payload."""
+    if job.status == JobStatus.SUCCEEDED:
+        return 1.0
+    data = job.data
+    if job.kind == JOB_KIND_RANGE:
+        done = data.get("next_num", data["min_num"]) - data["min_num"]
+        return min(done / (data["max_num"] - data["min_num"] + 1), 1.0)
+    return 0.0
+
+
+def run_range_job(job: Job, heartbeat: Callable[[dict], bool], slice_seconds: float):
+    """
+    Run a range job in deadline-bounded slices, saving progress after each one.
+
+    A reclaimed job resumes from the `next_num` saved by the last slice.
+
+    Returns:
+        The id of the `Attempt` recording the result
+    """
+    data = job.data
+    family = get_family(data["family"], data.get("exponent"))
+    numbers = data.setdefault("numbers", [])
+
+    while True:
+        result = run_range_query(
+            data.get("next_num", data["min_num"]), data["max_num"], data["base"], family, data["verify"],
+            deadline=time.monotonic() + slice_seconds,
+        )
+        numbers.extend(result.numbers)
+        data["next_num"] = result.next_num
+        data["engine"] = result.plan.engine
+        # Also confirms the lease is still held before the result is saved
+        if not heartbeat(data):
+            raise LeaseLost()
+        if result.complete:
+            break
+
+    # Saved now, since the job row references it
+    return save_range_numbers(
+        job.user_id, data["min_num"], data["max_num"], data["base"], family, numbers,
+        {"engine": data["engine"], "job_id": str(job.id)}, sync=True,
+    )
+
+
+JOB_HANDLERS: Dict[str, Callable] = {
+    JOB_KIND_RANGE: run_range_job,
+}
+
+
+@contextmanager
+def _lease_kept(job_id, worker_id: str, lease_seconds: float) -> Iterator[threading.Event]:
+    """
+    Renew a job's lease from a heartbeat thread for the duration of the block.
+
+    Without it a single segment of work that outlasts the lease would let
+    another worker reclaim the job and repeat it.
+
+    Yields:
+        An event that is set once another worker has taken the job over
+    """
+    app = current_app._get_current_object()
+    stop, lost = threading.Event(), threading.Event()
+
+    def keep() -> None:
+        with app.app_context():
+            while not stop.wait(lease_seconds / HEARTBEATS_PER_LEASE):
+                try:
+                    renewed = renew_lease(job_id, worker_id, lease_seconds)
+                except Exception as e:
+                    # Retried on the next beat, well before the lease runs out
+                    db.session.rollback()
+                    log_error(f"Lease renewal for job {job_id} failed", e)
+                    continue
+                if not renewed:
+                    lost.set()
+                    return
+
+    keeper = threading.Thread(target=keep, name=f"job-lease-{job_id}", daemon=True)
+    keeper.start()
+    try:
+        yield lost
+    finally:
+        stop.set()
+        keeper.join()
+
+
+def process_job(job: Job, worker_id: str, lease_seconds: float) -> None:
+    """Run a claimed job through its handler, keeping its lease alive, and record the outcome."""
+    started = time.perf_counter()
+    log_data = {"job_id": str(job.id), "kind": job.kind, "attempt": job.attempts, "worker": worker_id}
+    log_event("Job started", data=log_data, event_type="job_started")
+
+    try:
+        handler = JOB_HANDLERS.get(job.kind)
+        if handler is None:
+            raise ValueError(f"Unknown job kind: {job.kind}")
+
+        with _lease_kept(job.id, worker_id, lease_seconds) as lost:
+            def heartbeat(payload: dict) -> bool:
+                return not lost.is_set() and renew_lease(job.id, worker_id, lease_seconds, payload)
+
+            # Progress is saved every half lease; the heartbeat thread holds the lease through longer segments
+            attempt_id = handler(job, heartbeat, lease_seconds / 2)
+    except LeaseLost:
+        db.session.rollback()
+        log_event("Job lease lost", data=log_data, event_type="job_lease_lost")
+        return
+    except Exception as e:
+        db.session.rollback()
+        log_error(f"Job {job.id} failed", e)
+        fail_job(job, worker_id, f"{type(e).__name__}: {e}")
+        return
+
+    if complete_job(job.id, worker_id, attempt_id):
+        log_event("Job finished", data={**log_data, "seconds": time.perf_counter() - started}, event_type="job_finished")
+    else:
+        log_event("Job lease lost", data=log_data, event_type="job_lease_lost")
+
+
+def default_worker_id() -> str:
+    """An id unique to this worker process, which also tells an operator where it runs."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"[:64]
+
+
+def run_worker(
+    worker_id: str | None = None,
+    lease_seconds: float | None = None,
+    poll_seconds: float | None = None,
+    burst: bool = False,
+) -> int:
+    """
+    Claim and run jobs until stopped.
+
+    Args:
+        worker_id: Lease owner name, unique per process (defaults to host, pid and a random suffix)
+        lease_seconds: How long a claim lasts without renewal (defaults to JOB_LEASE_SECONDS)
+        poll_seconds: How long to sleep when the queue is empty (defaults to JOB_POLL_SECONDS)
+        burst: Exit once the queue is empty instead of polling
+
+    Returns:
+        The number of jobs processed
+    """
+    worker_id = worker_id or default_worker_id()
+    lease_seconds = lease_seconds or current_app.config.get("JOB_LEASE_SECONDS", DEFAULT_LEASE_SECONDS)
+    poll_seconds = poll_seconds or current_app.config.get("JOB_POLL_SECONDS", DEFAULT_POLL_SECONDS)
+    log_event("Worker started", data={"worker": worker_id, "lease_seconds": lease_seconds}, event_type="worker_started")
+
+    processed = 0
+    try:
+        while True:
+            job = claim_job(worker_id, lease_seconds)
+            if job is None:
+                if burst:
+                    break
+                time.sleep(poll_seconds)
+                continue
+            process_job(job, worker_id, lease_seconds)
+            processed += 1
+    except KeyboardInterrupt:
+        # A job interrupted here is reclaimed once its lease expires
+        pass
+
+    log_event("Worker stopped", data={"worker": worker_id, "processed": processed}, event_type="worker_stopped")
+    return processed
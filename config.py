@@ -9,6 +9,9 @@ class Config():
     EMERGENCY_MODE = os.getenv("EMERGENCY_MODE") or os.environ.get("EMERGENCY_MODE") or False
     
 
+    # Long numbers are posted as form fields, well past Werkzeug's 500 KB default
+    MAX_FORM_MEMORY_SIZE = int(os.getenv("MAX_FORM_MEMORY_SIZE") or 16 * 1024 * 1024)
+    
     # Static and template folders
     STATIC_FOLDER = "resources/static"
     TEMPLATE_FOLDER = "resources/templates"
@@ -23,6 +26,24 @@ class Config():
     DEFAULT_ADMIN_USERNAME = os.getenv("DEFAULT_ADMIN_USERNAME")
     DEFAULT_ADMIN_PASSWORD = os.getenv("DEFAULT_ADMIN_PASSWORD")
     
+    # Query admission: estimated seconds run inline, queued as jobs, or not at all
+    QUERY_INLINE_SECONDS = float(os.getenv("QUERY_INLINE_SECONDS") or 2)
+    QUERY_BUDGET_SECONDS = float(os.getenv("QUERY_BUDGET_SECONDS") or 120)  # Background tier: queued ahead of longer jobs
+    QUERY_DEADLINE_SECONDS = float(os.getenv("QUERY_DEADLINE_SECONDS") or 10)  # Inline queries stop here with a partial result
+    QUERY_JOB_BUDGET_SECONDS = float(os.getenv("QUERY_JOB_BUDGET_SECONDS") or 6 * 3600)  # Over QUERY_BUDGET_SECONDS, queued behind them
+    
+    # Job queue, run by `flask worker`
+    JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS") or 60)
+    JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS") or 2)
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS") or 3)
+    
+    # Attempt write-behind: queue attempt rows and bulk-insert them from a background thread
+    ATTEMPT_WRITE_BEHIND = os.getenv("ATTEMPT_WRITE_BEHIND", "").lower() in ("1", "true", "yes")
+    ATTEMPT_FLUSH_ROWS = int(os.getenv("ATTEMPT_FLUSH_ROWS") or 200)
+    ATTEMPT_FLUSH_MS = float(os.getenv("ATTEMPT_FLUSH_MS") or 250)
+    ATTEMPT_QUEUE_SIZE = int(os.getenv("ATTEMPT_QUEUE_SIZE") or 10000)
+    ATTEMPT_OVERFLOW = os.getenv("ATTEMPT_OVERFLOW") or "sync"  # "sync" writes overflow on the request path, "drop" discards it
+    
     # Logging configuration
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
     BASE_LOG_LEVEL = os.getenv("BASE_LOG_LEVEL", "WARNING")
@@ -0,0 +1,28 @@
+"""
+Shared fixtures: the app on a fresh in-memory SQLite database, and a user to act as.
+"""
+import pytest
+
+from app import create_app
+from app.extensions import db
+from app.models.user import AppUser
+
+
+@pytest.fixture
+def app():
+    app = create_app("testing", seed_db=False)
+    app.config.update(SECRET_KEY="test-secret", JWT_SECRET_KEY="test-jwt-secret-that-is-long-enough", WTF_CSRF_ENABLED=False)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def user(app):
+    user = AppUser(username="alice", email="alice@example.com")
+    user.set_password("password")
+    db.session.add(user)
+    db.session.commit()
+    return user
@@ -0,0 +1,177 @@
+"""
+Tests for the /api/v1 endpoints and their token authentication.
+"""
+import pytest
+
+from app.extensions import db
+from app.models.attempt import Attempt
+from app.models.user import AppUser
+from app.utils.armstrong import ARMSTRONG_NUMBERS
+from app.utils.calculator_limits import MAX_BATCH_SIZE
+from app.utils.jobs import run_worker
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def headers(client, user):
+    response = client.post("/api/v1/auth/token", json={"username": "alice", "password": "password"})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.get_json()['data']['access_token']}"}
+
+
+def _post(client, headers, path, body):
+    response = client.post(f"/api/v1/calculator/{path}", json=body, headers=headers)
+    return response.status_code, response.get_json()
+
+
+@pytest.mark.parametrize("body, status", [
+    ({"username": "alice", "password": "password"}, 200),
+    ({"username": "alice@example.com", "password": "password"}, 200),
+    ({"username": "alice", "password": "wrong"}, 401),
+    ({"username": "bob", "password": "password"}, 401),
+    ({"username": "alice"}, 400),
+    ({}, 400),
+])
+def test_token_needs_valid_credentials(client, user, body, status):
+    assert client.post("/api/v1/auth/token", json=body).status_code == status
+
+
+@pytest.mark.parametrize("method, path", [
+    ("post", "/api/v1/calculator/check"),
+    ("post", "/api/v1/calculator/batch"),
+    ("post", "/api/v1/calculator/range"),
+    ("get", "/api/v1/calculator/attempts"),
+    ("get", "/api/v1/calculator/jobs/00000000-0000-0000-0000-000000000000"),
+])
+def test_endpoints_need_a_token(client, method, path):
+    assert getattr(client, method)(path, json={}).status_code == 401
+    # Flask-JWT-Extended's status for a malformed token
+    assert getattr(client, method)(path, json={}, headers={"Authorization": "Bearer not-a-token"}).status_code == 422
+
+
+def test_tokens_of_deleted_users_are_refused(client, user, headers):
+    db.session.delete(user)
+    db.session.commit()
+    assert _post(client, headers, "check", {"number": 153})[0] == 401
+
+
+@pytest.mark.parametrize("number, is_armstrong", [(153, True), ("9474", True), ("000407", True), (154, False)])
+def test_check(client, headers, number, is_armstrong):
+    status, body = _post(client, headers, "check", {"number": number})
+    assert status == 200
+    assert body["data"]["is_armstrong"] is is_armstrong
+    assert "calculation" not in body["data"]
+
+
+def test_check_details_and_long_inputs(client, headers):
+    status, body = _post(client, headers, "check", {"number": 153, "details": True})
+    assert status == 200 and "calculation" in body["data"]
+    
+    # Decided on length alone, without converting the digits
+    status, body = _post(client, headers, "check", {"number": "9" * 100000})
+    assert status == 200
+    assert (body["data"]["is_armstrong"], body["data"]["decided_by"]) == (False, "length")
+    assert Attempt.query.filter(Attempt.input_length.isnot(None)).one().input_length == 100000
+
+
+@pytest.mark.parametrize("body", [
+    {},
+    {"number": -153},
+    {"number": True},
+    {"number": 1.5},
+    {"number": "\u0661\u0665\u0663"},
+    {"number": 153, "base": 99},
+    {"number": 153, "family": "nope"},
+    {"number": 153, "family": "pdi"},
+])
+def test_check_rejects_invalid_input(client, headers, body):
+    assert _post(client, headers, "check", body)[0] == 400
+
+
+def test_batch(client, headers):
+    status, body = _post(client, headers, "batch", {"numbers": [1, "153", 154, "9474", 10 ** 20]})
+    assert status == 200
+    assert body["data"] == {"count": 5, "members": [1, 153, 9474]}
+    assert Attempt.query.count() == 5
+    
+    status, body = _post(client, headers, "batch", {"numbers": [89, 135, 136], "family": "disarium"})
+    assert body["data"]["members"] == [89, 135]
+
+
+@pytest.mark.parametrize("numbers", [[], "153", [153, -1], [153, "\u0661"], [153, True], ["9" * 51], [1] * (MAX_BATCH_SIZE + 1)])
+def test_batch_rejects_invalid_input(client, headers, numbers):
+    assert _post(client, headers, "batch", {"numbers": numbers})[0] == 400
+
+
+def test_range(client, headers):
+    status, body = _post(client, headers, "range", {"min": 100, "max": "1000000"})
+    assert status == 200
+    assert body["data"]["numbers"] == [number for number in ARMSTRONG_NUMBERS if 100 <= number <= 10 ** 6]
+    assert body["data"]["complete"] and body["data"]["continuation"] is None
+    
+    for invalid in [{"min": 10, "max": 5}, {"min": -1, "max": 5}, {"min": 0}, {"continuation": "garbage"}]:
+        assert _post(client, headers, "range", invalid)[0] == 400
+
+
+def test_partial_ranges_continue_from_their_token(app, client, headers):
+    app.config["QUERY_DEADLINE_SECONDS"] = 0
+    status, body = _post(client, headers, "range", {"min": 0, "max": 10 ** 8, "verify": True})
+    numbers, pages = list(body["data"]["numbers"]), 1
+    while not body["data"]["complete"]:
+        status, body = _post(client, headers, "range", {"continuation": body["data"]["continuation"]})
+        assert status == 200
+        numbers.extend(body["data"]["numbers"])
+        pages += 1
+    
+    assert pages > 1
+    assert numbers == [number for number in ARMSTRONG_NUMBERS if number <= 10 ** 8]
+
+
+def test_expensive_ranges_are_queued_or_refused(app, client, headers):
+    app.config.update(QUERY_INLINE_SECONDS=0, QUERY_BUDGET_SECONDS=0)
+    status, body = _post(client, headers, "range", {"min": 0, "max": 10 ** 6, "verify": True})
+    assert status == 202
+    job_path = f"/api/v1/calculator/jobs/{body['data']['job_id']}"
+    assert client.get(job_path, headers=headers).get_json()["data"] == {"status": "queued", "progress": 0.0}
+    
+    run_worker("w1", lease_seconds=60, burst=True)
+    data = client.get(job_path, headers=headers).get_json()["data"]
+    assert (data["status"], data["progress"]) == ("succeeded", 1.0)
+    assert data["numbers"] == [number for number in ARMSTRONG_NUMBERS if number <= 10 ** 6]
+    
+    app.config["QUERY_JOB_BUDGET_SECONDS"] = 0
+    assert _post(client, headers, "range", {"min": 0, "max": 10 ** 6, "verify": True})[0] == 422
+
+
+def test_jobs_of_other_users_are_not_found(app, client, headers):
+    app.config.update(QUERY_INLINE_SECONDS=0, QUERY_BUDGET_SECONDS=0)
+    job_id = _post(client, headers, "range", {"min": 0, "max": 10 ** 6})[1]["data"]["job_id"]
+    
+    other = AppUser(username="bob", email="bob@example.com")
+    other.set_password("password")
+    db.session.add(other)
+    db.session.commit()
+    token = client.post("/api/v1/auth/token", json={"username": "bob", "password": "password"}).get_json()["data"]["access_token"]
+    assert client.get(f"/api/v1/calculator/jobs/{job_id}", headers={"Authorization": f"Bearer {token}"}).status_code == 404
+
+
+def test_attempts_are_paged_newest_first_with_results(client, headers):
+    for number in (153, 370, 371, 407):
+        _post(client, headers, "check", {"number": number})
+    _post(client, headers, "range", {"min": 0, "max": 10 ** 6})
+    
+    body = client.get("/api/v1/calculator/attempts?per_page=2&results=1", headers=headers).get_json()["data"]
+    assert [attempt["type"] for attempt in body["attempts"]] == ["range", "single"]
+    # Stored as bounds, returned with the numbers filled back in
+    assert body["attempts"][0]["result"]["numbers"] == [number for number in ARMSTRONG_NUMBERS if number <= 10 ** 6]
+    
+    inputs = [attempt["input"] for attempt in body["attempts"]]
+    while body["next"]:
+        body = client.get(f"/api/v1/calculator/attempts?per_page=2&cursor={body['next']}", headers=headers).get_json()["data"]
+        assert all("result" not in attempt for attempt in body["attempts"])
+        inputs.extend(attempt["input"] for attempt in body["attempts"])
+    assert inputs == ["0-1000000", "407", "371", "370", "153"]
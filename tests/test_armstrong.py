@@ -0,0 +1,322 @@
+"""
+Tests for the Armstrong number search engines and the catalogues shipped with them.
+"""
+import hashlib
+
+import pytest
+
+import app.utils.armstrong as armstrong
+from app.utils.armstrong import (
+    ARMSTRONG_NUMBERS, BACKEND_NUMPY, BACKEND_PARALLEL, BACKEND_PYTHON, DIGIT_PREVIEW_LENGTH, DISARIUM_NUMBERS,
+    ENGINE_CATALOGUE, ENGINE_CHECK, ENGINE_MULTISET, ENGINE_POSITIONAL, ENGINE_SCAN,
+    FAMILY_DISARIUM, FAMILY_MUNCHHAUSEN, FAMILY_PDI, MUNCHHAUSEN_NUMBERS,
+    STAGE_EXACT, STAGE_LENGTH, STAGE_MODULAR, TrajectoryGraph,
+    armstrong_catalogue, check_armstrong_with_details, check_digit_string, check_many,
+    find_armstrong_numbers_in_range, find_armstrong_numbers_in_range_parallel, find_armstrong_numbers_of_length,
+    get_family, histogram_power_sum, is_armstrong_number, iter_armstrong_numbers, iter_range_query,
+    parse_digit_string, parse_range_continuation, plan_range_query, power_sum, run_batch_check, run_range_query,
+)
+
+
+def _brute_force(min_num, max_num, base=10):
+    """Armstrong numbers in a range, straight from the definition."""
+    found = []
+    for number in range(min_num, max_num + 1):
+        digits, rest = [], number
+        while True:
+            digits.append(rest % base)
+            rest //= base
+            if not rest:
+                break
+        if sum(digit ** len(digits) for digit in digits) == number:
+            found.append(number)
+    return found
+
+
+def _naive_walk(number, exponent):
+    """Steps to the cycle of the digit-power-sum map, and the cycle's smallest member, without a memo."""
+    path = []
+    while number not in path:
+        path.append(number)
+        number = sum(int(digit) ** exponent for digit in str(number))
+    start = path.index(number)
+    return start, min(path[start:])
+
+
+def test_catalogue_is_sorted_and_unique():
+    assert list(ARMSTRONG_NUMBERS) == sorted(set(ARMSTRONG_NUMBERS))
+    assert len(ARMSTRONG_NUMBERS) == 89
+
+
+def test_every_catalogue_entry_is_armstrong():
+    for number in ARMSTRONG_NUMBERS:
+        assert is_armstrong_number(number), number
+
+
+def test_details_agree_with_the_check():
+    for number in list(ARMSTRONG_NUMBERS) + [154, 10 ** 25 + 3, 10 ** 38 + 7, 99999999999999999999]:
+        is_armstrong, details = check_armstrong_with_details(number)
+        assert is_armstrong == details.is_armstrong == is_armstrong_number(number)
+        if details.decided_by == STAGE_EXACT:
+            assert (details.sum_of_powers == number) == is_armstrong
+
+
+def test_modular_rejection_skips_the_exact_sum():
+    is_armstrong, details = check_armstrong_with_details(10 ** 38 + 7)
+    assert not is_armstrong
+    assert details.decided_by == STAGE_MODULAR
+    assert details.sum_of_powers is None
+    assert "(mod 7)" in details.calculation
+
+
+@pytest.mark.parametrize("length", range(1, 12))
+def test_catalogue_matches_multiset_engine(length):
+    shipped = [number for number in ARMSTRONG_NUMBERS if len(str(number)) == length]
+    assert find_armstrong_numbers_of_length(length, engine=ENGINE_MULTISET) == shipped
+
+
+@pytest.mark.parametrize("length", range(1, 6))
+def test_scan_engine_matches_brute_force(length):
+    low = 0 if length == 1 else 10 ** (length - 1)
+    assert find_armstrong_numbers_of_length(length, engine=ENGINE_SCAN) == _brute_force(low, 10 ** length - 1)
+
+
+def test_range_scan_matches_brute_force():
+    assert find_armstrong_numbers_in_range(0, 200000) == _brute_force(0, 200000)
+
+
+@pytest.mark.parametrize("base", range(2, 7))
+def test_catalogue_in_other_bases(base):
+    catalogue = armstrong_catalogue(base)
+    limit = min(catalogue[-1], 200000)
+    assert [number for number in catalogue if number <= limit] == _brute_force(0, limit, base)
+    assert all(is_armstrong_number(number, base) for number in catalogue)
+
+
+@pytest.mark.parametrize("name, shipped", [(FAMILY_MUNCHHAUSEN, MUNCHHAUSEN_NUMBERS), (FAMILY_DISARIUM, DISARIUM_NUMBERS)])
+def test_family_catalogues(name, shipped):
+    family = get_family(name)
+    assert list(shipped) == sorted(set(shipped))
+    assert all(family.contains(number) for number in shipped)
+    assert [number for number in shipped if number <= 100000] == \
+        [number for number in range(100001) if family.contains(number)]
+
+
+@pytest.mark.parametrize("name, exponent, max_num, engine", [
+    (FAMILY_PDI, 4, 10 ** 5, ENGINE_MULTISET),
+    (FAMILY_PDI, 7, 10 ** 8, ENGINE_MULTISET),
+    (FAMILY_MUNCHHAUSEN, None, 10 ** 10, ENGINE_MULTISET),
+    (FAMILY_DISARIUM, None, 10 ** 9, ENGINE_POSITIONAL),
+])
+def test_verified_family_ranges_are_searched_by_length(name, exponent, max_num, engine):
+    family = get_family(name, exponent)
+    plan = plan_range_query(0, max_num, family=family, verify=True)
+    assert plan.engine == engine
+    
+    expected = [number for number in family.catalogue() if number <= max_num]
+    assert run_range_query(0, max_num, family=family, verify=True, plan=plan).numbers == expected
+    # Bounds inside a length are honoured
+    assert run_range_query(150, 9000, family=family, verify=True, plan=plan).numbers == \
+        [number for number in expected if 150 <= number <= 9000]
+
+
+def test_narrow_family_ranges_are_scanned():
+    family = get_family(FAMILY_PDI, 7)
+    plan = plan_range_query(10 ** 6, 10 ** 6 + 500, family=family, verify=True)
+    assert plan.engine == ENGINE_SCAN
+    assert run_range_query(10 ** 6, 10 ** 6 + 500, family=family, plan=plan).numbers == []
+
+
+def test_parallel_scan_matches_serial_scan():
+    assert find_armstrong_numbers_in_range_parallel(0, 3000000, workers=2) == find_armstrong_numbers_in_range(0, 3000000)
+
+
+def test_planner_picks_parallel_scan_for_wide_verify_scans(monkeypatch):
+    monkeypatch.setattr(armstrong, "available_workers", lambda: 8)
+    plan = plan_range_query(10 ** 14, 10 ** 14 + 10 ** 8, verify=True)
+    assert (plan.engine, plan.backend) == (ENGINE_SCAN, BACKEND_PARALLEL)
+    
+    monkeypatch.setattr(armstrong, "available_workers", lambda: 1)
+    assert plan_range_query(10 ** 14, 10 ** 14 + 10 ** 8, verify=True).backend != BACKEND_PARALLEL
+
+
+def test_cancelled_parallel_scan_stops_at_a_resumable_point():
+    plan = plan_range_query(0, 10 ** 7, verify=True)
+    plan.engine, plan.backend = ENGINE_SCAN, BACKEND_PARALLEL
+    
+    chunks = list(iter_range_query(0, 10 ** 7, plan=plan, should_cancel=lambda: True))
+    assert chunks == []
+    
+    next_num = 0
+    numbers = []
+    for found, next_num in iter_range_query(0, 10 ** 7, plan=plan):
+        numbers.extend(found)
+    assert next_num == 10 ** 7 + 1
+    assert numbers == [number for number in ARMSTRONG_NUMBERS if number <= 10 ** 7]
+
+
+def test_range_query_resumes_from_its_continuation():
+    expected = run_range_query(0, 10 ** 8, verify=True).numbers
+    
+    # A deadline already passed stops the query after its first segment
+    result = run_range_query(0, 10 ** 8, verify=True, deadline=0)
+    numbers = list(result.numbers)
+    while not result.complete:
+        min_num, max_num, base, family, verify = parse_range_continuation(result.continuation())
+        result = run_range_query(min_num, max_num, base, family, verify, deadline=0)
+        numbers.extend(result.numbers)
+    
+    assert numbers == expected == [number for number in ARMSTRONG_NUMBERS if number <= 10 ** 8]
+
+
+def test_range_iterator_plans_for_itself():
+    numbers = [number for found, _ in iter_range_query(0, 10 ** 6) for number in found]
+    assert numbers == [number for number in ARMSTRONG_NUMBERS if number <= 10 ** 6]
+
+
+@pytest.mark.parametrize("verify", [False, True])
+def test_member_iterator_resumes_from_any_checkpoint(verify):
+    expected = [number for number in ARMSTRONG_NUMBERS if 100 <= number <= 10 ** 7]
+    
+    # Stop after every member and resume from its checkpoint
+    numbers = []
+    args = (100, 10 ** 7, 10, None, verify)
+    while args:
+        number, checkpoint = next(iter_armstrong_numbers(*args))
+        numbers.append(number)
+        args = parse_range_continuation(checkpoint) if number != expected[-1] else None
+    
+    assert numbers == expected
+    assert [number for number, _ in iter_armstrong_numbers(100, 10 ** 7, verify=verify)] == expected
+    assert list(iter_armstrong_numbers(153, 153)) == [(153, None)]
+
+
+@pytest.mark.parametrize("max_nodes", [1, 2, 5])
+def test_trajectories_survive_eviction_of_their_own_start(max_nodes):
+    reference = TrajectoryGraph()
+    graph = TrajectoryGraph(max_nodes=max_nodes)
+    for number in [*range(2000), 10 ** 30 + 7]:
+        assert graph.locate(number) == reference.locate(number)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 97, 1 << 18])
+def test_numpy_scan_matches_python_scan(chunk_size):
+    pytest.importorskip("numpy")
+    for low, high in [(0, 2000), (150, 9475), (99990, 100010), (10 ** 17 - 500, 10 ** 17 + 500)]:
+        assert find_armstrong_numbers_in_range(low, high, backend=BACKEND_NUMPY, chunk_size=chunk_size) == \
+            find_armstrong_numbers_in_range(low, high, backend=BACKEND_PYTHON)
+
+
+def test_numpy_backend_requires_numpy(monkeypatch):
+    monkeypatch.setattr(armstrong, "np", None)
+    with pytest.raises(RuntimeError):
+        find_armstrong_numbers_in_range(0, 100, backend=BACKEND_NUMPY)
+    # "auto" falls back to the pure-Python scan
+    assert find_armstrong_numbers_in_range(0, 1000) == _brute_force(0, 1000)
+
+
+@pytest.mark.parametrize("base", [2, 3, 6, 10])
+def test_check_many_matches_single_checks(base):
+    numbers = [-153, *range(0, 3000, 7), 153, 9474, *ARMSTRONG_NUMBERS[-3:], *armstrong_catalogue(base)[-3:], 10 ** 80]
+    assert check_many(numbers, base) == [is_armstrong_number(number, base) for number in numbers]
+
+
+@pytest.mark.parametrize("name, exponent", [(None, None), (FAMILY_PDI, 4), (FAMILY_DISARIUM, None)])
+def test_batch_check_agrees_on_either_engine(monkeypatch, name, exponent):
+    family = None if name is None else get_family(name, exponent)
+    numbers = [0, 1, 89, 135, 153, 154, 1634, 8208, 9474, 2646798, 10 ** 39 + 1]
+    expected = [is_armstrong_number(number) if family is None else family.contains(number) for number in numbers]
+    
+    monkeypatch.setattr(armstrong, "PLAN_SECONDS_PER_LOOKUP", 1e9)
+    results, plan = run_batch_check(numbers, family=family)
+    assert (plan.engine, results) == (ENGINE_CHECK, expected)
+    
+    monkeypatch.setattr(armstrong, "PLAN_SECONDS_PER_LOOKUP", 0)
+    monkeypatch.setattr(armstrong, "PLAN_SECONDS_PER_CHECK", 1e9)
+    monkeypatch.setattr(armstrong, "PLAN_SECONDS_PER_FAMILY_CHECK", 1e9)
+    results, plan = run_batch_check(numbers, family=family)
+    assert (plan.engine, results) == (ENGINE_CATALOGUE, expected)
+
+
+@pytest.mark.parametrize("exponent", [1, 2, 3, 4, 5])
+def test_pdi_catalogue_matches_brute_force(exponent):
+    family = get_family(FAMILY_PDI, exponent)
+    limit = min(10 ** family.max_length - 1, 400000)
+    brute_force = [number for number in range(limit + 1) if sum(int(digit) ** exponent for digit in str(number)) == number]
+    assert [number for number in family.catalogue() if number <= limit] == brute_force
+    assert all(family.contains(number) for number in family.catalogue())
+
+
+def test_pdi_needs_an_exponent():
+    for exponent in (None, 0, -3):
+        with pytest.raises(ValueError):
+            get_family(FAMILY_PDI, exponent)
+    # A fixed exponent, unlike the Armstrong family's digit count
+    assert get_family(FAMILY_PDI, 3).contains(153)
+    assert not get_family(FAMILY_PDI, 3).contains(1634)
+
+
+def test_trajectory_runs_to_the_first_cycle_member():
+    graph = TrajectoryGraph(exponent=2)
+    assert graph.trajectory(7) == {
+        "number": 7, "exponent": 2, "path": [7, 49, 97, 130, 10, 1], "steps": 5,
+        "cycle": [1], "cycle_length": 1, "basin": 1,
+    }
+    # Cycles start from their smallest member, wherever the walk entered them
+    result = graph.trajectory(58)
+    assert result["steps"] == 0
+    assert result["cycle"] == [4, 16, 37, 58, 89, 145, 42, 20]
+
+
+@pytest.mark.parametrize("exponent, max_nodes", [(2, 50), (3, 50), (3, 100000)])
+def test_range_summary_matches_naive_walks(exponent, max_nodes):
+    basins = TrajectoryGraph(exponent=exponent, max_nodes=max_nodes).summarize_range(1, 3000)
+    
+    expected = {}
+    for number in range(1, 3001):
+        steps, basin = _naive_walk(number, exponent)
+        count, max_steps = expected.get(basin, (0, 0))
+        expected[basin] = (count + 1, max(max_steps, steps))
+    assert {basin: (summary["count"], summary["max_steps"]) for basin, summary in basins.items()} == expected
+
+
+def test_histogram_sums_are_shared_by_permutations(monkeypatch):
+    monkeypatch.setattr(armstrong, "HISTOGRAM_MIN_DIGITS", 1)
+    histogram_power_sum.cache_clear()
+    assert is_armstrong_number(9800817)
+    assert not is_armstrong_number(7180089)
+    info = histogram_power_sum.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
+    
+    assert all(is_armstrong_number(number) == (power_sum(number, len(str(number))) == number) for number in range(20000))
+
+
+def test_digit_strings_past_the_length_bound_are_never_converted():
+    # Far past Python's int-string conversion limit
+    digits = "9" * 100000
+    is_member, details = check_digit_string(digits)
+    assert not is_member
+    assert (details.decided_by, details.number, details.num_digits) == (STAGE_LENGTH, None, 100000)
+    assert details.preview == digits[:DIGIT_PREVIEW_LENGTH]
+    assert details.digest == hashlib.sha256(digits.encode()).hexdigest()
+    
+    is_member, details = check_digit_string("1" * 200, base=2)
+    assert not is_member and details.decided_by == STAGE_LENGTH
+    assert details.num_digits <= int("1" * 200).bit_length()
+
+
+def test_short_digit_strings_are_checked_exactly():
+    for number in [0, 153, 154, 9474, 4679307774, 10 ** 38 + 7, ARMSTRONG_NUMBERS[-1]]:
+        is_member, details = check_digit_string(str(number))
+        expected, expected_details = check_armstrong_with_details(number)
+        assert (is_member, details.decided_by, details.number) == (expected, expected_details.decided_by, number)
+    assert check_digit_string("89", family=get_family(FAMILY_DISARIUM))[0]
+    assert not check_digit_string("88", family=get_family(FAMILY_DISARIUM))[0]
+
+
+def test_digit_strings_are_ascii_decimal():
+    assert parse_digit_string(" 000153 ") == "153"
+    assert parse_digit_string("000") == "0"
+    for text in ["", "-5", "1e5", "12 3", "\u0661\u0662\u0663", "\uff11\uff12"]:
+        with pytest.raises(ValueError):
+            parse_digit_string(text)
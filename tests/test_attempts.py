@@ -0,0 +1,162 @@
+"""
+Tests for attempt recording: the write-behind queue, shared result blobs, and range results stored as bounds.
+"""
+import threading
+
+import pytest
+
+import app.utils.attempts as attempts
+from app.extensions import db
+from app.models.attempt import Attempt
+from app.models.result_blob import ENCODING_JSON, ENCODING_ZLIB, ResultBlob
+from app.utils.armstrong import ARMSTRONG_NUMBERS, FAMILY_PDI, get_family
+from app.utils.attempts import (
+    OVERFLOW_DROP, OVERFLOW_SYNC, AttemptRecorder, get_attempt_recorder, load_attempt_result, save_attempt,
+    save_range_numbers,
+)
+
+# Longest wait for the recorder thread in these tests
+WAIT_SECONDS = 5
+
+
+def _attempt(user, value="153"):
+    attempt = Attempt()
+    attempt.user_id = user.id
+    attempt.set_input(value)
+    attempt.input_type = "single"
+    attempt.family = "armstrong"
+    attempt.is_armstrong = True
+    return attempt
+
+
+class CapturedInserts:
+    """Stands in for `_insert_rows`, keeping (thread name, input values) per bulk insert."""
+    
+    def __init__(self):
+        self.calls = []
+        self.condition = threading.Condition()
+    
+    def __call__(self, rows):
+        with self.condition:
+            self.calls.append((threading.current_thread().name, [row["input_value"] for row in rows]))
+            self.condition.notify_all()
+    
+    def wait_for(self, count):
+        with self.condition:
+            assert self.condition.wait_for(lambda: len(self.calls) >= count, WAIT_SECONDS)
+
+
+@pytest.fixture
+def inserts(monkeypatch):
+    captured = CapturedInserts()
+    monkeypatch.setattr(attempts, "_insert_rows", captured)
+    return captured
+
+
+def _rows(*values):
+    return [{"input_value": value} for value in values]
+
+
+def test_recorder_flushes_a_full_batch_without_waiting_for_the_timer(app, inserts):
+    recorder = AttemptRecorder(app, flush_rows=3, flush_ms=60000, queue_size=100, overflow=OVERFLOW_SYNC)
+    recorder.record(_rows("1", "2", "3"))
+    inserts.wait_for(1)
+    assert inserts.calls == [("attempt-recorder", ["1", "2", "3"])]
+    recorder.close()
+
+
+def test_recorder_flushes_a_partial_batch_on_the_timer(app, inserts):
+    recorder = AttemptRecorder(app, flush_rows=1000, flush_ms=20, queue_size=100, overflow=OVERFLOW_SYNC)
+    recorder.record(_rows("1", "2"))
+    inserts.wait_for(1)
+    assert inserts.calls == [("attempt-recorder", ["1", "2"])]
+    
+    # Rows still queued are flushed on close
+    recorder.record(_rows("3"))
+    recorder.close()
+    assert [rows for _, rows in inserts.calls] == [["1", "2"], ["3"]]
+
+
+@pytest.mark.parametrize("overflow", [OVERFLOW_SYNC, OVERFLOW_DROP])
+def test_recorder_overflow(app, monkeypatch, overflow):
+    flushing, release = threading.Event(), threading.Event()
+    calls = []
+    
+    def insert_rows(rows):
+        calls.append((threading.current_thread().name, [row["input_value"] for row in rows]))
+        if threading.current_thread().name == "attempt-recorder":
+            flushing.set()
+            release.wait(WAIT_SECONDS)
+    
+    monkeypatch.setattr(attempts, "_insert_rows", insert_rows)
+    recorder = AttemptRecorder(app, flush_rows=1, flush_ms=0, queue_size=1, overflow=overflow)
+    
+    # Hold the thread in its first flush, so the queue fills behind it
+    recorder.record(_rows("1"))
+    assert flushing.wait(WAIT_SECONDS)
+    recorder.record(_rows("2", "3", "4"))
+    
+    if overflow == OVERFLOW_SYNC:
+        assert calls[1:] == [(threading.current_thread().name, ["3", "4"])]
+    else:
+        assert calls[1:] == []
+    
+    release.set()
+    recorder.close()
+    assert [rows for name, rows in calls if name == "attempt-recorder"] == [["1"], ["2"]]
+
+
+def test_recorder_rejects_unknown_overflow_policies(app):
+    with pytest.raises(ValueError):
+        AttemptRecorder(app, flush_rows=1, flush_ms=1, queue_size=1, overflow="block")
+
+
+def test_write_behind_rows_reach_the_database(app, user):
+    app.config.update(ATTEMPT_WRITE_BEHIND=True, ATTEMPT_FLUSH_ROWS=2, ATTEMPT_FLUSH_MS=10)
+    recorder = get_attempt_recorder()
+    ids = [save_attempt(_attempt(user, str(number)), {"is_armstrong": True}) for number in ARMSTRONG_NUMBERS[:5]]
+    recorder.close()
+    
+    assert {attempt.id for attempt in Attempt.query.all()} == set(ids)
+    assert ResultBlob.query.count() == 1
+
+
+def test_equal_results_share_one_blob(app, user):
+    first = save_attempt(_attempt(user), {"numbers": [153, 370], "engine": "catalogue"})
+    # Key order does not matter to the canonical form
+    second = save_attempt(_attempt(user), {"engine": "catalogue", "numbers": [153, 370]})
+    save_attempt(_attempt(user), {"engine": "multiset", "numbers": [153, 370]})
+    
+    hashes = {attempt.id: attempt.result_hash for attempt in Attempt.query.all()}
+    assert hashes[first] == hashes[second]
+    assert ResultBlob.query.count() == 2
+    assert db.session.get(Attempt, first).load_result() == {"engine": "catalogue", "numbers": [153, 370]}
+
+
+def test_long_results_are_compressed_when_it_helps():
+    short = ResultBlob.encode({"numbers": [153]})
+    long = ResultBlob.encode({"numbers": list(range(1000))})
+    assert short["encoding"] == ENCODING_JSON
+    assert long["encoding"] == ENCODING_ZLIB and len(long["data"]) < long["size"]
+    assert ResultBlob(**long).decode() == {"numbers": list(range(1000))}
+
+
+def test_catalogue_ranges_are_stored_as_bounds(app, user):
+    numbers = [number for number in ARMSTRONG_NUMBERS if 100 <= number <= 10 ** 9]
+    attempt_id = save_range_numbers(user.id, 100, 10 ** 9, 10, get_family(), numbers, {"engine": "catalogue"})
+    attempt = db.session.get(Attempt, attempt_id)
+    
+    stored = attempt.load_result()
+    assert stored["bounds"] == [100, 10 ** 9] and "numbers" not in stored
+    assert load_attempt_result(attempt)["numbers"] == numbers
+
+
+def test_ranges_no_shipped_catalogue_reproduces_keep_their_numbers(app, user):
+    # A partial result differs from the catalogue over its range
+    partial_id = save_range_numbers(user.id, 100, 10 ** 9, 10, get_family(), [153, 370], {"engine": "scan"})
+    # Perfect digital invariants have no shipped catalogue
+    pdi_id = save_range_numbers(user.id, 0, 10 ** 4, 10, get_family(FAMILY_PDI, 4), [0, 1, 1634, 8208, 9474], {})
+    
+    assert load_attempt_result(db.session.get(Attempt, partial_id))["numbers"] == [153, 370]
+    stored = db.session.get(Attempt, pdi_id).load_result()
+    assert "bounds" not in stored and load_attempt_result(db.session.get(Attempt, pdi_id)) == stored
@@ -0,0 +1,173 @@
+"""
+Tests for the job queue: compare-and-swap claims, leases and their renewal, and resumable range jobs.
+"""
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import Select, update
+
+import app.utils.jobs as jobs
+from app.enums.jobs import JobStatus
+from app.extensions import db
+from app.models.attempt import Attempt
+from app.models.job import Job
+from app.utils.armstrong import ARMSTRONG_NUMBERS
+from app.utils.attempts import load_attempt_result
+from app.utils.date_time import DateTimeUtils
+from app.utils.jobs import (
+    JOB_KIND_RANGE, LeaseLost, claim_job, complete_job, enqueue_job, fail_job, job_progress, process_job, renew_lease,
+    run_worker,
+)
+
+LEASE_SECONDS = 60
+
+
+def _range_payload(min_num=0, max_num=10 ** 6, verify=False):
+    return {"min_num": min_num, "max_num": max_num, "base": 10, "family": "armstrong", "exponent": None, "verify": verify}
+
+
+def _reload(job_id) -> Job:
+    return db.session.execute(
+        db.select(Job).where(Job.id == job_id).execution_options(populate_existing=True)
+    ).scalar_one()
+
+
+def _expire_lease(job_id):
+    db.session.execute(
+        update(Job).where(Job.id == job_id)
+        .values(lease_expires_at=DateTimeUtils.aware_utcnow() - timedelta(seconds=1))
+    )
+    db.session.commit()
+
+
+def test_claims_go_by_priority_then_age(app, user):
+    low = enqueue_job(user.id, JOB_KIND_RANGE, _range_payload(), priority=-100)
+    first = enqueue_job(user.id, JOB_KIND_RANGE, _range_payload(), priority=-5)
+    second = enqueue_job(user.id, JOB_KIND_RANGE, _range_payload(), priority=-5)
+    
+    assert [claim_job(worker, LEASE_SECONDS).id for worker in ("w1", "w2", "w3")] == [first.id, second.id, low.id]
+    assert claim_job("w4", LEASE_SECONDS) is None
+
+
+def test_claim_race_has_one_winner(app, user, monkeypatch):
+    job = enqueue_job(user.id, JOB_KIND_RANGE, _range_payload())
+    execute = db.session.execute
+    rival = []
+    
+    def execute_with_rival(statement, *args, **kwargs):
+        result = execute(statement, *args, **kwargs)
+        if isinstance(statement, Select) and not rival:
+            # Another worker claims the job between this worker's select and its update
+            candidates = result.freeze()
+            rival.append(None)
+            rival[0] = claim_job("rival", LEASE_SECONDS)
+            return candidates()
+        return result
+    
+    monkeypatch.setattr(db.session, "execute", execute_with_rival)
+    assert claim_job("w1", LEASE_SECONDS) is None
+    monkeypatch.undo()
+    
+    assert rival[0].id == job.id
+    claimed = _reload(job.id)
+    assert (claimed.status, claimed.lease_owner, claimed.attempts) == (JobStatus.RUNNING, "rival", 1)
+
+
+def test_expired_leases_pass_to_another_worker(app, user):
+    job = enqueue_job(user.id, JOB_KIND_RANGE, _range_payload())
+    claim_job("w1", LEASE_SECONDS)
+    assert renew_lease(job.id, "w1", LEASE_SECONDS)
+    assert claim_job("w2", LEASE_SECONDS) is None
+    
+    _expire_lease(job.id)
+    reclaimed = claim_job("w2", LEASE_SECONDS)
+    assert (reclaimed.id, reclaimed.lease_owner, reclaimed.attempts) == (job.id, "w2", 2)
+    
+    # The first worker finds out on its next renewal, and cannot finish the job
+    assert not renew_lease(job.id, "w1", LEASE_SECONDS, {"next_num": 5})
+    assert not complete_job(job.id, "w1")
+    assert renew_lease(job.id, "w2", LEASE_SECONDS, {"next_num": 7})
+    assert _reload(job.id).data == {"next_num": 7}
+
+
+def test_expired_lease_on_the_last_attempt_fails_the_job(app, user):
+    app.config["JOB_MAX_ATTEMPTS"] = 1
+    job = enqueue_job(user.id, JOB_KIND_RANGE, _range_payload())
+    claim_job("w1", LEASE_SECONDS)
+    _expire_lease(job.id)
+    
+    assert claim_job("w2", LEASE_SECONDS) is None
+    failed = _reload(job.id)
+    assert failed.status == JobStatus.FAILED and failed.lease_owner is None
+
+
+def test_failed_jobs_are_retried_after_a_delay(app, user):
+    job = enqueue_job(user.id, JOB_KIND_RANGE, _range_payload())
+    claimed = claim_job("w1", LEASE_SECONDS)
+    assert fail_job(claimed, "w1", "boom")
+    
+    retried = _reload(job.id)
+    assert (retried.status, retried.error, retried.lease_owner) == (JobStatus.QUEUED, "boom", None)
+    assert claim_job("w1", LEASE_SECONDS) is None
+    
+    db.session.execute(update(Job).where(Job.id == job.id).values(run_after=DateTimeUtils.aware_utcnow()))
+    db.session.commit()
+    assert claim_job("w1", LEASE_SECONDS).attempts == 2
+
+
+def test_heartbeat_holds_the_lease_through_a_long_segment(app, user, monkeypatch):
+    lease_seconds = 0.6
+    job = enqueue_job(user.id, "test", {})
+    
+    # The test database is one in-memory connection, which the two threads must not use at once
+    connection = threading.Lock()
+    renew = jobs.renew_lease
+    
+    def renew_alone(*args, **kwargs):
+        with connection:
+            return renew(*args, **kwargs)
+    
+    def run(job, heartbeat, slice_seconds):
+        # One segment of work outlasting the lease
+        time.sleep(lease_seconds * 2)
+        with connection:
+            assert claim_job("rival", lease_seconds) is None
+        if not heartbeat({"done": True}):
+            raise LeaseLost()
+    
+    monkeypatch.setattr(jobs, "renew_lease", renew_alone)
+    monkeypatch.setitem(jobs.JOB_HANDLERS, "test", run)
+    process_job(claim_job("w1", lease_seconds), "w1", lease_seconds)
+    finished = _reload(job.id)
+    assert (finished.status, finished.attempts, finished.data) == (JobStatus.SUCCEEDED, 1, {"done": True})
+
+
+def test_a_worker_that_lost_its_lease_stops(app, user, monkeypatch):
+    job = enqueue_job(user.id, "test", {})
+    
+    def run(job, heartbeat, slice_seconds):
+        jobs._update_owned(job.id, "w1", lease_owner="w2")
+        if not heartbeat({"done": True}):
+            raise LeaseLost()
+    
+    monkeypatch.setitem(jobs.JOB_HANDLERS, "test", run)
+    process_job(claim_job("w1", LEASE_SECONDS), "w1", LEASE_SECONDS)
+    taken = _reload(job.id)
+    assert (taken.status, taken.lease_owner, taken.data) == (JobStatus.RUNNING, "w2", {})
+
+
+def test_range_jobs_run_in_slices_and_resume_from_saved_progress(app, user):
+    expected = [number for number in ARMSTRONG_NUMBERS if number <= 10 ** 7]
+    # Progress saved by an earlier worker that stopped at 10^6
+    payload = _range_payload(max_num=10 ** 7, verify=True)
+    payload.update(next_num=10 ** 6 + 1, numbers=[number for number in expected if number <= 10 ** 6])
+    job = enqueue_job(user.id, JOB_KIND_RANGE, payload)
+    assert job_progress(job) == pytest.approx(0.1)
+    
+    assert run_worker("w1", lease_seconds=0.2, burst=True) == 1
+    finished = _reload(job.id)
+    assert finished.status == JobStatus.SUCCEEDED and job_progress(finished) == 1.0
+    assert finished.data["numbers"] == expected
+    assert load_attempt_result(db.session.get(Attempt, finished.attempt_id))["numbers"] == expected
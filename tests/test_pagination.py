@@ -0,0 +1,79 @@
+"""
+Tests for keyset pagination, run against an in-memory SQLite database.
+"""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, Uuid, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+from app.utils.helpers.pagination import CURSOR_NEXT, decode_cursor, encode_cursor, keyset_paginate
+
+Base = declarative_base()
+
+
+class Row(Base):
+    __tablename__ = "row"
+    
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    created_at = Column(DateTime, nullable=False)
+    position = Column(Integer, nullable=False)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        start = datetime(2024, 1, 1)
+        # Timestamps repeat in threes, so pages have to break ties on id
+        session.add_all([Row(created_at=start + timedelta(seconds=i // 3), position=i) for i in range(103)])
+        session.commit()
+        yield session
+
+
+def _expected_order(session):
+    rows = session.query(Row).all()
+    return [row.id for row in sorted(rows, key=lambda row: (-row.created_at.timestamp(), row.id))]
+
+
+def test_cursor_round_trip():
+    row_id = uuid.uuid4()
+    created_at = datetime(2024, 5, 6, 7, 8, 9, 123456)
+    assert decode_cursor(encode_cursor(CURSOR_NEXT, created_at, row_id)) == (CURSOR_NEXT, created_at, row_id)
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.parametrize("per_page", [1, 7, 20, 103, 200])
+def test_pages_round_trip(session, per_page):
+    expected = _expected_order(session)
+    query = session.query(Row)
+    
+    # Forwards through every page
+    pages = []
+    page = keyset_paginate(query, Row.created_at, Row.id, None, per_page)
+    assert not page.has_prev
+    while True:
+        pages.append([row.id for row in page.items])
+        if not page.has_next:
+            break
+        page = keyset_paginate(query, Row.created_at, Row.id, page.next_cursor, per_page)
+    assert [row_id for ids in pages for row_id in ids] == expected
+    assert all(len(ids) == per_page for ids in pages[:-1])
+    
+    # And back again, page for page
+    back = [[row.id for row in page.items]]
+    while page.has_prev:
+        page = keyset_paginate(query, Row.created_at, Row.id, page.prev_cursor, per_page)
+        back.append([row.id for row in page.items])
+    assert back[::-1] == pages
+
+
+def test_invalid_cursor_gives_first_page(session):
+    page = keyset_paginate(session.query(Row), Row.created_at, Row.id, "garbage", 10)
+    assert [row.id for row in page.items] == _expected_order(session)[:10]